@@ -4,7 +4,7 @@
 import logging
 
 from django.contrib.auth.models import Group, User
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
 from django.http import HttpRequest
 from rest_framework.request import Request
 
@@ -15,37 +15,173 @@ from core_main_app.commons.exceptions import CoreError
 logger = logging.getLogger(__name__)
 
 
-def _check_data_structure_elements_access(data_structure_element_list, user):
+def _check_data_structure_elements_access(
+    data_structure_element_list, user, permissions=None
+):
     """Check that the user is authorized to query or retrieve all
-    DataStructureElement from the input list.
+    DataStructureElement from the input list. The permission is resolved
+    once per data structure.
 
     Args:
         data_structure_element_list:
         user:
+        permissions: permissions already resolved, by data structure id
 
     Returns:
     """
+    permissions = permissions if permissions is not None else {}
+    data_structure_ids = set()
+    data_structures = {}
+    owners = set()
     for data_structure_element in data_structure_element_list:
-        permission = (
-            data_structure_element.data_structure.get_object_permission()
+        data_structure_id = data_structure_element.data_structure_id
+        if (
+            data_structure_id not in permissions
+            and data_structure_id not in data_structures
+        ):
+            data_structures[data_structure_id] = (
+                data_structure_element.data_structure
+            )
+        data_structure_ids.add(data_structure_id)
+        owners.add(data_structure_element.user)
+
+    # check if user can access these types of data structure element
+    _check_data_structure_permissions(
+        data_structure_ids, data_structures, user, permissions
+    )
+    # check if user is the owner
+    _check_data_structure_element_owners(owners, user)
+
+
+def _check_data_structure_element_queryset_access(
+    data_structure_element_queryset, user, permissions=None
+):
+    """Check that the user is authorized to retrieve all DataStructureElement
+    of a queryset, without loading the elements.
+
+    Args:
+        data_structure_element_queryset:
+        user:
+        permissions: permissions already resolved, by data structure id
+
+    Returns:
+    """
+    # distinct data structures and owners of the elements
+    _check_data_structure_owners_access(
+        data_structure_element_queryset.order_by()
+        .values_list("data_structure_id", "user")
+        .distinct(),
+        user,
+        permissions,
+    )
+
+
+def _check_data_structure_owners_access(
+    data_structure_owners, user, permissions=None
+):
+    """Check that the user is authorized to access elements, from the pairs of
+    data structure id and owner of the elements.
+
+    Args:
+        data_structure_owners:
+        user:
+        permissions: permissions already resolved, by data structure id
+
+    Returns:
+    """
+    from core_parser_app.components.data_structure.models import (
+        DataStructure,
+    )
+
+    data_structure_ids = set()
+    owners = set()
+    for data_structure_id, owner in data_structure_owners:
+        data_structure_ids.add(data_structure_id)
+        owners.add(owner)
+
+    permissions = permissions if permissions is not None else {}
+    data_structures = {
+        data_structure.id: data_structure
+        for data_structure in DataStructure.objects.filter(
+            pk__in=data_structure_ids.difference(permissions)
         )
-        codename = permission.split(".")[1]
-        # check if user can access this type of data structure element
-        if user.is_anonymous:
-            # Check in the ANONYMOUS_GROUP
-            if not Group.objects.filter(
-                Q(name=rights.ANONYMOUS_GROUP)
-                & Q(permissions__codename=codename)
-            ):
+    }
+    _check_data_structure_permissions(
+        data_structure_ids, data_structures, user, permissions
+    )
+    _check_data_structure_element_owners(owners, user)
+
+
+def _check_data_structure_permissions(
+    data_structure_ids, data_structures, user, permissions
+):
+    """Check that the user has the permission of all the data structures.
+
+    Args:
+        data_structure_ids:
+        data_structures: data structures whose permission is not resolved yet,
+            by id
+        user:
+        permissions: permissions already resolved, by data structure id
+
+    Returns:
+    """
+    for data_structure_id in data_structure_ids:
+        if data_structure_id not in permissions:
+            data_structure = data_structures.get(data_structure_id)
+            if data_structure is None:
                 raise AccessControlError(
                     "User does not have the permission to access this data structure."
                 )
-        elif not user.has_perm(permission):
+            permissions[data_structure_id] = (
+                data_structure.get_object_permission()
+            )
+
+        if not _has_data_structure_permission(
+            permissions[data_structure_id], user
+        ):
             raise AccessControlError(
                 "User does not have the permission to access this data structure."
             )
-        # check if user is the owner
-        _check_data_structure_element_ownership(data_structure_element, user)
+
+
+def _has_data_structure_permission(permission, user):
+    """Check if the user has the permission of a data structure. The
+    permissions of the anonymous group are queried once and cached on the user,
+    like the permissions of authenticated users.
+
+    Args:
+        permission:
+        user:
+
+    Returns:
+
+    """
+    if not user.is_anonymous:
+        return user.has_perm(permission)
+
+    # Check in the ANONYMOUS_GROUP
+    if not hasattr(user, "_anonymous_group_perm_cache"):
+        user._anonymous_group_perm_cache = set(
+            Group.objects.filter(name=rights.ANONYMOUS_GROUP).values_list(
+                "permissions__codename", flat=True
+            )
+        )
+    return permission.split(".")[1] in user._anonymous_group_perm_cache
+
+
+def _check_data_structure_element_owners(owners, user):
+    """Check if the user is the owner of the elements
+
+    Args:
+        owners: owners of the elements
+        user:
+
+    Returns:
+
+    """
+    if any(owner and owner != str(user.id) for owner in owners):
+        raise AccessControlError("User is not the owner of the object.")
 
 
 def _check_data_structure_element_ownership(data_structure_element, user):
@@ -58,10 +194,34 @@ def _check_data_structure_element_ownership(data_structure_element, user):
     Returns:
 
     """
-    if data_structure_element.user and data_structure_element.user != str(
-        user.id
+    _check_data_structure_element_owners([data_structure_element.user], user)
+
+
+def _get_request_user(args, kwargs):
+    """Return the user of the request passed to the function
+
+    Args:
+        args:
+        kwargs:
+
+    Returns:
+
+    """
+    if "request" in kwargs.keys() and isinstance(
+        kwargs["request"], (HttpRequest, Request)
     ):
-        raise AccessControlError("User is not the owner of the object.")
+        return kwargs["request"].user
+
+    request = next(
+        (
+            arg
+            for arg in args
+            if isinstance(arg, HttpRequest) or isinstance(arg, Request)
+        ),
+        None,
+    )
+    request_user: User = request.user if request and request.user else None
+    return request_user
 
 
 def is_data_structure_element_owner(fn, *args, **kwargs):
@@ -78,24 +238,14 @@ def is_data_structure_element_owner(fn, *args, **kwargs):
         DataStructureElement,
     )
 
-    if "request" in kwargs.keys() and isinstance(
-        kwargs["request"], (HttpRequest, Request)
-    ):
-        request_user = kwargs["request"].user
-    else:
-        request = next(
-            (
-                arg
-                for arg in args
-                if isinstance(arg, HttpRequest) or isinstance(arg, Request)
-            ),
-            None,
-        )
-        request_user: User = request.user if request and request.user else None
+    request_user = _get_request_user(args, kwargs)
 
     if request_user.is_superuser:  # Superusers bypass ACL
         return fn(*args, **kwargs)
 
+    # permissions of the data structures, resolved once for inputs and outputs
+    permissions = {}
+
     # Check user has the right to query the input DataStructureElement list.
     _check_data_structure_elements_access(
         [arg for arg in args if isinstance(arg, DataStructureElement)]
@@ -105,26 +255,32 @@ def is_data_structure_element_owner(fn, *args, **kwargs):
             if isinstance(kwarg_value, DataStructureElement)
         ],
         request_user,
+        permissions,
     )
 
-    # Run the function and add outputs to checklist
+    # Run the function and check the outputs
     fn_output = fn(*args, **kwargs)
-    fn_output_data_structure_element_list = list()
 
     if isinstance(fn_output, DataStructureElement):
-        fn_output_data_structure_element_list.append(fn_output)
-    elif isinstance(fn_output, list) or isinstance(fn_output, QuerySet):
-        output_data_structure_element_list = [
+        fn_output_data_structure_element_list = [fn_output]
+    elif isinstance(fn_output, QuerySet):
+        # Check that all elements are DataStructureElement
+        if not issubclass(fn_output.model, DataStructureElement):
+            raise CoreError("Function returned unexpected elements")
+
+        # Check that the user is authorized to retrieve all outputs.
+        _check_data_structure_element_queryset_access(
+            fn_output, request_user, permissions
+        )
+        return fn_output
+    elif isinstance(fn_output, list):
+        fn_output_data_structure_element_list = [
             out for out in fn_output if isinstance(out, DataStructureElement)
         ]
 
         # Check that all elements are DataStructureElement
-        if len(fn_output) != len(output_data_structure_element_list):
+        if len(fn_output) != len(fn_output_data_structure_element_list):
             raise CoreError("Function returned unexpected elements")
-
-        fn_output_data_structure_element_list += (
-            output_data_structure_element_list
-        )
     else:  # Outputs are neither a list nor an instance of DataStrctureElement
         raise CoreError("Function returned unexpected elements")
 
@@ -132,6 +288,86 @@ def is_data_structure_element_owner(fn, *args, **kwargs):
     _check_data_structure_elements_access(
         fn_output_data_structure_element_list,
         request_user,
+        permissions,
     )
 
     return fn_output
+
+
+def is_data_structure_element_list_owner(fn, *args, **kwargs):
+    """Check that user is the owner of all the DataStructureElement of the
+    input list.
+
+    Args:
+        fn:
+        args:
+        kwargs:
+
+    Returns:
+    """
+    from core_parser_app.components.data_structure.models import (
+        DataStructureElement,
+    )
+
+    request_user = _get_request_user(args, kwargs)
+
+    if request_user.is_superuser:  # Superusers bypass ACL
+        return fn(*args, **kwargs)
+
+    # the list of elements is the first argument of the function
+    data_structure_element_list = (
+        args[0] if args else kwargs["data_structure_element_list"]
+    )
+
+    # Check that all elements are DataStructureElement
+    if not all(
+        isinstance(data_structure_element, DataStructureElement)
+        for data_structure_element in data_structure_element_list
+    ):
+        raise CoreError("Function received unexpected elements")
+
+    _check_data_structure_elements_access(
+        data_structure_element_list, request_user
+    )
+
+    return fn(*args, **kwargs)
+
+
+def is_data_structure_element_branch_owner(fn, *args, **kwargs):
+    """Check that user is the owner of the input DataStructureElement and of
+    all its descendants.
+
+    Args:
+        fn:
+        args:
+        kwargs:
+
+    Returns:
+    """
+    from core_parser_app.components.data_structure.models import (
+        DataStructureElement,
+    )
+
+    request_user = _get_request_user(args, kwargs)
+
+    if request_user.is_superuser:  # Superusers bypass ACL
+        return fn(*args, **kwargs)
+
+    # the root of the branch is the first argument of the function
+    data_structure_element = (
+        args[0] if args else kwargs["data_structure_element"]
+    )
+    if not isinstance(data_structure_element, DataStructureElement):
+        raise CoreError("Function received unexpected elements")
+
+    _check_data_structure_owners_access(
+        {
+            (data_structure_id, owner)
+            for _, data_structure_id, owner in DataStructureElement.get_branch_values(
+                data_structure_element.id, "data_structure_id", "user"
+            )
+        },
+        request_user,
+    )
+
+    return fn(*args, **kwargs)
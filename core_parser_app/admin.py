@@ -17,6 +17,14 @@ from core_parser_app.components.data_structure.models import (
 from core_parser_app.components.data_structure_element.admin_site import (
     CustomDataStructureElementAdmin,
 )
+from core_parser_app.components.enumeration.admin_site import (
+    CustomEnumerationAdmin,
+)
+from core_parser_app.components.enumeration.models import Enumeration
+from core_parser_app.components.form_skeleton.admin_site import (
+    CustomFormSkeletonAdmin,
+)
+from core_parser_app.components.form_skeleton.models import FormSkeleton
 from core_parser_app.components.module.admin_site import CustomModuleAdmin
 from core_parser_app.components.module.models import Module
 from core_parser_app.views.admin import views as admin_views
@@ -36,5 +44,7 @@ admin_urls = [
 admin.site.register(DataStructureElement, CustomDataStructureElementAdmin)
 admin.site.register(DataStructure, CustomDataStructureAdmin)
 admin.site.register(Module, CustomModuleAdmin)
+admin.site.register(Enumeration, CustomEnumerationAdmin)
+admin.site.register(FormSkeleton, CustomFormSkeletonAdmin)
 urls = core_admin_site.get_urls()
 core_admin_site.get_urls = lambda: admin_urls + urls
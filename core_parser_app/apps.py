@@ -9,3 +9,17 @@ class CoreParserAppConfig(AppConfig):
 
     name = "core_parser_app"
     verbose_name = "Core Parser App"
+
+    def ready(self):
+        """Run when the app is ready
+
+        Returns:
+
+        """
+        from core_parser_app.components.form_skeleton import (
+            signals as form_skeleton_signals,
+        )
+        from core_parser_app.components.module import signals
+
+        signals.connect()
+        form_skeleton_signals.connect()
@@ -5,13 +5,26 @@ import logging
 from abc import abstractmethod
 
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Concat, Length, Substr
+from django.utils.http import int_to_base36
 
 from core_main_app.commons import exceptions
 from core_main_app.components.template.models import Template
 
 logger = logging.getLogger(__name__)
 
+# maximum number of ids in a single query on data structure element branches
+BRANCH_BATCH_SIZE = 500
+# length of the prefix of the xpaths that is indexed
+XPATH_INDEX_LENGTH = 200
+# maximum length of a path, so that it fits in an index entry of PostgreSQL
+# (2704 bytes): deeper elements have no path
+PATH_MAX_LENGTH = 2560
+# maximum length of a path segment, for 64 bits ids
+PATH_SEGMENT_MAX_LENGTH = 14
+
 
 class DataStructureElement(models.Model):
     """Represents data structure object"""
@@ -27,6 +40,11 @@ class DataStructureElement(models.Model):
         null=True,
         related_name="children",
     )
+    # ids of the ancestors and of the element, from the root of the tree
+    # (None: too deep to be indexed, "": not built yet)
+    path = models.TextField(blank=True, null=True, default="", db_index=True)
+    # copy of the XML xpath of the options, for indexed lookups
+    xpath = models.TextField(blank=True, null=True)
     data_structure = models.ForeignKey(
         "DataStructure",
         on_delete=models.CASCADE,
@@ -36,6 +54,246 @@ class DataStructureElement(models.Model):
     )
     creation_date = models.DateTimeField(auto_now_add=True)
 
+    # id of the parent the path was computed from
+    _path_parent_id = None
+
+    class Meta:
+        """Meta"""
+
+        # xpaths are unbounded: only their prefix is indexed
+        indexes = [
+            models.Index(
+                Substr("xpath", 1, XPATH_INDEX_LENGTH),
+                name="core_parser_xpath_prefix_idx",
+            ),
+            models.Index(
+                F("data_structure"),
+                Substr("xpath", 1, XPATH_INDEX_LENGTH),
+                name="core_parser_ds_xpath_pfx_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Keeps track of the parent the path of a loaded object was computed
+        from.
+
+        Args:
+            db:
+            field_names:
+            values:
+
+        Returns:
+
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._path_parent_id = instance.__dict__.get("parent_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Saves the object, and updates the paths of its branch if it was
+        moved.
+
+        Args:
+            args:
+            kwargs:
+
+        Returns:
+
+        """
+        self.xpath = DataStructureElement.get_options_xpath(self.options)
+        super().save(*args, **kwargs)
+
+        if self.path == "" or self._path_parent_id != self.parent_id:
+            self.update_path()
+
+    @staticmethod
+    def get_options_xpath(options):
+        """Returns the XML xpath of the options of an element.
+
+        Args:
+            options:
+
+        Returns:
+
+        """
+        xpath = options.get("xpath") if isinstance(options, dict) else None
+        return xpath.get("xml") if isinstance(xpath, dict) else None
+
+    @staticmethod
+    def get_path_segment(data_structure_element_id):
+        """Returns the segment of an element in the paths of its branch.
+
+        Args:
+            data_structure_element_id:
+
+        Returns:
+
+        """
+        # base 36 id, after its number of digits: segments sort like ids
+        digits = int_to_base36(int(data_structure_element_id))
+        return int_to_base36(len(digits)) + digits
+
+    @staticmethod
+    def get_child_path(parent_path, data_structure_element_id):
+        """Returns the path of an element from the path of its parent, None if
+        the element is too deep in its tree to be indexed.
+
+        Args:
+            parent_path:
+            data_structure_element_id:
+
+        Returns:
+
+        """
+        if parent_path is None:
+            return None
+
+        path = parent_path + DataStructureElement.get_path_segment(
+            data_structure_element_id
+        )
+        return path if len(path) <= PATH_MAX_LENGTH else None
+
+    def build_path(self, parent_path=""):
+        """Sets the path of a saved object, from the path of its parent.
+
+        Args:
+            parent_path:
+
+        Returns:
+
+        """
+        self.path = DataStructureElement.get_child_path(parent_path, self.pk)
+        self._path_parent_id = self.parent_id
+
+    @staticmethod
+    def move_branch_paths(old_path, new_path, data_structure_element_id):
+        """Updates the paths of the branch of an element, after its path
+        changed.
+
+        Args:
+            old_path:
+            new_path:
+            data_structure_element_id:
+
+        Returns:
+
+        """
+        if not old_path:
+            DataStructureElement.objects.filter(
+                pk=data_structure_element_id
+            ).update(path=new_path)
+            # the descendants of an element too deep to be indexed have no
+            # path either
+            if old_path is None and new_path is not None:
+                DataStructureElement.build_deep_paths(
+                    {data_structure_element_id: new_path}
+                )
+            return
+
+        branch = DataStructureElement.objects.filter(path__startswith=old_path)
+        if new_path is None:
+            branch.update(path=None)
+            return
+
+        # replace the old path prefix in the branch
+        branch.update(
+            path=Concat(
+                Value(new_path),
+                Substr("path", len(old_path) + 1),
+                output_field=TextField(),
+            )
+        )
+
+        branch = DataStructureElement.objects.filter(
+            path__startswith=new_path
+        ).alias(path_length=Length("path"))
+        if len(new_path) > len(old_path):
+            # the deepest elements of the branch are no longer indexed
+            branch.filter(path_length__gt=PATH_MAX_LENGTH).update(path=None)
+        else:
+            # the children of the deepest elements of the branch may now be
+            # indexed
+            DataStructureElement.build_deep_paths(
+                dict(
+                    branch.filter(
+                        path_length__gt=PATH_MAX_LENGTH
+                        - PATH_SEGMENT_MAX_LENGTH
+                        - len(old_path)
+                        + len(new_path)
+                    ).values_list("pk", "path")
+                )
+            )
+
+    @staticmethod
+    def build_deep_paths(parent_paths):
+        """Sets the paths of the descendants without path of elements, one
+        tree level at a time, as long as they can be indexed.
+
+        Args:
+            parent_paths: paths of the elements, by id
+
+        Returns:
+
+        """
+        while parent_paths:
+            parent_ids = list(parent_paths.keys())
+            level_paths = {}
+            for index in range(0, len(parent_ids), BRANCH_BATCH_SIZE):
+                for (
+                    data_structure_element_id,
+                    parent_id,
+                ) in DataStructureElement.objects.filter(
+                    parent_id__in=parent_ids[
+                        index : index + BRANCH_BATCH_SIZE
+                    ],
+                    path__isnull=True,
+                ).values_list(
+                    "pk", "parent_id"
+                ):
+                    path = DataStructureElement.get_child_path(
+                        parent_paths[parent_id], data_structure_element_id
+                    )
+                    if path is not None:
+                        level_paths[data_structure_element_id] = path
+
+            DataStructureElement.objects.bulk_update(
+                [
+                    DataStructureElement(
+                        pk=data_structure_element_id, path=path
+                    )
+                    for data_structure_element_id, path in level_paths.items()
+                ],
+                ["path"],
+                batch_size=BRANCH_BATCH_SIZE,
+            )
+            parent_paths = level_paths
+
+    def update_path(self):
+        """Updates the path of the object from its parent, and the paths of
+        its descendants.
+
+        Returns:
+
+        """
+        try:
+            paths = dict(
+                DataStructureElement.objects.filter(
+                    pk__in=[self.pk, self.parent_id]
+                ).values_list("pk", "path")
+            )
+            old_path = paths.get(self.pk, "")
+            self.build_path(paths.get(self.parent_id, ""))
+
+            if self.path == old_path:
+                return
+
+            DataStructureElement.move_branch_paths(
+                old_path, self.path, self.pk
+            )
+        except Exception as ex:
+            raise exceptions.ModelError(str(ex))
+
     @staticmethod
     def get_by_id(data_structure_element_id):
         """Returns the object with the given id.
@@ -78,46 +336,419 @@ class DataStructureElement(models.Model):
             raise exceptions.ModelError(str(ex))
 
     @staticmethod
-    def get_by_xpath(xpath):
-        """Returns the object with the given id.
+    def filter_by_xpath(queryset, xpath):
+        """Filters objects by xpath, through the index of the xpath prefixes.
 
         Args:
+            queryset:
             xpath:
 
         Returns:
-            DataStructureElement (obj): DataStructureElement object with the given id
+
+        """
+        xpath = str(xpath)
+        return queryset.alias(
+            xpath_prefix=Substr("xpath", 1, XPATH_INDEX_LENGTH)
+        ).filter(xpath_prefix=xpath[:XPATH_INDEX_LENGTH], xpath=xpath)
+
+    @staticmethod
+    def get_by_xpath(xpath, data_structure_id=None):
+        """Returns the objects with the given xpath.
+
+        Args:
+            xpath:
+            data_structure_id: restrict to a data structure, if set
+
+        Returns:
+            DataStructureElement (obj): DataStructureElement collection
 
         """
         try:
-            return DataStructureElement.objects.filter(
-                options__xpath__xml=str(xpath)
-            ).all()
+            queryset = DataStructureElement.filter_by_xpath(
+                DataStructureElement.objects, xpath
+            )
+            if data_structure_id is not None:
+                queryset = queryset.filter(data_structure_id=data_structure_id)
+            return queryset.all()
         except ObjectDoesNotExist as exception:
             raise exceptions.DoesNotExist(str(exception))
         except Exception as ex:
             raise exceptions.ModelError(str(ex))
 
     @staticmethod
-    def get_by_xpath_and_user(xpath, user=None):
-        """Returns the object with the given id and owner.
+    def get_by_xpath_and_user(xpath, user=None, data_structure_id=None):
+        """Returns the objects with the given xpath and owner.
 
         Args:
             xpath:
             user:
+            data_structure_id: restrict to a data structure, if set
 
         Returns:
-            DataStructureElement (obj): DataStructureElement object with the given id
+            DataStructureElement (obj): DataStructureElement collection
 
         """
         try:
-            return DataStructureElement.objects.filter(
-                options__xpath__xml=xpath, user=user
-            ).all()
+            queryset = DataStructureElement.filter_by_xpath(
+                DataStructureElement.objects.filter(user=user), xpath
+            )
+            if data_structure_id is not None:
+                queryset = queryset.filter(data_structure_id=data_structure_id)
+            return queryset.all()
         except ObjectDoesNotExist as exception:
             raise exceptions.DoesNotExist(str(exception))
         except Exception as ex:
             raise exceptions.ModelError(str(ex))
 
+    @staticmethod
+    def get_by_data_structure_id(data_structure_id):
+        """Returns all the objects of a data structure, ordered by id.
+
+        Args:
+            data_structure_id:
+
+        Returns:
+            DataStructureElement (obj): DataStructureElement collection
+
+        """
+        try:
+            return DataStructureElement.objects.filter(
+                data_structure_id=data_structure_id
+            ).order_by("pk")
+        except Exception as ex:
+            raise exceptions.ModelError(str(ex))
+
+    @staticmethod
+    def get_branch(data_structure_element):
+        """Returns an object and all its descendants, in document order.
+
+        Args:
+            data_structure_element:
+
+        Returns:
+            list: DataStructureElement objects
+
+        """
+        try:
+            if data_structure_element.path:
+                # branch indexed by path: one query, in document order
+                branch = list(
+                    DataStructureElement.objects.filter(
+                        path__startswith=data_structure_element.path
+                    ).order_by("path")
+                )
+                # only the deepest indexed elements may have children too
+                # deep to be indexed
+                parent_ids = [
+                    element.pk
+                    for element in branch
+                    if len(element.path)
+                    > PATH_MAX_LENGTH - PATH_SEGMENT_MAX_LENGTH
+                ]
+            else:
+                branch = list(
+                    DataStructureElement.objects.filter(
+                        pk=data_structure_element.pk
+                    )
+                )
+                parent_ids = [element.pk for element in branch]
+
+            # load the elements without path, one tree level at a time
+            branch_ids = {element.pk for element in branch}
+            deep_elements = []
+            while parent_ids:
+                level_elements = []
+                for index in range(0, len(parent_ids), BRANCH_BATCH_SIZE):
+                    level_elements.extend(
+                        element
+                        for element in DataStructureElement.objects.filter(
+                            parent_id__in=parent_ids[
+                                index : index + BRANCH_BATCH_SIZE
+                            ]
+                        ).order_by("pk")
+                        # ignore elements already found
+                        if element.pk not in branch_ids
+                    )
+                deep_elements.extend(level_elements)
+                branch_ids.update(element.pk for element in level_elements)
+                parent_ids = [element.pk for element in level_elements]
+
+            if not deep_elements:
+                return branch
+
+            # put the branch back in document order, children by id
+            children_index = {}
+            for element in sorted(
+                branch[1:] + deep_elements, key=lambda e: e.pk
+            ):
+                children_index.setdefault(element.parent_id, []).append(
+                    element
+                )
+            ordered_branch = []
+            elements = [branch[0]]
+            while elements:
+                element = elements.pop()
+                ordered_branch.append(element)
+                elements.extend(reversed(children_index.get(element.pk, [])))
+            return ordered_branch
+        except Exception as ex:
+            raise exceptions.ModelError(str(ex))
+
+    @staticmethod
+    def get_by_parent_ids(parent_ids):
+        """Returns the children of the given objects, ordered by id.
+
+        Args:
+            parent_ids:
+
+        Returns:
+            DataStructureElement (obj): DataStructureElement collection
+
+        """
+        try:
+            return DataStructureElement.objects.filter(
+                parent_id__in=parent_ids
+            ).order_by("pk")
+        except Exception as ex:
+            raise exceptions.ModelError(str(ex))
+
+    @staticmethod
+    def bulk_create(data_structure_element_list):
+        """Saves a list of new objects.
+
+        Args:
+            data_structure_element_list:
+
+        Returns:
+            list: saved DataStructureElement objects, with their primary keys
+
+        """
+        try:
+            for data_structure_element in data_structure_element_list:
+                data_structure_element.xpath = (
+                    DataStructureElement.get_options_xpath(
+                        data_structure_element.options
+                    )
+                )
+
+            if connection.features.can_return_rows_from_bulk_insert:
+                DataStructureElement.objects.bulk_create(
+                    data_structure_element_list
+                )
+                DataStructureElement._build_paths(data_structure_element_list)
+                DataStructureElement.objects.bulk_update(
+                    data_structure_element_list, ["path"]
+                )
+                return data_structure_element_list
+
+            # primary keys are needed to link the children to their parent
+            for data_structure_element in data_structure_element_list:
+                data_structure_element.save()
+            return data_structure_element_list
+        except Exception as ex:
+            raise exceptions.ModelError(str(ex))
+
+    @staticmethod
+    def _build_paths(data_structure_element_list):
+        """Sets the paths of saved objects, from the paths of their parents.
+        Parents must be saved first.
+
+        Args:
+            data_structure_element_list:
+
+        Returns:
+
+        """
+        # paths of the parents that are not in memory
+        parent_paths = dict(
+            DataStructureElement.objects.filter(
+                pk__in={
+                    data_structure_element.parent_id
+                    for data_structure_element in data_structure_element_list
+                    if data_structure_element.parent_id is not None
+                    and not DataStructureElement.parent.is_cached(
+                        data_structure_element
+                    )
+                }
+            ).values_list("pk", "path")
+        )
+
+        for data_structure_element in data_structure_element_list:
+            if data_structure_element.parent_id is None:
+                parent_path = ""
+            elif DataStructureElement.parent.is_cached(data_structure_element):
+                parent_path = data_structure_element.parent.path
+            else:
+                parent_path = parent_paths.get(
+                    data_structure_element.parent_id, ""
+                )
+            data_structure_element.build_path(parent_path)
+
+    @staticmethod
+    def bulk_update(data_structure_element_list, fields):
+        """Updates the given fields of a list of objects.
+
+        Args:
+            data_structure_element_list:
+            fields:
+
+        Returns:
+            list: updated DataStructureElement objects
+
+        """
+        try:
+            # keep the xpath in sync with the options
+            if "options" in fields and "xpath" not in fields:
+                for data_structure_element in data_structure_element_list:
+                    data_structure_element.xpath = (
+                        DataStructureElement.get_options_xpath(
+                            data_structure_element.options
+                        )
+                    )
+                fields = list(fields) + ["xpath"]
+
+            DataStructureElement.objects.bulk_update(
+                data_structure_element_list, fields
+            )
+            return data_structure_element_list
+        except Exception as ex:
+            raise exceptions.ModelError(str(ex))
+
+    @staticmethod
+    def attach_branches(data_structure_element_list):
+        """Saves the parents of saved objects without parent, and updates the
+        paths of their branches. Parents must be saved first.
+
+        Args:
+            data_structure_element_list:
+
+        Returns:
+            list: attached DataStructureElement objects
+
+        """
+        try:
+            with transaction.atomic():
+                DataStructureElement.objects.bulk_update(
+                    data_structure_element_list, ["parent"]
+                )
+
+                for data_structure_element in data_structure_element_list:
+                    # the path of an element without parent is its segment
+                    old_path = data_structure_element.path
+                    data_structure_element.build_path(
+                        data_structure_element.parent.path
+                    )
+                    DataStructureElement.move_branch_paths(
+                        old_path,
+                        data_structure_element.path,
+                        data_structure_element.pk,
+                    )
+                return data_structure_element_list
+        except Exception as ex:
+            raise exceptions.ModelError(str(ex))
+
+    @staticmethod
+    def get_branch_values(data_structure_element_id, *fields):
+        """Returns the values of an element and of all its descendants,
+        parents first: in document order while they have a path, then level
+        by level.
+
+        Args:
+            data_structure_element_id:
+            fields: names of the fields to return, after the primary key
+
+        Returns:
+            list: tuples of values, starting with the primary key
+
+        """
+        try:
+            level_values = list(
+                DataStructureElement.objects.filter(
+                    pk=data_structure_element_id
+                ).values_list("pk", "path", *fields)
+            )
+
+            # branch indexed by path: one query, in document order
+            if level_values and level_values[0][1]:
+                level_values = list(
+                    DataStructureElement.objects.filter(
+                        path__startswith=level_values[0][1]
+                    )
+                    .order_by("path")
+                    .values_list("pk", "path", *fields)
+                )
+                # only the deepest indexed elements may have children too
+                # deep to be indexed
+                parent_ids = [
+                    values[0]
+                    for values in level_values
+                    if len(values[1])
+                    > PATH_MAX_LENGTH - PATH_SEGMENT_MAX_LENGTH
+                ]
+            else:
+                parent_ids = [values[0] for values in level_values]
+
+            branch_values = [
+                (values[0],) + values[2:] for values in level_values
+            ]
+            branch_ids = {values[0] for values in branch_values}
+            while parent_ids:
+                # query the children of the level by batch of parents
+                level_values = []
+                for index in range(0, len(parent_ids), BRANCH_BATCH_SIZE):
+                    level_values.extend(
+                        values
+                        for values in DataStructureElement.objects.filter(
+                            parent_id__in=parent_ids[
+                                index : index + BRANCH_BATCH_SIZE
+                            ]
+                        ).values_list("pk", *fields)
+                        # ignore elements already found
+                        if values[0] not in branch_ids
+                    )
+                branch_values.extend(level_values)
+                branch_ids.update(values[0] for values in level_values)
+                parent_ids = [values[0] for values in level_values]
+            return branch_values
+        except Exception as ex:
+            raise exceptions.ModelError(str(ex))
+
+    @staticmethod
+    def delete_branch(data_structure_element_id):
+        """Deletes an element and all its descendants.
+
+        Args:
+            data_structure_element_id:
+
+        Returns:
+            int: number of deleted elements
+
+        """
+        try:
+            with transaction.atomic():
+                branch_ids = [
+                    values[0]
+                    for values in DataStructureElement.get_branch_values(
+                        data_structure_element_id
+                    )
+                ]
+
+                # delete the deepest elements first, no child to unlink
+                branch_ids.reverse()
+                deleted_count = 0
+                for index in range(0, len(branch_ids), BRANCH_BATCH_SIZE):
+                    _, deleted_by_model = DataStructureElement.objects.filter(
+                        pk__in=branch_ids[index : index + BRANCH_BATCH_SIZE]
+                    ).delete()
+                    deleted_count += deleted_by_model.get(
+                        DataStructureElement._meta.label, 0
+                    )
+                return deleted_count
+        except exceptions.ModelError:
+            raise
+        except Exception as ex:
+            raise exceptions.ModelError(str(ex))
+
     def __str__(self):
         """Data Structure Element as string
 
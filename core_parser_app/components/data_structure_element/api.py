@@ -1,6 +1,8 @@
 """API for Data Structure Element
 """
 
+from django.db import transaction
+
 from core_main_app.access_control.decorators import access_control
 from core_parser_app import access_control as parser_access_control
 from core_parser_app.components.data_structure.models import (
@@ -23,6 +25,51 @@ def upsert(data_structure_element, request):
     return data_structure_element
 
 
+@access_control(parser_access_control.is_data_structure_element_list_owner)
+def bulk_create(data_structure_element_list, request):
+    """Save a list of new Data Structure Elements
+
+    Args:
+        data_structure_element_list:
+        request:
+
+    Returns:
+
+    """
+    return DataStructureElement.bulk_create(data_structure_element_list)
+
+
+@access_control(parser_access_control.is_data_structure_element_list_owner)
+def bulk_update(data_structure_element_list, fields, request):
+    """Update the given fields of a list of Data Structure Elements
+
+    Args:
+        data_structure_element_list:
+        fields:
+        request:
+
+    Returns:
+
+    """
+    return DataStructureElement.bulk_update(
+        data_structure_element_list, fields
+    )
+
+
+@access_control(parser_access_control.is_data_structure_element_list_owner)
+def attach_branches(data_structure_element_list, request):
+    """Attach saved Data Structure Elements without parent to their parent
+
+    Args:
+        data_structure_element_list:
+        request:
+
+    Returns:
+
+    """
+    return DataStructureElement.attach_branches(data_structure_element_list)
+
+
 @access_control(parser_access_control.is_data_structure_element_owner)
 def get_by_id(data_structure_element_id, request):
     """Return DataStructureElement object with the given id
@@ -45,24 +92,56 @@ def get_by_id(data_structure_element_id, request):
 
 
 @access_control(parser_access_control.is_data_structure_element_owner)
-def get_by_xpath(xpath, request):
+def get_by_xpath(xpath, request, data_structure_id=None):
     """List all DataStructureElement
     Args :
         xpath:
         request:
+        data_structure_id: restrict to a data structure, if set
 
     Returns: DataStructureElement collection
     """
     if request.user.is_superuser:
-        return DataStructureElement.get_by_xpath(xpath)
+        return DataStructureElement.get_by_xpath(
+            xpath, data_structure_id=data_structure_id
+        )
     if request.user.is_anonymous:
-        return DataStructureElement.get_by_xpath_and_user(xpath, user=None)
+        return DataStructureElement.get_by_xpath_and_user(
+            xpath, user=None, data_structure_id=data_structure_id
+        )
 
     return DataStructureElement.get_by_xpath_and_user(
-        xpath, user=str(request.user.id)
+        xpath, user=str(request.user.id), data_structure_id=data_structure_id
     )
 
 
+@access_control(parser_access_control.is_data_structure_element_owner)
+def get_by_parent_ids(parent_ids, request):
+    """Return the children of the given DataStructureElements, ordered by id.
+
+    Args:
+        parent_ids:
+        request:
+
+    Returns: DataStructureElement collection
+    """
+    return DataStructureElement.get_by_parent_ids(parent_ids)
+
+
+@access_control(parser_access_control.is_data_structure_element_owner)
+def get_branch(data_structure_element, request):
+    """Return a DataStructureElement and all its descendants, in document
+    order.
+
+    Args:
+        data_structure_element:
+        request:
+
+    Returns: DataStructureElement collection
+    """
+    return DataStructureElement.get_branch(data_structure_element)
+
+
 @access_control(parser_access_control.is_data_structure_element_owner)
 def remove_child(data_structure_element, child, request):
     """Remove child from existing DataStructureElement.
@@ -76,6 +155,9 @@ def remove_child(data_structure_element, child, request):
 
     """
     data_structure_element.children.remove(child)
+    # the branch of the child is now a tree of its own
+    child.parent = None
+    child.update_path()
     return data_structure_element
 
 
@@ -91,10 +173,27 @@ def add_child(data_structure_element, child, request):
     Returns:
 
     """
-    data_structure_element.children.add(child)
+    with transaction.atomic():
+        data_structure_element.children.add(child)
+        child.update_path()
     return data_structure_element
 
 
+@access_control(parser_access_control.is_data_structure_element_branch_owner)
+def delete_branch(data_structure_element, request):
+    """Delete a DataStructureElement and all its descendants.
+
+    Args:
+        data_structure_element:
+        request:
+
+    Returns:
+        int: number of deleted elements
+
+    """
+    return DataStructureElement.delete_branch(data_structure_element.id)
+
+
 @access_control(parser_access_control.is_data_structure_element_owner)
 def get_root_element(data_structure_element, request):
     """Return element's root.
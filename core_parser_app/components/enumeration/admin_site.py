@@ -0,0 +1,14 @@
+""" Custom admin site for the Enumeration model
+"""
+
+from django.contrib import admin
+
+
+class CustomEnumerationAdmin(admin.ModelAdmin):
+    """CustomEnumerationAdmin"""
+
+    readonly_fields = ["hash", "values"]
+
+    def has_add_permission(self, request, obj=None):
+        """Prevent from manually adding Enumerations"""
+        return False
@@ -0,0 +1,74 @@
+"""API for enumerations
+"""
+
+from core_parser_app.components.enumeration.models import (
+    Enumeration,
+    EnumerationValue,
+)
+from core_parser_app.settings import PARSER_ENUMERATION_PAGE_SIZE
+
+
+def get_hash(values):
+    """Returns the hash of a list of enumeration values
+
+    Args:
+        values:
+
+    Returns:
+
+    """
+    return Enumeration.get_hash(values)
+
+
+def get_values_by_hashes(hashes):
+    """Returns the values of the enumerations with the given hashes
+
+    Args:
+        hashes:
+
+    Returns:
+        dict: enumeration values, by hash
+
+    """
+    return {
+        enumeration.hash: enumeration.values
+        for enumeration in Enumeration.get_by_hashes(hashes)
+    }
+
+
+def bulk_get_or_create(values_by_hash):
+    """Saves the enumerations that do not exist yet
+
+    Args:
+        values_by_hash: enumeration values, by hash
+
+    Returns:
+
+    """
+    Enumeration.bulk_get_or_create(values_by_hash)
+
+
+def get_values_page(enumeration_hash, prefix="", page=1, page_size=None):
+    """Returns a page of the values of an enumeration starting with a prefix,
+    ignoring case
+
+    Args:
+        enumeration_hash:
+        prefix:
+        page: number of the page, from 1
+        page_size: number of values by page (PARSER_ENUMERATION_PAGE_SIZE
+            if not set)
+
+    Returns:
+        tuple: values of the page, and if there is a next page
+
+    """
+    if page_size is None:
+        page_size = PARSER_ENUMERATION_PAGE_SIZE
+
+    start = (page - 1) * page_size
+    # one more value, to know if there is a next page
+    values = EnumerationValue.get_values_by_prefix(
+        enumeration_hash, prefix, start, start + page_size + 1
+    )
+    return values[:page_size], len(values) > page_size
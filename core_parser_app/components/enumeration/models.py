@@ -0,0 +1,167 @@
+"""Enumeration models
+"""
+
+import hashlib
+import json
+
+from django.db import models
+
+from core_main_app.commons import exceptions
+
+# maximum number of enumeration values saved in a single query
+ENUMERATION_BATCH_SIZE = 500
+
+
+class Enumeration(models.Model):
+    """Represents the values of an enumeration, shared by all the restrictions
+    using them"""
+
+    hash = models.CharField(unique=True, max_length=64)
+    values = models.JSONField(default=list, blank=True)
+
+    @staticmethod
+    def get_hash(values):
+        """Returns the hash of a list of enumeration values
+
+        Args:
+            values:
+
+        Returns:
+
+        """
+        return hashlib.sha256(json.dumps(values).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_by_hashes(hashes):
+        """Returns the enumerations with the given hashes
+
+        Args:
+            hashes:
+
+        Returns:
+            Enumeration (obj): Enumeration collection
+
+        """
+        try:
+            return Enumeration.objects.filter(hash__in=hashes)
+        except Exception as exception:
+            raise exceptions.ModelError(str(exception))
+
+    @staticmethod
+    def bulk_get_or_create(values_by_hash):
+        """Saves the enumerations that do not exist yet
+
+        Args:
+            values_by_hash: enumeration values, by hash
+
+        Returns:
+
+        """
+        try:
+            existing_hashes = set(
+                Enumeration.objects.filter(
+                    hash__in=values_by_hash.keys()
+                ).values_list("hash", flat=True)
+            )
+            new_hashes = set(values_by_hash).difference(existing_hashes)
+            if len(new_hashes) == 0:
+                return
+
+            # enumerations saved concurrently are ignored
+            Enumeration.objects.bulk_create(
+                [
+                    Enumeration(
+                        hash=enumeration_hash,
+                        values=values_by_hash[enumeration_hash],
+                    )
+                    for enumeration_hash in new_hashes
+                ],
+                ignore_conflicts=True,
+            )
+            # index the values, to search them
+            enumeration_ids = Enumeration.objects.filter(
+                hash__in=new_hashes
+            ).values_list("hash", "pk")
+            EnumerationValue.objects.bulk_create(
+                [
+                    EnumerationValue(
+                        enumeration_id=enumeration_id,
+                        position=position,
+                        value=value,
+                    )
+                    for enumeration_hash, enumeration_id in enumeration_ids
+                    for position, value in enumerate(
+                        values_by_hash[enumeration_hash]
+                    )
+                ],
+                batch_size=ENUMERATION_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+        except Exception as exception:
+            raise exceptions.ModelError(str(exception))
+
+    def __str__(self):
+        """Enumeration as string
+
+        Returns:
+
+        """
+        return self.hash
+
+
+class EnumerationValue(models.Model):
+    """Represents a value of an enumeration, indexed to search the values"""
+
+    enumeration = models.ForeignKey(
+        Enumeration,
+        on_delete=models.CASCADE,
+        related_name="enumeration_values",
+    )
+    position = models.IntegerField()
+    value = models.CharField(blank=True, null=True, max_length=2048)
+
+    class Meta:
+        """Meta"""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["enumeration", "position"],
+                name="unique_enumeration_position",
+            )
+        ]
+        indexes = [models.Index(fields=["enumeration", "value"])]
+
+    @staticmethod
+    def get_values_by_prefix(enumeration_hash, prefix, start, stop):
+        """Returns the values of an enumeration starting with a prefix,
+        ignoring case, in document order
+
+        Args:
+            enumeration_hash:
+            prefix:
+            start: index of the first value to return
+            stop: index after the last value to return
+
+        Returns:
+            list: enumeration values
+
+        """
+        try:
+            return list(
+                EnumerationValue.objects.filter(
+                    enumeration__hash=enumeration_hash,
+                    value__istartswith=prefix,
+                )
+                .order_by("position")
+                .values_list("value", flat=True)[start:stop]
+            )
+        except Exception as exception:
+            raise exceptions.ModelError(str(exception))
+
+    def __str__(self):
+        """Enumeration value as string
+
+        Returns:
+
+        """
+        return str(self.value)
@@ -0,0 +1,21 @@
+""" Custom admin site for the Form Skeleton model
+"""
+
+from django.contrib import admin
+
+
+class CustomFormSkeletonAdmin(admin.ModelAdmin):
+    """CustomFormSkeletonAdmin"""
+
+    readonly_fields = [
+        "template",
+        "content_hash",
+        "access_scope",
+        "parser_options",
+        "has_modules",
+    ]
+    exclude = ["content"]
+
+    def has_add_permission(self, request, obj=None):
+        """Prevent from manually adding Form Skeletons"""
+        return False
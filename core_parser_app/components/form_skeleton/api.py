@@ -0,0 +1,101 @@
+"""API for form skeletons
+"""
+
+import json
+import zlib
+
+from core_main_app.commons import exceptions
+from core_parser_app.components.form_skeleton.models import FormSkeleton
+from core_parser_app.tools.parser.node import dump_form_nodes, load_form_nodes
+
+
+def get_form(template_id, content_hash, access_scope, parser_options):
+    """Returns the generated form of the skeleton of a template, with its keys
+    and keyrefs, None if the template has no skeleton for this content, access
+    scope and parser options
+
+    Args:
+        template_id:
+        content_hash:
+        access_scope: id of the user whose templates were included, empty if
+            anonymous
+        parser_options:
+
+    Returns:
+        tuple: root of the form, keys and keyrefs
+
+    """
+    try:
+        form_skeleton = FormSkeleton.get_by_key(
+            template_id, content_hash, access_scope, parser_options
+        )
+    except exceptions.DoesNotExist:
+        return None
+
+    content = json.loads(zlib.decompress(form_skeleton.content))
+    return (
+        load_form_nodes(content["form"]),
+        content["keys"],
+        content["keyrefs"],
+    )
+
+
+def save_form(
+    template_id,
+    content_hash,
+    access_scope,
+    parser_options,
+    form_root,
+    keys,
+    keyrefs,
+    has_modules,
+):
+    """Saves a generated form as the skeleton of a template, for a content, an
+    access scope and parser options
+
+    Args:
+        template_id:
+        content_hash:
+        access_scope: id of the user whose templates were included, empty if
+            anonymous
+        parser_options:
+        form_root:
+        keys:
+        keyrefs:
+        has_modules:
+
+    Returns:
+
+    """
+    content = json.dumps(
+        {"form": dump_form_nodes(form_root), "keys": keys, "keyrefs": keyrefs}
+    )
+    FormSkeleton.create(
+        template_id,
+        content_hash,
+        access_scope,
+        parser_options,
+        has_modules,
+        zlib.compress(content.encode("utf-8")),
+    )
+
+
+def delete_by_template_id(template_id):
+    """Deletes the form skeletons of a template
+
+    Args:
+        template_id:
+
+    Returns:
+
+    """
+    FormSkeleton.delete_by_template_id(template_id)
+
+
+def delete_with_modules():
+    """Deletes the form skeletons containing modules
+
+    Returns:
+
+    """
+    FormSkeleton.delete_with_modules()
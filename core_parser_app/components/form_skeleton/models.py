@@ -0,0 +1,137 @@
+"""Form skeleton models
+"""
+
+from django.db import models
+
+from core_main_app.commons import exceptions
+from core_main_app.components.template.models import Template
+
+
+class FormSkeleton(models.Model):
+    """Represents the data structure generated for the new forms of a
+    template, for the templates a user can access and a set of parser
+    options"""
+
+    template = models.ForeignKey(Template, on_delete=models.CASCADE)
+    content_hash = models.CharField(max_length=64)
+    access_scope = models.CharField(max_length=200, blank=True, default="")
+    parser_options = models.CharField(max_length=255)
+    has_modules = models.BooleanField(default=False)
+    content = models.BinaryField()
+
+    class Meta:
+        """Meta"""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "template",
+                    "content_hash",
+                    "access_scope",
+                    "parser_options",
+                ],
+                name="unique_form_skeleton",
+            )
+        ]
+
+    @staticmethod
+    def get_by_key(template_id, content_hash, access_scope, parser_options):
+        """Returns the form skeleton of a template, for a content, an access
+        scope and parser options
+
+        Args:
+            template_id:
+            content_hash:
+            access_scope:
+            parser_options:
+
+        Returns:
+            FormSkeleton (obj): FormSkeleton object with the given key
+
+        """
+        try:
+            return FormSkeleton.objects.get(
+                template_id=template_id,
+                content_hash=content_hash,
+                access_scope=access_scope,
+                parser_options=parser_options,
+            )
+        except FormSkeleton.DoesNotExist as exception:
+            raise exceptions.DoesNotExist(str(exception))
+        except Exception as exception:
+            raise exceptions.ModelError(str(exception))
+
+    @staticmethod
+    def create(
+        template_id,
+        content_hash,
+        access_scope,
+        parser_options,
+        has_modules,
+        content,
+    ):
+        """Saves a form skeleton, if no skeleton has the same key
+
+        Args:
+            template_id:
+            content_hash:
+            access_scope:
+            parser_options:
+            has_modules:
+            content:
+
+        Returns:
+
+        """
+        try:
+            # skeletons saved concurrently are ignored
+            FormSkeleton.objects.bulk_create(
+                [
+                    FormSkeleton(
+                        template_id=template_id,
+                        content_hash=content_hash,
+                        access_scope=access_scope,
+                        parser_options=parser_options,
+                        has_modules=has_modules,
+                        content=content,
+                    )
+                ],
+                ignore_conflicts=True,
+            )
+        except Exception as exception:
+            raise exceptions.ModelError(str(exception))
+
+    @staticmethod
+    def delete_by_template_id(template_id):
+        """Deletes the form skeletons of a template
+
+        Args:
+            template_id:
+
+        Returns:
+
+        """
+        try:
+            FormSkeleton.objects.filter(template_id=template_id).delete()
+        except Exception as exception:
+            raise exceptions.ModelError(str(exception))
+
+    @staticmethod
+    def delete_with_modules():
+        """Deletes the form skeletons containing modules
+
+        Returns:
+
+        """
+        try:
+            FormSkeleton.objects.filter(has_modules=True).delete()
+        except Exception as exception:
+            raise exceptions.ModelError(str(exception))
+
+    def __str__(self):
+        """Form skeleton as string
+
+        Returns:
+
+        """
+        return "{0} {1}".format(self.template_id, self.parser_options)
@@ -0,0 +1,49 @@
+"""Signals to delete the form skeletons of changed templates and modules
+"""
+
+import logging
+
+from django.db.models import signals as models_signals
+
+from core_main_app.components.template.models import Template
+from core_parser_app.components.form_skeleton import api as form_skeleton_api
+from core_parser_app.components.module.models import Module
+
+logger = logging.getLogger(__name__)
+
+
+def connect():
+    """Connect signals for the form skeletons"""
+    models_signals.post_save.connect(post_save_template, sender=Template)
+    models_signals.post_save.connect(post_change_module, sender=Module)
+    models_signals.post_delete.connect(post_change_module, sender=Module)
+    logger.info("Registered signals for the form skeletons")
+
+
+def post_save_template(sender, instance, **kwargs):
+    """Signal triggered after saving a template
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+
+    Returns:
+
+    """
+    form_skeleton_api.delete_by_template_id(instance.pk)
+
+
+def post_change_module(sender, instance, **kwargs):
+    """Signal triggered after saving or deleting a module
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+
+    Returns:
+
+    """
+    # the generated modules depend on the module registry
+    form_skeleton_api.delete_with_modules()
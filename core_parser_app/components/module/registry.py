@@ -0,0 +1,69 @@
+"""Registry of the modules, kept in memory by each process
+"""
+
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from core_parser_app.components.module.models import Module
+
+RegisteredModule = namedtuple("RegisteredModule", ["view", "multiple"])
+""" View and occurrence management of a registered module.
+"""
+
+_lock = threading.Lock()
+_registry = None
+# incremented on invalidation, prevents a stale load from being kept
+_generation = 0
+
+
+def get_registry():
+    """Returns the registered modules: read-only mapping of module urls to
+    their view and occurrence management. Loaded on first access.
+
+    Returns:
+
+    """
+    registry = _registry
+    if registry is not None:
+        return registry
+
+    return _load_registry()
+
+
+def invalidate_registry():
+    """Invalidates the registry, the modules are loaded again on next access
+
+    Returns:
+
+    """
+    global _registry, _generation
+
+    with _lock:
+        _registry = None
+        _generation += 1
+
+
+def _load_registry():
+    """Loads the registered modules from the database
+
+    Returns:
+
+    """
+    global _registry
+
+    with _lock:
+        generation = _generation
+
+    registry = MappingProxyType(
+        {
+            module.url: RegisteredModule(module.view, module.multiple)
+            for module in Module.get_all()
+        }
+    )
+
+    with _lock:
+        if generation == _generation:
+            _registry = registry
+
+    return registry
@@ -0,0 +1,35 @@
+"""Signals to keep the module registry up to date
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models import signals as models_signals
+
+from core_parser_app.components.module import registry as module_registry
+from core_parser_app.components.module.models import Module
+
+logger = logging.getLogger(__name__)
+
+
+def connect():
+    """Connect signals for the module registry"""
+    models_signals.post_save.connect(post_change_module, sender=Module)
+    models_signals.post_delete.connect(post_change_module, sender=Module)
+    logger.info("Registered signals for the module registry")
+
+
+def post_change_module(sender, instance, **kwargs):
+    """Signal triggered after saving or deleting a module
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+
+    Returns:
+
+    """
+    module_registry.invalidate_registry()
+    # the registry may be loaded again before the change is committed
+    transaction.on_commit(module_registry.invalidate_registry)
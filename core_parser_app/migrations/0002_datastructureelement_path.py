@@ -0,0 +1,111 @@
+""" Migrations
+"""
+
+from django.db import migrations, models
+from django.utils.http import int_to_base36
+
+BATCH_SIZE = 500
+# maximum length of a path, deeper elements have no path
+PATH_MAX_LENGTH = 2560
+
+
+def get_path_segment(element_id):
+    """Return the segment of an element in the paths of its branch: its
+    base 36 id, after its number of digits
+
+    Args:
+        element_id:
+
+    Returns:
+
+    """
+    digits = int_to_base36(element_id)
+    return int_to_base36(len(digits)) + digits
+
+
+def get_child_path(parent_path, element_id):
+    """Return the path of an element from the path of its parent, None if
+    the element is too deep in its tree to be indexed
+
+    Args:
+        parent_path:
+        element_id:
+
+    Returns:
+
+    """
+    if parent_path is None:
+        return None
+
+    path = parent_path + get_path_segment(element_id)
+    return path if len(path) <= PATH_MAX_LENGTH else None
+
+
+def backfill_paths(apps, schema_editor):
+    """Set the path of the existing data structure elements, one tree level
+    at a time
+
+    Args:
+        apps:
+        schema_editor:
+
+    Returns:
+
+    """
+    data_structure_element_model = apps.get_model(
+        "core_parser_app", "DataStructureElement"
+    )
+
+    # paths of the elements of the current level, by id
+    level_paths = {}
+    for element_id in (
+        data_structure_element_model.objects.filter(parent__isnull=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+        .iterator()
+    ):
+        level_paths[element_id] = get_path_segment(element_id)
+
+    while len(level_paths) > 0:
+        data_structure_element_model.objects.bulk_update(
+            [
+                data_structure_element_model(pk=element_id, path=path)
+                for element_id, path in level_paths.items()
+            ],
+            ["path"],
+            batch_size=BATCH_SIZE,
+        )
+
+        parent_ids = list(level_paths.keys())
+        parent_paths = level_paths
+        level_paths = {}
+        for index in range(0, len(parent_ids), BATCH_SIZE):
+            for element_id, parent_id in (
+                data_structure_element_model.objects.filter(
+                    parent_id__in=parent_ids[index : index + BATCH_SIZE]
+                )
+                .order_by("pk")
+                .values_list("pk", "parent_id")
+            ):
+                level_paths[element_id] = get_child_path(
+                    parent_paths[parent_id], element_id
+                )
+
+
+class Migration(migrations.Migration):
+    """Migration"""
+
+    dependencies = [
+        ("core_parser_app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="datastructureelement",
+            name="path",
+            field=models.TextField(
+                blank=True, db_index=True, default="", null=True
+            ),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+    ]
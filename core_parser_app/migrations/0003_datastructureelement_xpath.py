@@ -0,0 +1,77 @@
+""" Migrations
+"""
+
+from django.db import migrations, models
+from django.db.models.functions import Substr
+
+BATCH_SIZE = 500
+
+
+def backfill_xpaths(apps, schema_editor):
+    """Copy the XML xpath of the options of the existing data structure
+    elements
+
+    Args:
+        apps:
+        schema_editor:
+
+    Returns:
+
+    """
+    data_structure_element_model = apps.get_model(
+        "core_parser_app", "DataStructureElement"
+    )
+
+    data_structure_elements = []
+    for element_id, options in (
+        data_structure_element_model.objects.order_by("pk")
+        .values_list("pk", "options")
+        .iterator()
+    ):
+        xpath = options.get("xpath") if isinstance(options, dict) else None
+        if not isinstance(xpath, dict) or xpath.get("xml") is None:
+            continue
+
+        data_structure_elements.append(
+            data_structure_element_model(pk=element_id, xpath=xpath["xml"])
+        )
+        if len(data_structure_elements) == BATCH_SIZE:
+            data_structure_element_model.objects.bulk_update(
+                data_structure_elements, ["xpath"]
+            )
+            data_structure_elements = []
+
+    data_structure_element_model.objects.bulk_update(
+        data_structure_elements, ["xpath"]
+    )
+
+
+class Migration(migrations.Migration):
+    """Migration"""
+
+    dependencies = [
+        ("core_parser_app", "0002_datastructureelement_path"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="datastructureelement",
+            name="xpath",
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="datastructureelement",
+            index=models.Index(
+                Substr("xpath", 1, 200), name="core_parser_xpath_prefix_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="datastructureelement",
+            index=models.Index(
+                models.F("data_structure"),
+                Substr("xpath", 1, 200),
+                name="core_parser_ds_xpath_pfx_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_xpaths, migrations.RunPython.noop),
+    ]
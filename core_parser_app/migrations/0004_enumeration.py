@@ -0,0 +1,31 @@
+""" Migrations
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Migration"""
+
+    dependencies = [
+        ("core_parser_app", "0003_datastructureelement_xpath"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Enumeration",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hash", models.CharField(max_length=64, unique=True)),
+                ("values", models.JSONField(blank=True, default=list)),
+            ],
+        ),
+    ]
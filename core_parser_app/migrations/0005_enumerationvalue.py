@@ -0,0 +1,96 @@
+""" Migrations
+"""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def backfill_enumeration_values(apps, schema_editor):
+    """Index the values of the existing enumerations
+
+    Args:
+        apps:
+        schema_editor:
+
+    Returns:
+
+    """
+    enumeration_model = apps.get_model("core_parser_app", "Enumeration")
+    enumeration_value_model = apps.get_model(
+        "core_parser_app", "EnumerationValue"
+    )
+
+    for enumeration_id, values in (
+        enumeration_model.objects.order_by("pk")
+        .values_list("pk", "values")
+        .iterator()
+    ):
+        enumeration_value_model.objects.bulk_create(
+            [
+                enumeration_value_model(
+                    enumeration_id=enumeration_id,
+                    position=position,
+                    value=value,
+                )
+                for position, value in enumerate(values)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+
+class Migration(migrations.Migration):
+    """Migration"""
+
+    dependencies = [
+        ("core_parser_app", "0004_enumeration"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EnumerationValue",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.IntegerField()),
+                (
+                    "value",
+                    models.CharField(blank=True, max_length=2048, null=True),
+                ),
+                (
+                    "enumeration",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="enumeration_values",
+                        to="core_parser_app.enumeration",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["enumeration", "value"],
+                        name="core_parser_enumera_e38ef2_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="enumerationvalue",
+            constraint=models.UniqueConstraint(
+                fields=("enumeration", "position"),
+                name="unique_enumeration_position",
+            ),
+        ),
+        migrations.RunPython(
+            backfill_enumeration_values, migrations.RunPython.noop
+        ),
+    ]
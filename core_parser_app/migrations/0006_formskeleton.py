@@ -0,0 +1,58 @@
+""" Migrations
+"""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Migration"""
+
+    dependencies = [
+        ("core_main_app", "0001_initial"),
+        ("core_parser_app", "0005_enumerationvalue"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FormSkeleton",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("content_hash", models.CharField(max_length=64)),
+                (
+                    "access_scope",
+                    models.CharField(blank=True, default="", max_length=200),
+                ),
+                ("parser_options", models.CharField(max_length=255)),
+                ("has_modules", models.BooleanField(default=False)),
+                ("content", models.BinaryField()),
+                (
+                    "template",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="core_main_app.template",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="formskeleton",
+            constraint=models.UniqueConstraint(
+                fields=(
+                    "template",
+                    "content_hash",
+                    "access_scope",
+                    "parser_options",
+                ),
+                name="unique_form_skeleton",
+            ),
+        ),
+    ]
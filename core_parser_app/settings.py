@@ -24,6 +24,66 @@ PARSER_MAX_IN_MEMORY_ELEMENTS = getattr(
 )
 """ Maximum number of in-memory elements allowed by the system during the parsing of XML/XSD files.
 A large number of elements may cause performance issues.
+When the forms are streamed to the database, the elements already saved are not counted,
+and the branches of the next generated elements are saved once the maximum is reached.
+"""
+
+PARSER_MAX_DEPTH = getattr(settings, "PARSER_MAX_DEPTH", 0)
+""" Maximum number of elements nested in each other in a generated form (0: no limit).
+Forms are generated on an explicit work stack, so their depth is not bounded by the recursion limit of the interpreter.
+Forms of recursive types are stopped by PARSER_MAX_IN_MEMORY_ELEMENTS, or by this limit when the forms are streamed to the database.
+"""
+
+PARSER_STREAM_BATCH_SIZE = getattr(settings, "PARSER_STREAM_BATCH_SIZE", 0)
+""" Number of generated elements of a branch above which it is saved to the database while the form is generated (0 saves the form once generated).
 """
 
 BOOTSTRAP_VERSION = getattr(settings, "BOOTSTRAP_VERSION", "5.1.3")
+
+PARSER_IMPORT_CACHE_SIZE = getattr(settings, "PARSER_IMPORT_CACHE_SIZE", 32)
+""" Maximum number of imported schemas kept in memory by the parser (0 disables the cache).
+"""
+
+PARSER_IMPORT_CACHE_TTL = getattr(settings, "PARSER_IMPORT_CACHE_TTL", 300)
+""" Number of seconds an imported schema is reused before checking its content again.
+"""
+
+PARSER_IMPORT_PREFETCH = getattr(settings, "PARSER_IMPORT_PREFETCH", False)
+""" Download all the imported schemas, concurrently, before generating a form.
+"""
+
+PARSER_IMPORT_PREFETCH_WORKERS = getattr(
+    settings, "PARSER_IMPORT_PREFETCH_WORKERS", 4
+)
+""" Maximum number of imported schemas downloaded at the same time before generating a form.
+"""
+
+PARSER_FLAT_SCHEMA_CACHE_SIZE = getattr(
+    settings, "PARSER_FLAT_SCHEMA_CACHE_SIZE", 16
+)
+""" Maximum number of flattened schemas kept in memory to add elements to existing forms (0 disables the cache).
+"""
+
+PARSER_FORM_SKELETON_CACHE = getattr(
+    settings, "PARSER_FORM_SKELETON_CACHE", False
+)
+""" Save the data structure generated for the new forms of a template, by content, access scope and parser options, and create the next new forms from it without parsing the schema.
+The saved data structures of a template are deleted when the template or a module is saved. Schemas imported or included from a URL are not checked for changes: only enable it if they don't change.
+"""
+
+PARSER_XPATH_CACHE_SIZE = getattr(settings, "PARSER_XPATH_CACHE_SIZE", 1024)
+""" Maximum number of compiled XPath expressions kept in memory (0 disables the cache).
+"""
+
+PARSER_ENUMERATION_PAGED_THRESHOLD = getattr(
+    settings, "PARSER_ENUMERATION_PAGED_THRESHOLD", 0
+)
+""" Number of enumeration values above which a restriction is rendered as a search field, loading its values by page (0 disables the search field).
+The pages that render the forms must load core_parser_app/js/enumeration.js before enabling the search field.
+"""
+
+PARSER_ENUMERATION_PAGE_SIZE = getattr(
+    settings, "PARSER_ENUMERATION_PAGE_SIZE", 50
+)
+""" Number of enumeration values returned by page to the search field of a restriction.
+"""
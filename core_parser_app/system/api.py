@@ -7,15 +7,14 @@ def delete_branch_from_db(element_id):
     Args:
         element_id:
     Returns:
+        int: number of deleted elements
     """
     from core_parser_app.components.data_structure.models import (
         DataStructureElement,
     )
 
     element = DataStructureElement.get_by_id(element_id)
-    for child in element.children.all():
-        delete_branch_from_db(str(child.pk))
-    element.delete()
+    return DataStructureElement.delete_branch(element.pk)
 
 
 def get_data_structure_by_id(data_structure_id):
@@ -12,7 +12,7 @@ def delete_branch_task(data_structure_element_root_id):
     """
     from core_parser_app.system import api as system_api
 
-    system_api.delete_branch_from_db(data_structure_element_root_id)
+    return system_api.delete_branch_from_db(data_structure_element_root_id)
 
 
 @shared_task
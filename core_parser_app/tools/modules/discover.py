@@ -8,6 +8,7 @@ from django.urls import URLPattern, URLResolver
 
 from core_main_app.commons.exceptions import ModelError
 from core_parser_app.components.module import api as module_api
+from core_parser_app.components.module import registry as module_registry
 from core_parser_app.components.module.models import Module
 from core_parser_app.tools.modules.exceptions import ModuleError
 from core_parser_app.tools.modules.views.module import AbstractModule
@@ -21,6 +22,8 @@ def reload_modules(urls):
     :return:
     """
     logger.info("START discover modules.")
+    # modules are loaded again on next access
+    module_registry.invalidate_registry()
 
     try:
         # Remove all existing modules
@@ -59,6 +62,7 @@ def reload_modules(urls):
         module_api.delete_all()
         raise exception
 
+    module_registry.invalidate_registry()
     logger.info("FINISH discover modules.")
 
 
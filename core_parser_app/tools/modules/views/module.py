@@ -16,6 +16,7 @@ from core_parser_app.components.data_structure_element import (
     api as data_structure_element_api,
 )
 from core_parser_app.components.module import api as module_api
+from core_parser_app.components.module import registry as module_registry
 from core_parser_app.tools.modules.exceptions import ModuleError
 
 
@@ -238,7 +239,10 @@ class AbstractModule(View, metaclass=ABCMeta):
         :param url:
         :return:
         """
-        module = module_api.get_by_url(url)
+        module = module_registry.get_registry().get(url)
+        if module is None:
+            # raises an error if the module does not exist
+            module = module_api.get_by_url(url)
         return AbstractModule.get_view_from_view_path(module.view).as_view()
 
     @staticmethod
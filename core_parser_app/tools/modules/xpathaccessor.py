@@ -44,10 +44,10 @@ class XPathAccessor(metaclass=ABCMeta):
 
         Return:
         """
-        root_id = data_structure_api.get_by_id(
+        form_root = data_structure_api.get_by_id(
             form_id
-        ).data_structure_element_root.id
-        form_element = self._get_element(root_id, xpath)
+        ).data_structure_element_root
+        form_element = self._get_form_element(form_id, form_root, xpath)
         input_element = self.get_input(form_element)
 
         if input_element.tag != "module":
@@ -68,27 +68,75 @@ class XPathAccessor(metaclass=ABCMeta):
     def get_input(self, element):
         input_elements = ["input", "restriction", "choice", "module"]
 
-        if element.tag in input_elements:
-            return element
+        # follow the first children down to an input
+        while element is not None and element.tag not in input_elements:
+            element = next(iter(element.children.all()), None)
 
-        for child in element.children.all():
-            return self.get_input(child)
+        return element
 
-    def _get_element(self, form_id, xpath):
-        form_root = data_structure_element_api.get_by_id(form_id, self.request)
+    def _get_form_element(self, form_id, form_root, xpath):
+        """Return the first element of the form with the given xpath, in
+        document order
 
-        if self.element_has_xpath(form_root, xpath):
-            return form_root
+        Args:
+            form_id:
+            form_root:
+            xpath:
 
-        if form_root.children.count() == 0:
+        Return:
+        """
+        # form without path: walk the tree
+        if not form_root.path:
+            return self._get_element(form_root.id, xpath)
+
+        # indexed lookup, restricted to the tree of the form
+        form_elements = list(
+            data_structure_element_api.get_by_xpath(
+                xpath, self.request, data_structure_id=form_id
+            )
+        )
+        # elements too deep to have a path: walk the tree
+        if any(element.path is None for element in form_elements):
+            return self._get_element(form_root.id, xpath)
+
+        form_elements = [
+            element
+            for element in form_elements
+            if element.path.startswith(form_root.path)
+        ]
+        if len(form_elements) == 0:
             return None
 
-        for child in form_root.children.all():
-            element = self._get_element(child.pk, xpath)
+        return min(form_elements, key=lambda element: element.path)
 
-            if element is not None:
+    def _get_element(self, form_id, xpath):
+        # load the tree one level at a time, then walk it depth-first, in
+        # document order
+        root_element = data_structure_element_api.get_by_id(
+            form_id, self.request
+        )
+        children_index = {}
+        parent_ids = [root_element.pk]
+        while len(parent_ids) > 0:
+            children = data_structure_element_api.get_by_parent_ids(
+                parent_ids, self.request
+            )
+            parent_ids = []
+            for child in children:
+                children_index.setdefault(child.parent_id, []).append(child)
+                parent_ids.append(child.pk)
+
+        elements = [root_element]
+        while len(elements) > 0:
+            element = elements.pop()
+
+            if self.element_has_xpath(element, xpath):
                 return element
 
+            elements.extend(reversed(children_index.get(element.pk, [])))
+
+        return None
+
     @staticmethod
     def element_has_xpath(element, xpath):
         return (
@@ -0,0 +1,398 @@
+"""Parser context
+"""
+
+import re
+
+from core_parser_app.tools.parser.utils.xml import get_app_info_options
+from xml_utils.commons.constants import LXML_SCHEMA_NAMESPACE
+from xml_utils.xsd_tree.operations.namespaces import (
+    get_namespaces,
+    get_default_prefix,
+    get_target_namespace,
+)
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+XSI_NAMESPACE = "http://www.w3.org/2001/XMLSchema-instance"
+
+# step of the XML xpaths built by the parser: optional attribute axis, name
+# test (prefixed name or local-name() test), optional position
+DATA_PATH_STEP = re.compile(
+    r'^(@)?(?:\*\[local-name\(\)="([^"]+)"\]|(?:([^\W\d][\w.-]*):)?'
+    r"([^\W\d][\w.-]*))(?:\[([1-9][0-9]*)\])?$"
+)
+
+
+class SchemaContext:
+    """Namespace information of a schema tree, computed once per parse"""
+
+    def __init__(self, xml_tree):
+        """Initialize the schema context
+
+        Args:
+            xml_tree:
+        """
+        self.xml_tree = xml_tree
+
+        # get schema namespaces
+        self.namespaces = get_namespaces(XSDTree.tostring(xml_tree))
+        # namespaces with the XSI prefix used by extensions
+        self.xsi_namespaces = dict(self.namespaces)
+        self.xsi_namespaces["xsi"] = XSI_NAMESPACE
+
+        self.default_prefix = get_default_prefix(self.namespaces)
+        (
+            self.target_namespace,
+            self.target_namespace_prefix,
+        ) = get_target_namespace(xml_tree, self.namespaces)
+
+        # prefix bound to the target namespace (None if not found)
+        self.ns_prefix = None
+        if self.target_namespace is not None:
+            for prefix, namespace in self.namespaces.items():
+                if namespace == self.target_namespace:
+                    self.ns_prefix = prefix
+                    break
+
+        root_attrib = xml_tree.getroot().attrib
+        self.element_form_default = root_attrib.get(
+            "elementFormDefault", "unqualified"
+        )
+        self.attribute_form_default = root_attrib.get(
+            "attributeFormDefault", "unqualified"
+        )
+
+
+class SymbolTable:
+    """Definitions, extensions and imports of a schema tree, indexed once per
+    parse"""
+
+    def __init__(self, xml_tree):
+        """Index the schema tree
+
+        Args:
+            xml_tree:
+        """
+        self.xml_tree = xml_tree
+        root = xml_tree.getroot()
+
+        # top-level definitions, by tag and name (first definition kept)
+        self.definitions = {}
+        for child in root:
+            if isinstance(child.tag, str) and "name" in child.attrib:
+                self.definitions.setdefault(
+                    (child.tag, child.attrib["name"]), child
+                )
+
+        # types extending a type, by name of the base type
+        self.extensions = {}
+        for extension in root.iter(
+            "{0}extension".format(LXML_SCHEMA_NAMESPACE)
+        ):
+            if "base" not in extension.attrib:
+                continue
+            # TODO: manage namespaces
+            base = extension.attrib["base"]
+            if ":" in base:
+                base = base.split(":")[1]
+
+            # get parent type that contains the extension
+            type_extension = extension.getparent()
+            while type_extension is not None and (
+                "simpleType" not in type_extension.tag
+                and "complexType" not in type_extension.tag
+            ):
+                type_extension = type_extension.getparent()
+            if type_extension is not None:
+                self.extensions.setdefault(base, []).append(type_extension)
+
+        # import elements, by namespace (first import kept)
+        self.imports = {}
+        for el_import in root.iter("{0}import".format(LXML_SCHEMA_NAMESPACE)):
+            if "namespace" in el_import.attrib:
+                self.imports.setdefault(
+                    el_import.attrib["namespace"], el_import
+                )
+
+    def get_definition(self, tag, name):
+        """Return the top-level definition with the given tag and name, None
+        if not found
+
+        Args:
+            tag: tag of the definition, without namespace (element,
+                complexType, ...)
+            name:
+
+        Returns:
+
+        """
+        return self.definitions.get(
+            ("{0}{1}".format(LXML_SCHEMA_NAMESPACE, tag), name)
+        )
+
+    def get_extensions(self, base_type_name):
+        """Return the types extending a type, in document order
+
+        Args:
+            base_type_name:
+
+        Returns:
+
+        """
+        return list(self.extensions.get(base_type_name, []))
+
+    def get_import(self, namespace):
+        """Return the import element of a namespace, None if not found
+
+        Args:
+            namespace:
+
+        Returns:
+
+        """
+        return self.imports.get(namespace)
+
+
+class DataPathIndex:
+    """Children of the elements of an XML document, by tag, indexed in one
+    pass to find the data at the xpaths built by the parser"""
+
+    def __init__(self, xml_root):
+        """Index the XML document
+
+        Args:
+            xml_root:
+        """
+        self.xml_root = xml_root
+
+        # children of the elements, by tag, in document order
+        self.children = {}
+        for element in xml_root.iter():
+            if not isinstance(element.tag, str):
+                continue
+            parent = element.getparent()
+            if parent is not None:
+                self.children.setdefault(parent, {}).setdefault(
+                    element.tag, []
+                ).append(element)
+
+    def find(self, xpath, namespaces):
+        """Return the elements, or the values of the attributes, at an absolute
+        xpath, in document order. Return None if the xpath is not supported by
+        the index.
+
+        Args:
+            xpath:
+            namespaces:
+
+        Returns:
+
+        """
+        if not xpath.startswith("/"):
+            return None
+
+        steps = xpath[1:].split("/")
+        nodes = None
+        for step_index, step in enumerate(steps):
+            match = DATA_PATH_STEP.match(step)
+            if match is None:
+                return None
+            is_attribute, local_name, prefix, name, position = match.groups()
+
+            if prefix is not None:
+                if prefix not in namespaces:
+                    return None
+                name = "{{{0}}}{1}".format(namespaces[prefix], name)
+
+            if is_attribute:
+                # attributes end the path, and have a single occurrence
+                if (
+                    nodes is None
+                    or position is not None
+                    or step_index != len(steps) - 1
+                ):
+                    return None
+                return self._get_attribute_values(nodes, name, local_name)
+
+            if nodes is None:
+                # the root element is the only child of the document
+                candidates = [
+                    (
+                        [self.xml_root]
+                        if self._is_matching(
+                            self.xml_root.tag, name, local_name
+                        )
+                        else []
+                    )
+                ]
+            else:
+                candidates = [
+                    self._get_children(node, name, local_name)
+                    for node in nodes
+                ]
+
+            nodes = []
+            for children in candidates:
+                if position is None:
+                    nodes.extend(children)
+                elif int(position) <= len(children):
+                    nodes.append(children[int(position) - 1])
+
+        return nodes
+
+    def _get_children(self, element, name, local_name):
+        """Return the children of an element with a name, or a local name
+
+        Args:
+            element:
+            name:
+            local_name:
+
+        Returns:
+
+        """
+        children_by_tag = self.children.get(element, {})
+        if local_name is None:
+            return children_by_tag.get(name, [])
+
+        return [
+            child
+            for child in element
+            if isinstance(child.tag, str)
+            and self._is_matching(child.tag, None, local_name)
+        ]
+
+    def _get_attribute_values(self, elements, name, local_name):
+        """Return the values of an attribute of the elements
+
+        Args:
+            elements:
+            name:
+            local_name:
+
+        Returns:
+
+        """
+        values = []
+        for element in elements:
+            for attribute_name, value in element.attrib.items():
+                if self._is_matching(attribute_name, name, local_name):
+                    values.append(value)
+        return values
+
+    @staticmethod
+    def _is_matching(tag, name, local_name):
+        """Check if a tag matches a name, or a local name
+
+        Args:
+            tag:
+            name:
+            local_name:
+
+        Returns:
+
+        """
+        if local_name is None:
+            return tag == name
+        return tag.rsplit("}", 1)[-1] == local_name
+
+
+class ParserContext:
+    """State shared by all the generators during a single parse"""
+
+    def __init__(self):
+        """Initialize the parser context"""
+        # schema contexts, by identity of the schema tree
+        self.schema_contexts = {}
+        # trees of the imported schemas, by schema location
+        self.imported_trees = {}
+        # symbol tables, by identity of the schema tree
+        self.symbol_tables = {}
+        # data path indexes, by identity of the root of the data
+        self.data_path_indexes = {}
+        # app info options, by schema element
+        self.app_info_options = {}
+
+    def get_schema_context(self, xml_tree):
+        """Return the schema context of a tree, build it on first access
+
+        Args:
+            xml_tree:
+
+        Returns:
+
+        """
+        schema_context = self.schema_contexts.get(id(xml_tree))
+
+        # the context keeps a reference to its tree, the id cannot be reused
+        if schema_context is None or schema_context.xml_tree is not xml_tree:
+            schema_context = SchemaContext(xml_tree)
+            self.schema_contexts[id(xml_tree)] = schema_context
+
+        return schema_context
+
+    def get_symbol_table(self, xml_tree):
+        """Return the symbol table of a tree, build it on first access
+
+        Args:
+            xml_tree:
+
+        Returns:
+
+        """
+        symbol_table = self.symbol_tables.get(id(xml_tree))
+
+        # the table keeps a reference to its tree, the id cannot be reused
+        if symbol_table is None or symbol_table.xml_tree is not xml_tree:
+            symbol_table = SymbolTable(xml_tree)
+            self.symbol_tables[id(xml_tree)] = symbol_table
+
+        return symbol_table
+
+    def get_app_info_options(self, element):
+        """Return the app info options of a schema element, read them on
+        first access
+
+        Args:
+            element:
+
+        Returns:
+
+        """
+        # the dictionary keeps a reference to the element, the key stays valid
+        app_info = self.app_info_options.get(element)
+        if app_info is None:
+            app_info = get_app_info_options(element)
+            self.app_info_options[element] = app_info
+
+        return app_info
+
+    def clear_app_info_options(self, element):
+        """Forget the app info options of a schema element, after its
+        annotations changed
+
+        Args:
+            element:
+
+        Returns:
+
+        """
+        self.app_info_options.pop(element, None)
+
+    def get_data_path_index(self, xml_root):
+        """Return the data path index of an XML document, build it on first
+        access
+
+        Args:
+            xml_root:
+
+        Returns:
+
+        """
+        data_path_index = self.data_path_indexes.get(id(xml_root))
+
+        # the index keeps a reference to its root, the id cannot be reused
+        if data_path_index is None or data_path_index.xml_root is not xml_root:
+            data_path_index = DataPathIndex(xml_root)
+            self.data_path_indexes[id(xml_root)] = data_path_index
+
+        return data_path_index
@@ -0,0 +1,312 @@
+"""Nodes of the forms generated by the parser
+"""
+
+import sys
+from collections import namedtuple
+from collections.abc import MutableMapping
+
+# XSD and XML xpaths of a generated element, stored as a dict in database
+FormXPath = namedtuple("FormXPath", ["xsd", "xml"])
+
+
+class FormOptions(MutableMapping):
+    """Options of a node of a form: the common options of the tag of the node
+    are stored in slots, and the other options in a dict"""
+
+    __slots__ = ("other_options",)
+
+    # keys of the options stored in slots, in the order they are generated
+    option_keys = ()
+
+    def __init__(self, options=None):
+        """Initialize the options
+
+        Args:
+            options: dict of options
+        """
+        self.other_options = None
+        if options is not None:
+            for key, option in options.items():
+                self[key] = option
+
+    def __getitem__(self, key):
+        if key in self.option_keys:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+
+        if self.other_options is None:
+            raise KeyError(key)
+
+        return self.other_options[key]
+
+    def __setitem__(self, key, option):
+        if key in self.option_keys:
+            setattr(self, key, option)
+        elif self.other_options is None:
+            self.other_options = {key: option}
+        else:
+            self.other_options[key] = option
+
+    def __delitem__(self, key):
+        if key in self.option_keys:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        elif self.other_options is None:
+            raise KeyError(key)
+        else:
+            del self.other_options[key]
+
+    def __iter__(self):
+        for key in self.option_keys:
+            if hasattr(self, key):
+                yield key
+
+        if self.other_options is not None:
+            yield from self.other_options
+
+    def __len__(self):
+        nb_options = sum(1 for key in self.option_keys if hasattr(self, key))
+        if self.other_options is not None:
+            nb_options += len(self.other_options)
+
+        return nb_options
+
+    def __repr__(self):
+        return "{0}({1!r})".format(type(self).__name__, dict(self))
+
+
+class ElementOptions(FormOptions):
+    """Options of element and attribute nodes"""
+
+    __slots__ = option_keys = (
+        "name",
+        "min",
+        "max",
+        "module",
+        "xpath",
+        "schema_location",
+        "type",
+        "label",
+        "xmlns",
+        "ns_prefix",
+    )
+
+
+class InputOptions(FormOptions):
+    """Options of input nodes"""
+
+    __slots__ = option_keys = (
+        "placeholder",
+        "tooltip",
+        "use",
+        "input_type",
+        "fixed",
+        "default",
+    )
+
+
+class TypeOptions(FormOptions):
+    """Options of simple and complex type nodes"""
+
+    __slots__ = option_keys = (
+        "name",
+        "xmlns",
+        "ns_prefix",
+        "fixed",
+        "default",
+    )
+
+
+class SequenceOptions(FormOptions):
+    """Options of sequence nodes"""
+
+    __slots__ = option_keys = ("min", "max", "xpath", "schema_location")
+
+
+class ChoiceOptions(FormOptions):
+    """Options of choice nodes"""
+
+    __slots__ = option_keys = (
+        "xpath",
+        "schema_location",
+        "label",
+        "tooltip",
+        "min",
+        "max",
+    )
+
+
+class ModuleOptions(FormOptions):
+    """Options of module nodes"""
+
+    __slots__ = option_keys = (
+        "data",
+        "attributes",
+        "params",
+        "multiple",
+        "xpath",
+        "url",
+    )
+
+
+class RestrictionOptions(FormOptions):
+    """Options of restriction nodes"""
+
+    __slots__ = option_keys = ("base", "fixed")
+
+
+# options of the nodes, by tag (other tags: FormOptions)
+FORM_OPTIONS_CLASSES = {
+    "element": ElementOptions,
+    "attribute": ElementOptions,
+    "input": InputOptions,
+    "simple_type": TypeOptions,
+    "complex_type": TypeOptions,
+    "sequence": SequenceOptions,
+    "choice": ChoiceOptions,
+    "module": ModuleOptions,
+    "restriction": RestrictionOptions,
+}
+
+
+def get_form_options(tag, options):
+    """Return the options of a node of the given tag
+
+    Args:
+        tag:
+        options: dict of options (None: the node has no options)
+
+    Returns:
+
+    """
+    if options is None or isinstance(options, FormOptions):
+        return options
+
+    return FORM_OPTIONS_CLASSES.get(tag, FormOptions)(options)
+
+
+class FormNode:
+    """Node of a form generated by the parser, before it is saved as a data
+    structure element"""
+
+    __slots__ = ("tag", "value", "options", "children", "saved_element")
+
+    def __init__(
+        self, tag, value=None, options=None, children=None, saved_element=None
+    ):
+        """Initialize the node
+
+        Args:
+            tag:
+            value:
+            options: dict of options of the node, stored as FormOptions
+                (None: the node has no options)
+            children: children of the node (None: the node has no children)
+            saved_element: data structure element of the node, if its branch
+                is already saved
+        """
+        self.tag = sys.intern(tag)
+        self.value = value
+        self.options = get_form_options(self.tag, options)
+        self.children = children
+        self.saved_element = saved_element
+
+    def get_options(self):
+        """Return the options of the node, as stored in database
+
+        Returns:
+
+        """
+        if self.options is None:
+            return None
+
+        return {
+            key: (
+                option._asdict() if isinstance(option, FormXPath) else option
+            )
+            for key, option in self.options.items()
+        }
+
+    def to_dict(self):
+        """Return the node and its descendants as nested dicts, with the
+        options as stored in database
+
+        Returns:
+
+        """
+        node_dict = {"tag": self.tag, "value": self.value}
+        if self.options is not None:
+            node_dict["options"] = self.get_options()
+        if self.children is not None:
+            node_dict["children"] = [
+                child.to_dict() for child in self.children
+            ]
+
+        return node_dict
+
+
+def dump_form_nodes(root):
+    """Return a form as a list of rows, in document order: the tag, value,
+    options and number of children of each node (None: no children)
+
+    Args:
+        root:
+
+    Returns:
+
+    """
+    rows = []
+    nodes = [root]
+    while len(nodes) > 0:
+        node = nodes.pop()
+        rows.append(
+            [
+                node.tag,
+                node.value,
+                node.get_options(),
+                len(node.children) if node.children is not None else None,
+            ]
+        )
+        if node.children:
+            nodes.extend(reversed(node.children))
+
+    return rows
+
+
+def load_form_nodes(rows):
+    """Return the root of a form from its list of rows
+
+    Args:
+        rows:
+
+    Returns:
+
+    """
+    root = None
+    # nodes whose children are being loaded, with their number of children
+    # left to load
+    parents = []
+    for tag, value, options, nb_children in rows:
+        node = FormNode(
+            tag,
+            value=value,
+            options=options,
+            children=[] if nb_children is not None else None,
+        )
+
+        if len(parents) > 0:
+            parents[-1][0].children.append(node)
+            parents[-1][1] -= 1
+            if parents[-1][1] == 0:
+                parents.pop()
+        else:
+            root = node
+
+        if nb_children:
+            parents.append([node, nb_children])
+
+    return root
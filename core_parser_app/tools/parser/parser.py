@@ -1,6 +1,8 @@
 """Parser class
 """
 
+import hashlib
+import json
 import logging
 import numbers
 import re
@@ -8,12 +10,18 @@ import sys
 import traceback
 from builtins import range
 from builtins import str
-from typing import Dict, Any
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from copy import copy, deepcopy
 from urllib.parse import parse_qsl
 
+import requests
+from django.db import transaction
 from lxml import etree
 
 from core_main_app.commons.exceptions import CoreError
+from core_main_app.settings import SSL_CERTIFICATES_DIR
 from core_main_app.utils.requests_utils.requests_utils import send_get_request
 from core_main_app.utils.xsd_flattener.xsd_flattener_database_url import (
     XSDFlattenerDatabaseOrURL,
@@ -24,13 +32,26 @@ from core_parser_app.components.data_structure.models import (
 from core_parser_app.components.data_structure_element import (
     api as data_structure_element_api,
 )
-from core_parser_app.components.module import api as module_api
+from core_parser_app.components.enumeration import api as enumeration_api
+from core_parser_app.components.form_skeleton import api as form_skeleton_api
+from core_parser_app.components.module import registry as module_registry
 from core_parser_app.settings import (
     MODULE_TAG_NAME,
+    PARSER_MAX_DEPTH,
     PARSER_MAX_IN_MEMORY_ELEMENTS,
+    PARSER_STREAM_BATCH_SIZE,
+    PARSER_IMPORT_CACHE_SIZE,
+    PARSER_IMPORT_CACHE_TTL,
+    PARSER_IMPORT_PREFETCH,
+    PARSER_IMPORT_PREFETCH_WORKERS,
+    PARSER_FLAT_SCHEMA_CACHE_SIZE,
+    PARSER_FORM_SKELETON_CACHE,
 )
+from core_parser_app.tools.parser.context import ParserContext, SymbolTable
 from core_parser_app.tools.parser.exceptions import ParserError
+from core_parser_app.tools.parser.node import FormNode, FormXPath
 from core_parser_app.tools.parser.renderer.list import ListRenderer
+from core_parser_app.tools.parser.utils.cache import LRUCache
 from core_parser_app.tools.parser.utils.rendering import format_tooltip
 from core_parser_app.tools.parser.utils.xml import (
     get_app_info_options,
@@ -38,12 +59,13 @@ from core_parser_app.tools.parser.utils.xml import (
     get_attribute_occurrences,
     get_module_url,
     delete_annotations,
+    evaluate_xpath,
 )
+from core_parser_app.tools.parser.work_stack import generation_step
 from xml_utils.commons.constants import LXML_SCHEMA_NAMESPACE
 from xml_utils.xsd_tree.operations.appinfo import add_appinfo_child_to_element
 from xml_utils.xsd_tree.operations.namespaces import (
     get_namespaces,
-    get_default_prefix,
     get_target_namespace,
 )
 from xml_utils.xsd_tree.xsd_tree import XSDTree
@@ -55,72 +77,275 @@ logger = logging.getLogger(__name__)
 ##################################################
 # Part I: Utilities
 ##################################################
+
+
 def load_schema_data_in_db(request, xsd_data, data_structure, parent=None):
     """Load data in database
+
+    The tree is inserted level by level, in a single transaction. The values
+    of the enumerations are stored once, and referenced by hash from the
+    options of their restriction. The branches saved while the form was
+    generated are attached to their parent.
+
     Args:
         request:
         xsd_data:
         data_structure:
+        parent:
 
     Returns:
     """
-    xsd_element = DataStructureElement(
-        user=str(request.user.id) if request.user.id else None,
-        data_structure=data_structure,
-        parent=parent,
+    root_elements, _ = _load_branches(
+        request, [xsd_data], data_structure, parent
     )
-    xsd_element.tag = xsd_data["tag"]
+    return root_elements[0]
 
-    if xsd_data["value"] is not None:
-        if isinstance(xsd_data["value"], numbers.Number):
-            element_value = str(xsd_data["value"])
-        else:
-            element_value = xsd_data["value"]
 
-        element_value = element_value.lstrip()
-        xsd_data["value"] = element_value.rstrip()
+def _load_branches(request, branches, data_structure, parent=None):
+    """Load sibling branches in database, level by level, in a single
+    transaction
 
-    xsd_element.value = xsd_data["value"]
+    Args:
+        request:
+        branches: generated data of the roots of the branches
+        data_structure:
+        parent:
 
-    if "options" in xsd_data:
-        if (
-            xsd_element.tag == "module"
-            and xsd_data["options"]["data"] is not None
-        ):
-            module_data = xsd_data["options"]["data"]
-            module_data = module_data.lstrip()
-            xsd_data["options"]["data"] = module_data.rstrip()
+    Returns:
+        list: roots of the branches
+        int: number of saved elements
+    """
+    user = str(request.user.id) if request.user.id else None
+    root_elements = None
+    nb_elements = 0
+    # children of the choice-iter elements, by identity of the choice-iter
+    choice_iters = {}
+    # values of the enumerations, by hash
+    enumerations = {}
+
+    with transaction.atomic():
+        tree_level = [(xsd_data, parent) for xsd_data in branches]
+        while len(tree_level) > 0:
+            level_elements = []
+            # elements of the level already saved, with their new parent
+            saved_elements = []
+            level_roots = []
+            next_tree_level = []
+
+            for element_data, parent_element in tree_level:
+                xsd_element = element_data.saved_element
+                if xsd_element is None:
+                    xsd_element = _build_data_structure_element(
+                        element_data, user, data_structure, parent_element
+                    )
+                    level_elements.append(xsd_element)
+                elif parent_element is not None:
+                    # branch saved during the generation of the form
+                    xsd_element.parent = parent_element
+                    saved_elements.append(xsd_element)
+
+                if root_elements is None:
+                    level_roots.append(xsd_element)
+
+                # children of the choice-iter, in order
+                if id(parent_element) in choice_iters:
+                    choice_iters[id(parent_element)][1].append(xsd_element)
+
+                if element_data.saved_element is not None:
+                    continue
+
+                enumeration_values = _get_enumeration_values(element_data)
+                if enumeration_values is not None:
+                    enumeration_hash = enumeration_api.get_hash(
+                        enumeration_values
+                    )
+                    enumerations[enumeration_hash] = enumeration_values
+                    xsd_element.options = dict(
+                        xsd_element.options,
+                        enumeration=enumeration_hash,
+                        enumeration_size=len(enumeration_values),
+                    )
+                    continue
+
+                children = [
+                    (child, xsd_element)
+                    for child in element_data.children or []
+                ]
+                next_tree_level.extend(children)
+
+                if xsd_element.tag == "choice-iter":
+                    choice_iters[id(xsd_element)] = (xsd_element, [])
 
-        xsd_element.options = xsd_data["options"]
+            data_structure_element_api.bulk_create(level_elements, request)
+            if len(saved_elements) > 0:
+                data_structure_element_api.attach_branches(
+                    saved_elements, request
+                )
 
-    data_structure_element_api.upsert(xsd_element, request)
-    if "children" in xsd_data:
-        for child in xsd_data["children"]:
-            load_schema_data_in_db(
+            if root_elements is None:
+                root_elements = level_roots
+            nb_elements += len(level_elements)
+            tree_level = next_tree_level
+
+        if len(enumerations) > 0:
+            enumeration_api.bulk_get_or_create(enumerations)
+
+        if len(choice_iters) > 0:
+            for choice_iter, choice_children in choice_iters.values():
+                if choice_iter.value is None:
+                    choice_iter.value = str(choice_children[0].pk)
+                else:  # Value set => Put the pk of the displayed child
+                    child_index = int(choice_iter.value)
+                    choice_iter.value = str(choice_children[child_index].pk)
+
+            data_structure_element_api.bulk_update(
+                [choice_iter for choice_iter, _ in choice_iters.values()],
+                ["value"],
                 request,
-                child,
-                data_structure=data_structure,
-                parent=xsd_element,
             )
 
-    if xsd_element.tag == "choice-iter":
-        if xsd_element.value is None:
-            xsd_element.value = str(
-                xsd_element.children.all().order_by("pk")[0].pk
-            )
-            data_structure_element_api.upsert(xsd_element, request)
-        else:  # Value set => Put the pk of the displayed child
-            child_index = int(xsd_element.value)
-            xsd_element.value = str(
-                xsd_element.children.all().order_by("pk")[child_index].pk
+    return root_elements, nb_elements
+
+
+class BranchWriter:
+    """Saves the branches of the generated elements while a form is
+    generated, to keep a bounded number of generated elements in memory"""
+
+    def __init__(self, request, data_structure, batch_size):
+        """Initialize the writer
+
+        Args:
+            request:
+            data_structure:
+            batch_size: number of generated elements of a branch above which
+                it is saved
+        """
+        self.request = request
+        self.data_structure = data_structure
+        self.batch_size = batch_size
+        # roots of the saved branches
+        self.saved_elements = []
+        # whether the in-memory budget has been exceeded
+        self.over_budget = False
+
+    def save_children(self, xsd_data):
+        """Save the branches of the children of generated data, and replace
+        the children by the saved elements
+
+        Args:
+            xsd_data:
+
+        Returns:
+            int: number of saved elements
+        """
+        children = xsd_data.children or []
+        if len(children) == 0:
+            return 0
+
+        saved_elements, nb_elements = _load_branches(
+            self.request, children, self.data_structure
+        )
+        xsd_data.children = [
+            FormNode(
+                saved_element.tag,
+                value=saved_element.value,
+                options=saved_element.options,
+                children=[],
+                saved_element=saved_element,
             )
-            data_structure_element_api.upsert(xsd_element, request)
+            for saved_element in saved_elements
+        ]
+        self.saved_elements.extend(saved_elements)
+        return nb_elements
+
+    def delete_detached_branches(self):
+        """Delete the saved branches that were not attached to the form
+
+        Returns:
+            int: number of deleted elements
+        """
+        deleted_count = 0
+        for saved_element in self.saved_elements:
+            if saved_element.parent_id is None:
+                deleted_count += data_structure_element_api.delete_branch(
+                    saved_element, self.request
+                )
+        return deleted_count
+
+
+def _get_enumeration_values(xsd_data):
+    """Return the values of the enumeration children of a restriction, None
+    if it has other children
+
+    Args:
+        xsd_data:
+
+    Returns:
+    """
+    if xsd_data.tag != "restriction":
+        return None
+
+    children = xsd_data.children or []
+    if len(children) == 0 or any(
+        child.tag != "enumeration" for child in children
+    ):
+        return None
+
+    return [_format_value(child.value) for child in children]
+
+
+def _format_value(value):
+    """Return the value of an element, as stored in database
+
+    Args:
+        value:
+
+    Returns:
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, numbers.Number):
+        value = str(value)
+
+    return value.strip()
+
+
+def _build_data_structure_element(xsd_data, user, data_structure, parent):
+    """Build an unsaved data structure element from the generated data
+
+    Args:
+        xsd_data:
+        user:
+        data_structure:
+        parent:
+
+    Returns:
+    """
+    xsd_element = DataStructureElement(
+        user=user,
+        data_structure=data_structure,
+        parent=parent,
+    )
+    xsd_element.tag = xsd_data.tag
+
+    xsd_data.value = _format_value(xsd_data.value)
+    xsd_element.value = xsd_data.value
+
+    if xsd_data.options is not None:
+        if (
+            xsd_element.tag == "module"
+            and xsd_data.options["data"] is not None
+        ):
+            module_data = xsd_data.options["data"]
+            module_data = module_data.lstrip()
+            xsd_data.options["data"] = module_data.rstrip()
+
+        xsd_element.options = xsd_data.get_options()
 
     return xsd_element
 
 
-# TODO: look into using delete cascade
-# FIXME: not removing all data structure elements
 def delete_branch_from_db(request, element_id):
     """Delete a branch from the database
 
@@ -129,17 +354,19 @@ def delete_branch_from_db(request, element_id):
         element_id:
 
     Returns:
+        int: number of deleted elements
     """
     element = data_structure_element_api.get_by_id(element_id, request)
 
-    for child in element.children.all().order_by("pk"):
-        delete_branch_from_db(request, str(child.pk))
-
-    element.delete()
+    return data_structure_element_api.delete_branch(element, request)
 
 
 def update_branch_xpath(element, request=None):
     """Update the xpath in a branch
+
+    The branch is loaded at once, and only the elements whose xpath changed
+    are saved.
+
     Args:
         element:
         request:
@@ -147,11 +374,17 @@ def update_branch_xpath(element, request=None):
     Returns:
     """
     element_xpath = element.options["xpath"]["xml"]
-    xpath_index = 1
+    children_index = get_children_index(element, request)
+
+    updated_elements = []
+    for xpath_index, child in enumerate(children_index[element.pk], 1):
+        updated_elements.extend(
+            _update_xpath_index(
+                child, element_xpath, xpath_index, children_index
+            )
+        )
 
-    for child in element.children.all().order_by("pk"):
-        update_root_xpath(child, element_xpath, xpath_index, request)
-        xpath_index += 1
+    _save_xpaths(updated_elements, request)
 
 
 def remove_child_element(data_structure_element, child_element, request):
@@ -209,22 +442,175 @@ def update_root_xpath(element, xpath, index, request=None):
     Returns:
 
     """
-    element_options = element.options
+    _save_xpaths(
+        _update_xpath_index(
+            element, xpath, index, get_children_index(element, request)
+        ),
+        request,
+    )
+
+
+def get_children_index(element, request=None):
+    """Load the descendants of an element, and return them by id of their
+    parent, ordered by id
+
+    Args:
+        element:
+        request:
+
+    Returns:
+
+    """
+    children_index = {element.pk: []}
+
+    # branch indexed by path: load all its elements at once
+    if element.path:
+        for branch_element in data_structure_element_api.get_branch(
+            element, request
+        ):
+            if branch_element.pk == element.pk:
+                continue
+            children_index[branch_element.pk] = []
+            children_index[branch_element.parent_id].append(branch_element)
+        return children_index
+
+    # load the branch, one tree level at a time
+    parent_ids = [element.pk]
+    while len(parent_ids) > 0:
+        children = DataStructureElement.get_by_parent_ids(parent_ids)
+        parent_ids = []
+        for child in children:
+            children_index[child.pk] = []
+            children_index[child.parent_id].append(child)
+            parent_ids.append(child.pk)
 
-    if "xpath" in element_options:
-        xml_xpath = element_options["xpath"]["xml"]
-        element_options["xpath"]["xml"] = xml_xpath.replace(
-            xpath + "[1]", xpath + "[" + str(index) + "]", 1
+    return children_index
+
+
+def _update_xpath_index(element, xpath, index, children_index):
+    """Set the index of the xpath in the options of a branch, and return the
+    elements whose xpath changed
+
+    Args:
+        element:
+        xpath:
+        index:
+        children_index: descendants of the element, by id of their parent
+
+    Returns:
+
+    """
+    updated_elements = []
+    branch = [element]
+    while len(branch) > 0:
+        branch_element = branch.pop()
+        element_options = branch_element.options
+
+        if "xpath" in element_options:
+            xml_xpath = element_options["xpath"]["xml"]
+            updated_xpath = xml_xpath.replace(
+                xpath + "[1]", xpath + "[" + str(index) + "]", 1
+            )
+
+            if updated_xpath != xml_xpath:
+                element_options["xpath"]["xml"] = updated_xpath
+                branch_element.options = element_options
+                updated_elements.append(branch_element)
+
+        branch.extend(children_index.get(branch_element.pk, []))
+
+    return updated_elements
+
+
+def _get_xpath_index(xpath, xsd_data):
+    """Return the index of an xpath in the XML xpaths of generated data, None
+    if they don't contain it
+
+    Args:
+        xpath:
+        xsd_data:
+
+    Returns:
+
+    """
+    nodes = [xsd_data]
+    while len(nodes) > 0:
+        node = nodes.pop()
+        xpath_option = (node.options or {}).get("xpath")
+        xml_xpath = (
+            xpath_option.get("xml")
+            if isinstance(xpath_option, dict)
+            else getattr(xpath_option, "xml", None)
         )
+        if xml_xpath is not None and xml_xpath.startswith(xpath + "["):
+            index = xml_xpath[len(xpath) + 1 :].split("]", 1)[0]
+            if index.isdigit():
+                return int(index)
+
+        nodes.extend(reversed(node.children or []))
+
+    return None
+
+
+def _set_xpath_index(xsd_data, xpath, old_index, new_index):
+    """Replace the index of an xpath in the XML xpaths of generated data
 
-        element.options = element_options
-        data_structure_element_api.upsert(element, request)
+    Args:
+        xsd_data:
+        xpath:
+        old_index:
+        new_index:
 
-    for child in element.children.all().order_by("pk"):
-        update_root_xpath(child, xpath, index, request)
+    Returns:
 
+    """
+    old_xpath = "{0}[{1}]".format(xpath, old_index)
+    new_xpath = "{0}[{1}]".format(xpath, new_index)
+
+    nodes = [xsd_data]
+    while len(nodes) > 0:
+        node = nodes.pop()
+        xpath_option = (node.options or {}).get("xpath")
+        if isinstance(xpath_option, FormXPath):
+            if xpath_option.xml is not None:
+                node.options["xpath"] = xpath_option._replace(
+                    xml=xpath_option.xml.replace(old_xpath, new_xpath, 1)
+                )
+        elif isinstance(xpath_option, dict) and xpath_option.get("xml"):
+            node.options["xpath"] = dict(
+                xpath_option,
+                xml=xpath_option["xml"].replace(old_xpath, new_xpath, 1),
+            )
 
-def get_nodes_xpath(elements, xml_tree, download_enabled=True, request=None):
+        nodes.extend(node.children or [])
+
+
+def _save_xpaths(data_structure_elements, request=None):
+    """Save the xpath of the elements, in a single transaction
+
+    Args:
+        data_structure_elements:
+        request:
+
+    Returns:
+
+    """
+    if len(data_structure_elements) == 0:
+        return
+
+    with transaction.atomic():
+        data_structure_element_api.bulk_update(
+            data_structure_elements, ["options"], request
+        )
+
+
+def get_nodes_xpath(
+    elements,
+    xml_tree,
+    download_enabled=True,
+    request=None,
+    parser_context=None,
+):
     """Perform a lookup in subelements to build xpath.
 
     Get nodes' xpath, only one level deep. It's not going to every leaves. Only
@@ -235,10 +621,14 @@ def get_nodes_xpath(elements, xml_tree, download_enabled=True, request=None):
         xml_tree: xml_tree
         download_enabled:
         request:
+        parser_context:
     """
     # FIXME Making one function with get_subnode_xpath should be possible,
     #  both are doing the same job
     # FIXME same problems as in get_subnodes_xpath
+    if parser_context is None:
+        parser_context = ParserContext()
+
     xpaths = []
     element_tag = None
     schema_location = None
@@ -259,8 +649,9 @@ def get_nodes_xpath(elements, xml_tree, download_enabled=True, request=None):
                     element_tag = "attribute"
 
                 # get schema namespaces
-                xml_tree_str = XSDTree.tostring(xml_tree)
-                namespaces = get_namespaces(xml_tree_str)
+                namespaces = parser_context.get_schema_context(
+                    xml_tree
+                ).namespaces
                 ref = element.attrib["ref"]
                 ref_element, ref_tree, schema_location = get_ref_element(
                     xml_tree,
@@ -270,6 +661,7 @@ def get_nodes_xpath(elements, xml_tree, download_enabled=True, request=None):
                     schema_location,
                     download_enabled=download_enabled,
                     request=request,
+                    parser_context=parser_context,
                 )
 
                 if ref_element is not None:
@@ -286,6 +678,7 @@ def get_nodes_xpath(elements, xml_tree, download_enabled=True, request=None):
                     xml_tree,
                     download_enabled=download_enabled,
                     request=request,
+                    parser_context=parser_context,
                 )
             )
     return xpaths
@@ -298,6 +691,7 @@ def lookup_occurs(
     edit_data_tree,
     download_enabled=True,
     request=None,
+    parser_context=None,
 ):
     """Lookup in data to get the number of occurrences of a sequence or  choice
     without a name (i.e. not within a named complextype).
@@ -318,20 +712,27 @@ def lookup_occurs(
         edit_data_tree: XML data tree
         download_enabled:
         request:
+        parser_context:
     """
     # FIXME this function is not returning the correct output
+    if parser_context is None:
+        parser_context = ParserContext()
+
     # get all possible xpaths of sub nodes
     xpaths = get_nodes_xpath(
-        element, xml_tree, download_enabled=download_enabled, request=request
+        element,
+        xml_tree,
+        download_enabled=download_enabled,
+        request=request,
+        parser_context=parser_context,
     )
     elements_found = []
 
     # get target namespace prefix if one declared
-    xml_tree_str = XSDTree.tostring(xml_tree)
-    namespaces = get_namespaces(xml_tree_str)
-    target_namespace, target_namespace_prefix = get_target_namespace(
-        xml_tree, namespaces
-    )
+    schema_context = parser_context.get_schema_context(xml_tree)
+    namespaces = schema_context.namespaces
+    target_namespace = schema_context.target_namespace
+    target_namespace_prefix = schema_context.target_namespace_prefix
 
     # check if xpaths find a match in the document
     for xpath in xpaths:
@@ -343,23 +744,48 @@ def lookup_occurs(
             target_namespace,
             target_namespace_prefix,
         )
-        edit_elements = edit_data_tree.xpath(
-            element_path, namespaces=namespaces
+        edit_elements = find_data(
+            edit_data_tree, element_path, namespaces, parser_context
         )
         elements_found.extend(edit_elements)
 
     return elements_found
 
 
-def is_module_multiple(element):
+def find_data(edit_data_tree, xpath, namespaces, parser_context=None):
+    """Return the elements, or the values of the attributes, of the XML data at
+    an xpath. Look up the data path index of the data, evaluate the xpath if
+    the index does not support it.
+
+    Args:
+        edit_data_tree: XML data tree
+        xpath:
+        namespaces:
+        parser_context:
+
+    Returns:
+
+    """
+    if parser_context is not None:
+        data = parser_context.get_data_path_index(edit_data_tree).find(
+            xpath, namespaces
+        )
+        if data is not None:
+            return data
+
+    return evaluate_xpath(edit_data_tree, xpath, namespaces)
+
+
+def is_module_multiple(element, parser_context=None):
     """Checks if the module is multiple (means it manages the occurrences)
 
     Args: element:
+          parser_context:
     Returns::
     """
-    module_url = get_module_url(element)
+    module_url = get_module_url(element, parser_context)
     if module_url is not None:
-        module = module_api.get_by_url(module_url.path)
+        module = module_registry.get_registry()[module_url.path]
         return module.multiple
 
     return False
@@ -423,6 +849,7 @@ def get_element_type(
     attr="type",
     download_enabled=True,
     request=None,
+    parser_context=None,
 ):
     """Get XSD type to render. Returns the tree where the type was found.
 
@@ -436,6 +863,7 @@ def get_element_type(
         attr:
         download_enabled:
         request:
+        parser_context:
 
     Returns the type if found
         - complexType
@@ -472,6 +900,8 @@ def get_element_type(
                     # remove default prefix and ':'
                     prefix_length = len(default_prefix) + 1
                     element_type = element_type[prefix_length:]
+                # the names of built-in types are shared by the generated inputs
+                element_type = sys.intern(element_type)
             elif element.attrib.get(attr) is not None:  # FIXME is it possible?
                 # TODO: manage namespaces
                 # test if type of the element is a simpleType
@@ -482,50 +912,33 @@ def get_element_type(
                     if type_ns_prefix != target_namespace_prefix:
                         # TODO: manage ref to imported elements (different
                         #  target namespace)
-                        # get all import elements
-                        imports = xml_tree.findall(
-                            "//{}import".format(LXML_SCHEMA_NAMESPACE)
-                        )
                         # find the referred document using the prefix
                         # the namespace is declared inline
                         if type_ns_prefix in element.nsmap:
-                            for el_import in imports:
-                                import_ns = el_import.attrib["namespace"]
-                                if element.nsmap[type_ns_prefix] == import_ns:
-                                    (
-                                        xml_tree,
-                                        schema_location,
-                                    ) = import_xml_tree(
-                                        el_import,
-                                        download_enabled=download_enabled,
-                                        request=request,
-                                    )
-                                    break
+                            import_ns = element.nsmap[type_ns_prefix]
                         else:
-                            if type_ns_prefix in namespaces:
-                                for el_import in imports:
-                                    import_ns = el_import.attrib["namespace"]
-                                    if namespaces[type_ns_prefix] == import_ns:
-                                        (
-                                            xml_tree,
-                                            schema_location,
-                                        ) = import_xml_tree(
-                                            el_import,
-                                            download_enabled=download_enabled,
-                                            request=request,
-                                        )
-                                        break
-
-                xpath = "./{0}complexType[@name='{1}']".format(
-                    LXML_SCHEMA_NAMESPACE, type_name
+                            import_ns = namespaces.get(type_ns_prefix)
+
+                        el_import = get_symbol_table(
+                            xml_tree, parser_context
+                        ).get_import(import_ns)
+                        if el_import is not None:
+                            xml_tree, schema_location = import_xml_tree(
+                                el_import,
+                                download_enabled=download_enabled,
+                                request=request,
+                                parser_context=parser_context,
+                            )
+
+                symbol_table = get_symbol_table(xml_tree, parser_context)
+                element_type = symbol_table.get_definition(
+                    "complexType", type_name
                 )
-                element_type = xml_tree.find(xpath)
                 if element_type is None:
                     # test if type of the element is a simpleType
-                    xpath = "./{0}simpleType[@name='{1}']".format(
-                        LXML_SCHEMA_NAMESPACE, type_name
+                    element_type = symbol_table.get_definition(
+                        "simpleType", type_name
                     )
-                    element_type = xml_tree.find(xpath)
     except Exception as exception:
         exception_message = (
             "Something went wrong in get_element_type:  " + str(exception)
@@ -537,7 +950,69 @@ def get_element_type(
     return element_type, xml_tree, schema_location
 
 
-def import_xml_tree(el_import, download_enabled=True, request=None):
+def get_content_hash(content):
+    """Return the hash of the content of a schema
+
+    Args:
+        content:
+
+    Returns:
+
+    """
+    return hashlib.sha256(
+        content if isinstance(content, bytes) else content.encode("utf-8")
+    ).hexdigest()
+
+
+def get_access_scope(request):
+    """Return the scope of the templates that the request can access: the id
+    of its user, None if anonymous. Schemas flattened with the templates of a
+    scope are only shared within this scope.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+
+    return str(user.id)
+
+
+ImportedSchema = namedtuple(
+    "ImportedSchema", ["content_hash", "etag", "xml_tree"]
+)
+""" Parsed and flattened imported schema, with the validators of its content.
+"""
+
+IMPORTED_SCHEMA_CACHE = LRUCache(
+    PARSER_IMPORT_CACHE_SIZE, ttl=PARSER_IMPORT_CACHE_TTL
+)
+""" Imported schemas, by schema location and access scope, shared by all the parses of the
+process.
+"""
+
+
+def get_imported_schema_key(ref_xml_schema_url, request=None):
+    """Return the key of an imported schema in the cache: its includes are
+    flattened with the templates that the request can access
+
+    Args:
+        ref_xml_schema_url:
+        request:
+
+    Returns:
+
+    """
+    return ref_xml_schema_url, get_access_scope(request)
+
+
+def import_xml_tree(
+    el_import, download_enabled=True, request=None, parser_context=None
+):
     """
     Return tree after downloading import's schemaLocation
 
@@ -545,6 +1020,7 @@ def import_xml_tree(el_import, download_enabled=True, request=None):
         el_import:
         download_enabled:
         request
+        parser_context:
     Returns:
     """
     # get the location of the schema
@@ -554,10 +1030,114 @@ def import_xml_tree(el_import, download_enabled=True, request=None):
     if not download_enabled:
         raise ParserError("Dependency could not be downloaded")
 
-    # download the file
-    ref_xml_schema_file = send_get_request(ref_xml_schema_url)
+    # the same copy of the import is used during the whole parse
+    if (
+        parser_context is not None
+        and schema_location in parser_context.imported_trees
+    ):
+        return parser_context.imported_trees[schema_location], schema_location
+
+    imported_schema = load_imported_schema(ref_xml_schema_url, request)
+    # the parser modifies the tree: the cached tree is not shared
+    xml_tree = deepcopy(imported_schema.xml_tree)
+
+    if parser_context is not None:
+        parser_context.imported_trees[schema_location] = xml_tree
+
+    return xml_tree, schema_location
+
+
+def load_imported_schema(ref_xml_schema_url, request=None):
+    """Return the imported schema from the cache, download it if the cached
+    entry is missing, or expired and changed since it was cached
+
+    Args:
+        ref_xml_schema_url:
+        request:
+
+    Returns:
+
+    """
+    cache_key = get_imported_schema_key(ref_xml_schema_url, request)
+    imported_schema = IMPORTED_SCHEMA_CACHE.get(cache_key)
+    if imported_schema is not None:
+        return imported_schema
+
+    # expired entry, kept to check if the content has changed
+    imported_schema = IMPORTED_SCHEMA_CACHE.peek(cache_key)
+
+    return build_imported_schema(
+        ref_xml_schema_url,
+        download_imported_schema(ref_xml_schema_url, imported_schema),
+        imported_schema,
+        request=request,
+    )
+
+
+def download_imported_schema(
+    ref_xml_schema_url, imported_schema=None, session=None
+):
+    """Download an imported schema, only if modified when an expired entry of
+    the cache is given
+
+    Args:
+        ref_xml_schema_url:
+        imported_schema: expired entry of the cache
+        session: HTTP session to send the request with
+
+    Returns:
+
+    """
+    kwargs = {}
+    if imported_schema is not None and imported_schema.etag:
+        kwargs["headers"] = {"If-None-Match": imported_schema.etag}
+
+    if session is not None:
+        return session.get(
+            ref_xml_schema_url, verify=SSL_CERTIFICATES_DIR, **kwargs
+        )
+
+    return send_get_request(ref_xml_schema_url, **kwargs)
+
+
+def build_imported_schema(
+    ref_xml_schema_url, ref_xml_schema_file, imported_schema=None, request=None
+):
+    """Build the imported schema from the downloaded file, and cache it
+
+    Args:
+        ref_xml_schema_url:
+        ref_xml_schema_file: response of the download
+        imported_schema: expired entry of the cache
+        request:
+
+    Returns:
+
+    """
+    cache_key = get_imported_schema_key(ref_xml_schema_url, request)
+    # content not modified
+    if (
+        imported_schema is not None
+        and imported_schema.etag
+        and ref_xml_schema_file.status_code == 304
+    ):
+        IMPORTED_SCHEMA_CACHE.set(cache_key, imported_schema)
+        return imported_schema
+
     # read the content of the file
     ref_xml_schema_content = ref_xml_schema_file.content
+    content_hash = get_content_hash(ref_xml_schema_content)
+    etag = ref_xml_schema_file.headers.get("ETag")
+
+    # content unchanged since it was cached
+    if (
+        imported_schema is not None
+        and imported_schema.content_hash == content_hash
+    ):
+        imported_schema = imported_schema._replace(etag=etag)
+        IMPORTED_SCHEMA_CACHE.set(cache_key, imported_schema)
+        return imported_schema
+
     # build the tree
     xml_tree = XSDTree.build_tree(ref_xml_schema_content)
     # look for includes
@@ -568,13 +1148,223 @@ def import_xml_tree(el_import, download_enabled=True, request=None):
         flattener = XSDFlattenerDatabaseOrURL(
             ref_xml_schema_content,
             request=request,
-            download_enabled=download_enabled,
         )
         # flatten the includes
         ref_xml_schema_content = flattener.get_flat()
         # build the tree
         xml_tree = XSDTree.build_tree(ref_xml_schema_content)
-    return xml_tree, schema_location
+
+    imported_schema = ImportedSchema(content_hash, etag, xml_tree)
+    IMPORTED_SCHEMA_CACHE.set(cache_key, imported_schema)
+    return imported_schema
+
+
+IMPORT_SESSION = None
+""" HTTP session shared by the downloads of imported schemas made ahead of the parse.
+"""
+
+
+def get_import_session():
+    """Return the HTTP session used to download imported schemas ahead of
+    the parse, create it on first access
+
+    Returns:
+
+    """
+    global IMPORT_SESSION
+
+    if IMPORT_SESSION is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=PARSER_IMPORT_PREFETCH_WORKERS
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        IMPORT_SESSION = session
+
+    return IMPORT_SESSION
+
+
+def prefetch_imported_schemas(xml_tree, request=None):
+    """Download the schemas imported by a tree, and the schemas they import,
+    concurrently, into the imported schema cache. Schemas that can't be
+    loaded are left to the parser, that raises the error when it needs them.
+
+    Downloads run in a bounded thread pool. The trees are built and cached
+    by the calling thread.
+
+    Args:
+        xml_tree:
+        request:
+
+    Returns:
+
+    """
+    # schema locations already seen
+    schema_locations = set()
+    # downloads in progress: schema location and expired entry, by future
+    downloads = {}
+    with ThreadPoolExecutor(
+        max_workers=PARSER_IMPORT_PREFETCH_WORKERS
+    ) as executor:
+        xml_trees = [xml_tree]
+        while len(xml_trees) > 0 or len(downloads) > 0:
+            # start the downloads of the imports of the trees
+            while len(xml_trees) > 0:
+                for el_import in (
+                    xml_trees.pop()
+                    .getroot()
+                    .iter("{0}import".format(LXML_SCHEMA_NAMESPACE))
+                ):
+                    schema_location = el_import.attrib.get("schemaLocation")
+                    if (
+                        schema_location is None
+                        or schema_location in schema_locations
+                    ):
+                        continue
+                    schema_locations.add(schema_location)
+
+                    cache_key = get_imported_schema_key(
+                        schema_location, request
+                    )
+                    imported_schema = IMPORTED_SCHEMA_CACHE.get(cache_key)
+                    if imported_schema is not None:
+                        xml_trees.append(imported_schema.xml_tree)
+                        continue
+
+                    imported_schema = IMPORTED_SCHEMA_CACHE.peek(cache_key)
+                    future = executor.submit(
+                        download_imported_schema,
+                        schema_location,
+                        imported_schema,
+                        session=get_import_session(),
+                    )
+                    downloads[future] = (schema_location, imported_schema)
+
+            if len(downloads) == 0:
+                break
+
+            done, _ = wait(downloads, return_when=FIRST_COMPLETED)
+            for future in done:
+                schema_location, imported_schema = downloads.pop(future)
+                try:
+                    imported_schema = build_imported_schema(
+                        schema_location,
+                        future.result(),
+                        imported_schema,
+                        request=request,
+                    )
+                except Exception as exception:
+                    logger.warning(
+                        "Imported schema %s could not be prefetched: %s",
+                        schema_location,
+                        str(exception),
+                    )
+                    continue
+
+                xml_trees.append(imported_schema.xml_tree)
+
+
+FlatSchema = namedtuple("FlatSchema", ["xml_tree", "namespaces"])
+""" Parsed schema, with its includes flattened, and its namespaces.
+"""
+
+FLAT_SCHEMA_CACHE = LRUCache(PARSER_FLAT_SCHEMA_CACHE_SIZE)
+""" Flattened schemas, by template or schema location, content hash and access scope, shared
+by all the parses of the process.
+"""
+
+
+def load_flat_schema(
+    xsd_doc_data, template_id=None, download_enabled=True, request=None
+):
+    """Return the flattened schema from the cache, flatten it if missing
+
+    Args:
+        xsd_doc_data:
+        template_id:
+        download_enabled:
+        request:
+
+    Returns:
+
+    """
+    cache_key = (
+        "template",
+        template_id,
+        get_content_hash(xsd_doc_data),
+        download_enabled,
+        get_access_scope(request),
+    )
+
+    flat_schema = FLAT_SCHEMA_CACHE.get(cache_key)
+    if flat_schema is not None:
+        return flat_schema
+
+    # build the XML tree
+    xml_doc_tree = XSDTree.build_tree(xsd_doc_data)
+    # flatten the includes
+    xml_doc_tree_str = XSDFlattenerDatabaseOrURL(
+        XSDTree.tostring(xml_doc_tree),
+        request=request,
+        download_enabled=download_enabled,
+    ).get_flat()
+
+    flat_schema = FlatSchema(
+        XSDTree.build_tree(xml_doc_tree_str), get_namespaces(xsd_doc_data)
+    )
+    FLAT_SCHEMA_CACHE.set(cache_key, flat_schema)
+    return flat_schema
+
+
+def load_flat_imported_schema(schema_location, request=None):
+    """Return the flattened imported schema from the cache, load it if
+    missing or if its content has changed
+
+    Args:
+        schema_location:
+        request:
+
+    Returns:
+
+    """
+    imported_schema = load_imported_schema(schema_location, request)
+    cache_key = (
+        "import",
+        schema_location,
+        imported_schema.content_hash,
+        get_access_scope(request),
+    )
+
+    flat_schema = FLAT_SCHEMA_CACHE.get(cache_key)
+    if flat_schema is not None:
+        return flat_schema
+
+    flat_schema = FlatSchema(
+        imported_schema.xml_tree,
+        get_namespaces(XSDTree.tostring(imported_schema.xml_tree)),
+    )
+    FLAT_SCHEMA_CACHE.set(cache_key, flat_schema)
+    return flat_schema
+
+
+def contains_module(xsd_data):
+    """Check if generated data contains a module
+
+    Args:
+        xsd_data:
+
+    Returns:
+
+    """
+    elements = [xsd_data]
+    while len(elements) > 0:
+        element_data = elements.pop()
+        if element_data.tag == "module":
+            return True
+        elements.extend(element_data.children or [])
+
+    return False
 
 
 def get_ref_element(
@@ -585,6 +1375,7 @@ def get_ref_element(
     schema_location=None,
     download_enabled=True,
     request=None,
+    parser_context=None,
 ):
     """
 
@@ -596,6 +1387,7 @@ def get_ref_element(
         schema_location:
         download_enabled:
         request:
+        parser_context:
 
     Returns
         - ref_element: ref element when found
@@ -617,38 +1409,29 @@ def get_ref_element(
         )
         # ref is in the same file
         if target_namespace_prefix == ref_namespace_prefix:
-            ref_element = xml_tree.find(
-                "./{0}{1}[@name='{2}']".format(
-                    LXML_SCHEMA_NAMESPACE, element_tag, ref_name
-                )
-            )
+            ref_element = get_symbol_table(
+                xml_tree, parser_context
+            ).get_definition(element_tag, ref_name)
         else:  # the ref might be in one of the imports
-            # get all import elements
-            imports = xml_tree.findall(
-                "//{}import".format(LXML_SCHEMA_NAMESPACE)
-            )
             # find the referred document using the prefix
-            for el_import in imports:
-                import_ns = el_import.attrib["namespace"]
-                if namespaces[ref_namespace_prefix] == import_ns:
-                    xml_tree, schema_location = import_xml_tree(
-                        el_import,
-                        download_enabled=download_enabled,
-                        request=request,
-                    )
+            el_import = get_symbol_table(xml_tree, parser_context).get_import(
+                namespaces.get(ref_namespace_prefix)
+            )
+            if el_import is not None:
+                xml_tree, schema_location = import_xml_tree(
+                    el_import,
+                    download_enabled=download_enabled,
+                    request=request,
+                    parser_context=parser_context,
+                )
 
-                    ref_element = xml_tree.find(
-                        "./{0}{1}[@name='{2}']".format(
-                            LXML_SCHEMA_NAMESPACE, element_tag, ref_name
-                        )
-                    )
-                    break
+                ref_element = get_symbol_table(
+                    xml_tree, parser_context
+                ).get_definition(element_tag, ref_name)
     else:
-        ref_element = xml_tree.find(
-            "./{0}{1}[@name='{2}']".format(
-                LXML_SCHEMA_NAMESPACE, element_tag, ref
-            )
-        )
+        ref_element = get_symbol_table(
+            xml_tree, parser_context
+        ).get_definition(element_tag, ref)
 
     return ref_element, xml_tree, schema_location
 
@@ -735,38 +1518,37 @@ def get_element_namespace(element, xsd_tree):
     return element_ns
 
 
-def get_extensions(xml_doc_tree, base_type_name):
+def get_extensions(xml_doc_tree, base_type_name, parser_context=None):
     """
     Get all XML extensions of the XML Schema
     Args:
         xml_doc_tree:
         base_type_name:
+        parser_context:
 
     Returns::
     """
     # TODO: look for extensions in imported documents
-    # get all extensions of the document
-    extensions = xml_doc_tree.findall(
-        ".//{0}extension".format(LXML_SCHEMA_NAMESPACE)
+    return get_symbol_table(xml_doc_tree, parser_context).get_extensions(
+        base_type_name
     )
-    # keep only simple/complex type extensions, no built-in types
-    custom_type_extensions = []
-    for extension in extensions:
-        base = extension.attrib["base"]
-        # TODO: manage namespaces
-        if ":" in base:
-            base = base.split(":")[1]
-        if base_type_name == base:
-            # get parent type that contains the extension
-            type_extension = extension.getparent()
-            while (
-                "simpleType" not in type_extension.tag
-                and "complexType" not in type_extension.tag
-            ):
-                type_extension = type_extension.getparent()
-            custom_type_extensions.append(type_extension)
 
-    return custom_type_extensions
+
+def get_symbol_table(xml_tree, parser_context=None):
+    """Return the symbol table of a schema tree, shared by the whole parse if
+    a parser context is given
+
+    Args:
+        xml_tree:
+        parser_context:
+
+    Returns:
+
+    """
+    if parser_context is None:
+        return SymbolTable(xml_tree)
+
+    return parser_context.get_symbol_table(xml_tree)
 
 
 def get_xml_xpath(
@@ -839,6 +1621,43 @@ def get_xml_xpath(
     return xml_xpath
 
 
+# indexes of the steps of an xpath
+XPATH_INDEX_PATTERN = re.compile(r"\[[0-9]+]")
+
+# patterns removing the namespace prefixes from an xpath, by prefixes
+NAMESPACE_PREFIX_PATTERNS = {}
+
+
+def normalize_key_xpath(xpath, nsmap, remove_indexes=True):
+    """Remove the indexes and the namespace prefixes from an xpath, to match
+    it with the xpaths of the keys and keyrefs
+
+    Args:
+        xpath:
+        nsmap: namespaces of the element, whose prefixes are removed
+        remove_indexes:
+
+    Returns:
+
+    """
+    if remove_indexes:
+        xpath = XPATH_INDEX_PATTERN.sub("", xpath)
+
+    # all the patterns end with a colon
+    if ":" not in xpath:
+        return xpath
+
+    prefixes = tuple(nsmap.keys())
+    patterns = NAMESPACE_PREFIX_PATTERNS.get(prefixes)
+    if patterns is None:
+        patterns = [re.compile(r"{}:".format(prefix)) for prefix in prefixes]
+        NAMESPACE_PREFIX_PATTERNS[prefixes] = patterns
+
+    for pattern in patterns:
+        xpath = pattern.sub("", xpath)
+    return xpath
+
+
 ##################################################
 # Part II: Schema parsing
 ##################################################
@@ -855,6 +1674,8 @@ class XSDParser:
         download_dependencies=True,
         store_type=False,
         request=None,
+        prefetch_imports=PARSER_IMPORT_PREFETCH,
+        stream_batch_size=PARSER_STREAM_BATCH_SIZE,
     ):
         """Initialize XSD Parser
 
@@ -867,6 +1688,9 @@ class XSDParser:
             download_dependencies:
             store_type:
             request:
+            prefetch_imports: download all the imports before the generation
+            stream_batch_size: number of generated elements of a branch above
+                which it is saved during the generation (0: saved at the end)
         """
         self.min_tree = min_tree
         self.ignore_modules = ignore_modules
@@ -876,11 +1700,24 @@ class XSDParser:
         self.download_dependencies = download_dependencies
         self.store_type = store_type
         self.request = request
+        self.prefetch_imports = prefetch_imports
+        self.stream_batch_size = stream_batch_size
 
         self.editing = False
         self.keys = {}
         self.keyrefs = {}
+        # names of the keys with a module and of the keyrefs, by xpath
+        self.key_xpaths = None
+        self.keyref_xpaths = None
         self.in_memory_elements = 0
+        # number of elements being generated, nested in each other
+        self.element_depth = 0
+        # steps of the running generation, nested in each other (None: no
+        # generation running)
+        self.work_stack = None
+        self.parser_context = ParserContext()
+        # writer of the generated branches, while a form is streamed
+        self.branch_writer = None
 
     def generate_form(
         self,
@@ -900,14 +1737,36 @@ class XSDParser:
         Returns:
 
         """
+        self.parser_context = ParserContext()
 
-        # flatten the includes
-        xml_doc_tree_str = XSDFlattenerDatabaseOrURL(
-            xsd_doc_data,
-            request=request,
-            download_enabled=self.download_dependencies,
-        ).get_flat()
-        xml_doc_tree = XSDTree.build_tree(xml_doc_tree_str)
+        # new forms of a template are created from the skeleton of the
+        # template, if saved
+        skeleton_key = self.get_form_skeleton_key(
+            xsd_doc_data, xml_doc_data, data_structure, request=request
+        )
+        form_skeleton = (
+            form_skeleton_api.get_form(*skeleton_key)
+            if skeleton_key is not None
+            else None
+        )
+
+        if form_skeleton is None:
+            # flatten the includes
+            xml_doc_tree_str = XSDFlattenerDatabaseOrURL(
+                xsd_doc_data,
+                request=request,
+                download_enabled=self.download_dependencies,
+            ).get_flat()
+            xml_doc_tree = XSDTree.build_tree(xml_doc_tree_str)
+
+            # download the imports ahead of the generation, concurrently
+            if self.prefetch_imports and self.download_dependencies:
+                prefetch_imported_schemas(xml_doc_tree, request=request)
+
+            # find all root elements
+            elements = xml_doc_tree.findall(
+                "./{0}element".format(LXML_SCHEMA_NAMESPACE)
+            )
 
         # if editing, get the XML data to fill the form
         edit_data_tree = None
@@ -932,98 +1791,212 @@ class XSDParser:
         else:  # no data found, not editing
             self.editing = False
 
-        # find all root elements
-        elements = xml_doc_tree.findall(
-            "./{0}element".format(LXML_SCHEMA_NAMESPACE)
-        )
+        if self.stream_batch_size > 0:
+            self.branch_writer = BranchWriter(
+                self.request, data_structure, self.stream_batch_size
+            )
 
         try:
-            form_content = ""
-            if len(elements) == 1:  # One root
-                form_content = self.generate_element(
-                    elements[0], xml_doc_tree, edit_data_tree=edit_data_tree
-                )
-            elif len(elements) > 1:  # Several root
-                # look if a default choice to render is defined
-                default_choice = False
-                for element in elements:
-                    app_info = get_app_info_options(element)
-                    if "default" in app_info:
-                        form_content = self.generate_element(
-                            element,
-                            xml_doc_tree,
-                            edit_data_tree=edit_data_tree,
-                        )
-                        default_choice = True
-                        break
-                if not default_choice:
-                    form_content = self.generate_choice(
-                        elements, xml_doc_tree, edit_data_tree=edit_data_tree
+            # the branches saved during the generation, and the skeleton saved
+            # with the form, are removed on error
+            with (
+                transaction.atomic()
+                if self.branch_writer is not None or skeleton_key is not None
+                else nullcontext()
+            ):
+                form_content = ""
+                if form_skeleton is not None:
+                    form_content, self.keys, self.keyrefs = form_skeleton
+                elif len(elements) == 1:  # One root
+                    form_content = self.generate_element(
+                        elements[0],
+                        xml_doc_tree,
+                        edit_data_tree=edit_data_tree,
                     )
-            else:  # len(elements) == 0 (no root element)
-                # fixed always false because fixed cannot be on the type
-                # TODO: does it make sense to get all simple types too?
-                complex_types = xml_doc_tree.findall(
-                    "./{0}complexType".format(LXML_SCHEMA_NAMESPACE)
-                )
-                if len(complex_types) > 0:
+                elif len(elements) > 1:  # Several root
                     # look if a default choice to render is defined
                     default_choice = False
-                    for complex_type in complex_types:
-                        app_info = get_app_info_options(complex_type)
+                    for element in elements:
+                        app_info = get_app_info_options(
+                            element, self.parser_context
+                        )
                         if "default" in app_info:
-                            form_content = self.generate_choice_extensions(
-                                [complex_type],
+                            form_content = self.generate_element(
+                                element,
                                 xml_doc_tree,
                                 edit_data_tree=edit_data_tree,
                             )
                             default_choice = True
                             break
                     if not default_choice:
-                        form_content = self.generate_choice_extensions(
-                            complex_types,
+                        form_content = self.generate_choice(
+                            elements,
                             xml_doc_tree,
                             edit_data_tree=edit_data_tree,
                         )
-                else:  # len(complex_types) == 0
-                    simple_types = xml_doc_tree.findall(
-                        "./{0}simpleType".format(LXML_SCHEMA_NAMESPACE)
+                else:  # len(elements) == 0 (no root element)
+                    # fixed always false because fixed cannot be on the type
+                    # TODO: does it make sense to get all simple types too?
+                    complex_types = xml_doc_tree.findall(
+                        "./{0}complexType".format(LXML_SCHEMA_NAMESPACE)
                     )
-                    if len(simple_types) == 1:  # 1 simple type found
-                        form_content = self.generate_simple_type(
-                            simple_types[0],
-                            xml_doc_tree,
-                            full_path="",
-                            edit_data_tree=edit_data_tree,
+                    if len(complex_types) > 0:
+                        # look if a default choice to render is defined
+                        default_choice = False
+                        for complex_type in complex_types:
+                            app_info = get_app_info_options(
+                                complex_type, self.parser_context
+                            )
+                            if "default" in app_info:
+                                form_content = self.generate_choice_extensions(
+                                    [complex_type],
+                                    xml_doc_tree,
+                                    edit_data_tree=edit_data_tree,
+                                )
+                                default_choice = True
+                                break
+                        if not default_choice:
+                            form_content = self.generate_choice_extensions(
+                                complex_types,
+                                xml_doc_tree,
+                                edit_data_tree=edit_data_tree,
+                            )
+                    else:  # len(complex_types) == 0
+                        simple_types = xml_doc_tree.findall(
+                            "./{0}simpleType".format(LXML_SCHEMA_NAMESPACE)
                         )
-                    else:
-                        raise Exception("No possible root element detected")
+                        if len(simple_types) == 1:  # 1 simple type found
+                            form_content = self.generate_simple_type(
+                                simple_types[0],
+                                xml_doc_tree,
+                                full_path="",
+                                edit_data_tree=edit_data_tree,
+                            )
+                        else:
+                            raise Exception(
+                                "No possible root element detected"
+                            )
 
-            root_element = load_schema_data_in_db(
-                self.request, form_content, data_structure=data_structure
-            )
+                root_element = load_schema_data_in_db(
+                    self.request, form_content, data_structure=data_structure
+                )
+                if self.branch_writer is not None:
+                    self.branch_writer.delete_detached_branches()
+
+                if self.auto_key_keyref:
+                    root_element.options["keys"] = self.keys
+                    root_element.options["keyrefs"] = self.keyrefs
+                    data_structure_element_api.upsert(
+                        root_element, self.request
+                    )
+
+                # the skeleton is only saved once its form is written
+                if skeleton_key is not None and form_skeleton is None:
+                    form_skeleton_api.save_form(
+                        *skeleton_key,
+                        form_content,
+                        self.keys,
+                        self.keyrefs,
+                        has_modules=contains_module(form_content),
+                    )
+
+                self.editing = False
+                return root_element.pk
+        except Exception as exception:
+            exc_info = sys.exc_info()
+
+            # Adding information to the Exception message
+            exception_message = "Schema parsing failed: " + str(exception)
+            logger.fatal(exception_message)
+
+            traceback.print_exception(*exc_info)
+            del exc_info
+
+            self.editing = False
+            raise ParserError(exception_message)
+        finally:
+            self.branch_writer = None
+
+    def get_form_skeleton_key(
+        self,
+        xsd_doc_data,
+        xml_doc_data=None,
+        data_structure=None,
+        request=None,
+    ):
+        """Return the key of the skeleton of the new forms of a template, None
+        if the form can't be created from a skeleton. The includes of the
+        skeleton are flattened with the templates that the request can access.
+
+        Args:
+            xsd_doc_data:
+            xml_doc_data:
+            data_structure:
+            request:
+
+        Returns:
+
+        """
+        if (
+            not PARSER_FORM_SKELETON_CACHE
+            or xml_doc_data
+            or data_structure is None
+            or data_structure.template_id is None
+            # streamed forms are saved while generated
+            or self.stream_batch_size > 0
+        ):
+            return None
+
+        return (
+            data_structure.template_id,
+            get_content_hash(xsd_doc_data),
+            get_access_scope(request) or "",
+            json.dumps(
+                {
+                    "min_tree": self.min_tree,
+                    "ignore_modules": self.ignore_modules,
+                    "collapse": self.collapse,
+                    "auto_key_keyref": self.auto_key_keyref,
+                    "implicit_extension_base": self.implicit_extension_base,
+                    "download_dependencies": self.download_dependencies,
+                    "store_type": self.store_type,
+                },
+                sort_keys=True,
+            ),
+        )
 
-            if self.auto_key_keyref:
-                root_element.options["keys"] = self.keys
-                root_element.options["keyrefs"] = self.keyrefs
-                data_structure_element_api.upsert(root_element, self.request)
+    @generation_step
+    def generate_element(self, element, xml_tree, *args, **kwargs):
+        """Generate data structure for an XML element, within the depth budget
+        of the form
 
-            self.editing = False
-            return root_element.pk
-        except Exception as exception:
-            exc_info = sys.exc_info()
+        Args:
+            element:
+            xml_tree:
+            args: arguments of `_generate_element`
+            kwargs: keyword arguments of `_generate_element`
 
-            # Adding information to the Exception message
-            exception_message = "Schema parsing failed: " + str(exception)
-            logger.fatal(exception_message)
+        Returns:
 
-            traceback.print_exception(*exc_info)
-            del exc_info
+        """
+        if 0 < PARSER_MAX_DEPTH <= self.element_depth:
+            raise ParserError(
+                "The maximum depth of the form has been reached "
+                "(PARSER_MAX_DEPTH)."
+            )
 
-            self.editing = False
-            raise ParserError(exception_message)
+        self.element_depth += 1
+        try:
+            return (
+                yield self._generate_element(
+                    element, xml_tree, *args, **kwargs
+                )
+            )
+        finally:
+            self.element_depth -= 1
 
-    def generate_element(
+    @generation_step
+    def _generate_element(
         self,
         element,
         xml_tree,
@@ -1052,17 +2025,19 @@ class XSDParser:
         # FIXME if elif without else need to be corrected
         # FIXME Support for unique is not present
         # FIXME Support for key / keyref
-        app_info = get_app_info_options(element)
+        app_info = get_app_info_options(element, self.parser_context)
 
         # check if the element has a module
         _has_module = False
         _is_multiple = False
         if not self.ignore_modules:
-            module_url = get_module_url(element)
+            module_url = get_module_url(element, self.parser_context)
             _has_module = True if module_url is not None else False
             # check if the module manages the occurrences by itself
             _is_multiple = (
-                is_module_multiple(element) if _has_module else False
+                is_module_multiple(element, self.parser_context)
+                if _has_module
+                else False
             )
 
         # FIXME see if we can avoid these basic initialization
@@ -1084,22 +2059,24 @@ class XSDParser:
             element_tag = "attribute"
 
         # get schema namespaces
-        xml_tree_str = XSDTree.tostring(xml_tree)
-        namespaces = get_namespaces(xml_tree_str)
+        namespaces = self.parser_context.get_schema_context(
+            xml_tree
+        ).namespaces
 
-        db_element = {
-            "tag": element_tag,  # 'element' or 'attribute'
-            "options": {
+        db_element = FormNode(
+            element_tag,  # 'element' or 'attribute'
+            options={
                 "name": text_capitalized,
                 "min": min_occurs,
                 "max": max_occurs,
                 "module": None if not _has_module else True,
-                "xpath": {"xsd": None, "xml": full_path},
+                "xpath": FormXPath(None, full_path),
                 "schema_location": schema_location,
             },
-            "value": None,
-            "children": [],
-        }
+            children=[],
+        )
+        # in-memory elements before the generation of the element
+        in_memory_elements = self.in_memory_elements
         self.check_in_memory_elements()
 
         is_ref = False
@@ -1117,6 +2094,7 @@ class XSDParser:
                 schema_location,
                 download_enabled=self.download_dependencies,
                 request=self.request,
+                parser_context=self.parser_context,
             )
             if ref_element is not None:
                 text_capitalized = ref_element.attrib.get("name")
@@ -1124,7 +2102,7 @@ class XSDParser:
                 # check if the element has a module
                 _has_module = False
                 if not self.ignore_modules:
-                    module_url = get_module_url(element)
+                    module_url = get_module_url(element, self.parser_context)
                     _has_module = True if module_url is not None else False
             else:
                 # the element was not found where it was supposed to be
@@ -1138,11 +2116,10 @@ class XSDParser:
         else:
             text_capitalized = element.attrib.get("name")
 
-        xml_tree_str = XSDTree.tostring(xml_tree)
-        namespaces = get_namespaces(xml_tree_str)
-        target_namespace, target_namespace_prefix = get_target_namespace(
-            xml_tree, namespaces
-        )
+        schema_context = self.parser_context.get_schema_context(xml_tree)
+        namespaces = schema_context.namespaces
+        target_namespace = schema_context.target_namespace
+        target_namespace_prefix = schema_context.target_namespace_prefix
 
         full_path = get_xml_xpath(
             xml_tree,
@@ -1159,11 +2136,10 @@ class XSDParser:
         # XSD xpath: /element/complexType/sequence
         xsd_xpath = xml_tree.getpath(element)
 
-        db_element["options"]["name"] = element.attrib.get("name")
-        db_element["options"]["xpath"]["xsd"] = xsd_xpath
-        db_element["options"]["xpath"]["xml"] = full_path
+        db_element.options["name"] = text_capitalized
+        db_element.options["xpath"] = FormXPath(xsd_xpath, full_path)
         if self.store_type:
-            db_element["options"]["type"] = (
+            db_element.options["type"] = (
                 element.attrib["type"] if "type" in element.attrib else None
             )
 
@@ -1179,8 +2155,11 @@ class XSDParser:
         if self.editing:
             if xml_element is None:
                 # get the number of occurrences in the data
-                edit_elements = edit_data_tree.xpath(
-                    full_path, namespaces=namespaces
+                edit_elements = find_data(
+                    edit_data_tree,
+                    full_path,
+                    namespaces,
+                    self.parser_context,
                 )
                 nb_occurrences_data = len(edit_elements)
             else:
@@ -1216,7 +2195,7 @@ class XSDParser:
         label = app_info["label"] if "label" in app_info else text_capitalized
         label = label if label is not None else ""
 
-        db_element["options"]["label"] = label
+        db_element.options["label"] = label
 
         if _has_module and _is_multiple:
             # block maxOccurs to one, the module should take care of
@@ -1231,18 +2210,15 @@ class XSDParser:
         # set the element namespace
         # tag_ns = ' xmlns="{0}" '.format(element_ns) if element_ns is not None else ''
         ns_prefix = None
-        if element_tag == "attribute" and target_namespace is not None:
-            for prefix, namespace in namespaces.items():
-                if namespace == target_namespace:
-                    ns_prefix = prefix
-                    break
+        if element_tag == "attribute":
+            ns_prefix = schema_context.ns_prefix
 
         # get the element type
-        default_prefix = get_default_prefix(namespaces)
+        default_prefix = schema_context.default_prefix
 
-        db_element["options"]["schema_location"] = schema_location
-        db_element["options"]["xmlns"] = element_ns
-        db_element["options"]["ns_prefix"] = ns_prefix
+        db_element.options["schema_location"] = schema_location
+        db_element.options["xmlns"] = element_ns
+        db_element.options["ns_prefix"] = ns_prefix
 
         element_type, xml_tree, schema_location = get_element_type(
             element,
@@ -1253,6 +2229,7 @@ class XSDParser:
             schema_location,
             download_enabled=self.download_dependencies,
             request=self.request,
+            parser_context=self.parser_context,
         )
 
         # management of elements inside a choice (don't display if not part of
@@ -1278,16 +2255,16 @@ class XSDParser:
                 if element_tag == "attribute":
                     if self.is_key(element, full_path):
                         _has_module = True
-                        db_element["options"]["module"] = _has_module
+                        db_element.options["module"] = _has_module
                     elif self.is_keyref(element, full_path):
                         _has_module = True
-                        db_element["options"]["module"] = _has_module
+                        db_element.options["module"] = _has_module
                 elif element_tag == "element":
                     # look if key/keyrefs are defined for the scope of this element
                     self.manage_key_keyref(element, full_path)
 
         for x in range(0, int(nb_occurrences)):
-            db_elem_iter = {"tag": "elem-iter", "value": None, "children": []}
+            db_elem_iter = FormNode("elem-iter", children=[])
             self.check_in_memory_elements()
 
             # if element not removed
@@ -1306,11 +2283,11 @@ class XSDParser:
                         edit_data_tree=edit_data_tree,
                     )
 
-                    db_elem_iter["children"].append(module)
+                    db_elem_iter.children.append(module)
                 else:  # generate the type
                     # get the default value (from xsd or from loaded xml)
                     default_value = ""
-                    db_child = dict()
+                    db_child = None
 
                     if self.editing:
                         # if elements are found at this xpath
@@ -1360,113 +2337,239 @@ class XSDParser:
                         )
                         use = app_info["use"] if "use" in app_info else ""
 
-                        db_child = {
-                            "tag": "input",
-                            "options": {
+                        db_child = FormNode(
+                            "input",
+                            value=default_value,
+                            options={
                                 "placeholder": placeholder,
                                 "tooltip": tooltip,
                                 "use": use,
                                 "input_type": element_type,
                             },
-                            "value": default_value,
-                        }
+                        )
                         self.check_in_memory_elements()
                     else:  # complex/simple type
                         if element_type.tag == "{0}complexType".format(
                             LXML_SCHEMA_NAMESPACE
                         ):
-                            complex_type_result = self.generate_complex_type(
-                                element_type,
-                                xml_tree,
-                                full_path=full_path + "[" + str(x + 1) + "]",
-                                edit_data_tree=edit_data_tree,
-                                default_value=default_value,
-                                is_fixed=is_fixed,
-                                schema_location=schema_location,
+                            complex_type_result = (
+                                yield self.generate_complex_type(
+                                    element_type,
+                                    xml_tree,
+                                    full_path=full_path
+                                    + "["
+                                    + str(x + 1)
+                                    + "]",
+                                    edit_data_tree=edit_data_tree,
+                                    default_value=default_value,
+                                    is_fixed=is_fixed,
+                                    schema_location=schema_location,
+                                )
                             )
                             db_child = complex_type_result
                         elif element_type.tag == "{0}simpleType".format(
                             LXML_SCHEMA_NAMESPACE
                         ):
-                            simple_type_result = self.generate_simple_type(
-                                element_type,
-                                xml_tree,
-                                full_path=full_path + "[" + str(x + 1) + "]",
-                                edit_data_tree=edit_data_tree,
-                                default_value=default_value,
-                                is_fixed=is_fixed,
-                                schema_location=schema_location,
+                            simple_type_result = (
+                                yield self.generate_simple_type(
+                                    element_type,
+                                    xml_tree,
+                                    full_path=full_path
+                                    + "["
+                                    + str(x + 1)
+                                    + "]",
+                                    edit_data_tree=edit_data_tree,
+                                    default_value=default_value,
+                                    is_fixed=is_fixed,
+                                    schema_location=schema_location,
+                                )
                             )
                             db_child = simple_type_result
 
-                    db_child["options"]["fixed"] = is_fixed
-                    db_elem_iter["children"].append(db_child)
+                    db_child.options["fixed"] = is_fixed
+                    # default of the schema, for the copies of the occurrence
+                    if "default" in element.attrib:
+                        db_child.options["default"] = element.attrib[
+                            "default"
+                        ].strip()
+                    db_elem_iter.children.append(db_child)
 
-            db_element["children"].append(db_elem_iter)
+            db_element.children.append(db_elem_iter)
 
-        return db_element
+        return self.save_generated_branches(db_element, in_memory_elements)
 
-    def generate_element_absent(
-        self,
-        element_id,
-        xsd_doc_data,
-        data_structure=None,
-        renderer_class=ListRenderer,
+    def get_flat_schema(
+        self, xsd_doc_data, schema_location=None, data_structure=None
     ):
-        """Generate data structure for an XML element absent from the tree
+        """Return a copy of the flattened tree of the schema, or of the
+        imported schema at the given location, and its namespaces
 
         Args:
-            element_id:
             xsd_doc_data:
+            schema_location:
             data_structure:
-            renderer_class:
 
         Returns:
 
         """
+        # if the xml element is from an imported schema
+        if schema_location is not None:
+            if not self.download_dependencies:
+                raise ParserError("Dependency could not be downloaded")
 
-        sub_element = data_structure_element_api.get_by_id(
-            element_id, self.request
-        )
+            flat_schema = load_flat_imported_schema(
+                schema_location, request=self.request
+            )
+        else:
+            flat_schema = load_flat_schema(
+                xsd_doc_data,
+                template_id=(
+                    data_structure.template_id
+                    if data_structure is not None
+                    else None
+                ),
+                download_enabled=self.download_dependencies,
+                request=self.request,
+            )
 
-        if self.auto_key_keyref:
-            self.init_key_keyref(sub_element)
+        # the parser modifies the tree: the cached tree is not shared
+        return deepcopy(flat_schema.xml_tree), dict(flat_schema.namespaces)
 
-        schema_element = sub_element.parent
+    def copy_occurrence(self, occurrence):
+        """Return a copy of an occurrence of a schema element as generated
+        data, with the values of a new occurrence. None if the copy would not
+        match a new occurrence.
 
-        schema_location = None
-        if "schema_location" in schema_element.options:
-            schema_location = schema_element.options["schema_location"]
+        Args:
+            occurrence:
 
-        # if the xml element is from an imported schema
-        if schema_location is not None:
-            # open the imported file
-            download_enabled = self.download_dependencies
-            if download_enabled:
-                ref_xml_schema_file = send_get_request(
-                    schema_element.options["schema_location"]
-                )
-                # get the content of the file
-                ref_xml_schema_content = ref_xml_schema_file.content
-                # build the XML tree
-                xml_doc_tree = XSDTree.build_tree(ref_xml_schema_content)
-                # get the namespaces from the imported schema
-                namespaces = get_namespaces(ref_xml_schema_content)
+        Returns:
+
+        """
+        children_index = get_children_index(occurrence, self.request)
+        # first values of the enumerations of the restrictions, by hash
+        first_enumeration_values = {}
+
+        occurrence_data = None
+        # elements to copy, with the parent of their copy, the default value
+        # and fixed flag they inherit, and whether they lose their children
+        elements = [(occurrence, None, None, False, False)]
+        while len(elements) > 0:
+            element, parent_data, default, fixed, is_pruned = elements.pop()
+            options = deepcopy(element.options)
+            children = children_index.get(element.pk, [])
+
+            # modules are generated from their registry
+            if element.tag == "module":
+                return None
+
+            # an occurrence doesn't inherit the values of its parent
+            if element.tag.endswith("-iter"):
+                default = None
+                fixed = False
+            if "default" in options:
+                default = options["default"]
+            if options.get("fixed"):
+                fixed = True
+
+            value = element.value
+            if element.tag == "choice-iter":
+                # the first option of a new choice is selected
+                if (
+                    value is not None
+                    and len(children) > 0
+                    and value != str(children[0].pk)
+                ):
+                    return None
+                value = None
+            elif element.tag in ("input", "list", "union") and not fixed:
+                value = default if default is not None else ""
+            elif element.tag == "restriction" and not fixed:
+                # a new restriction selects its first enumeration value
+                if len(children) > 0 and children[0].tag == "enumeration":
+                    value = children[0].value
+                elif "enumeration" in options:
+                    enumeration_hash = options["enumeration"]
+                    if enumeration_hash not in first_enumeration_values:
+                        values, _ = enumeration_api.get_values_page(
+                            enumeration_hash, page_size=1
+                        )
+                        first_enumeration_values[enumeration_hash] = (
+                            values[0] if len(values) > 0 else None
+                        )
+                    value = first_enumeration_values[enumeration_hash]
+
+            element_data = FormNode(
+                element.tag, value=value, options=options, children=[]
+            )
+            if parent_data is None:
+                occurrence_data = element_data
             else:
-                raise ParserError("Dependency could not be downloaded")
-        else:
-            # build the XML tree
-            xml_doc_tree = XSDTree.build_tree(xsd_doc_data)
-            # get the namespaces
-            namespaces = get_namespaces(xsd_doc_data)
+                parent_data.children.append(element_data)
 
-        # flatten the includes
-        xml_doc_tree_str = XSDFlattenerDatabaseOrURL(
-            XSDTree.tostring(xml_doc_tree),
-            request=self.request,
-            download_enabled=self.download_dependencies,
-        ).get_flat()
-        xml_doc_tree = XSDTree.build_tree(xml_doc_tree_str)
+            if is_pruned:
+                continue
+
+            # element not generated in the source occurrence
+            if element.tag in ("element", "attribute") and len(children) == 0:
+                return None
+
+            # occurrences of a nested element: as many as a new form has
+            if (
+                "min" in options
+                and len(children) > 0
+                and all(child.tag.endswith("-iter") for child in children)
+            ):
+                if self.min_tree and options["min"] == 0:
+                    # removed optional element
+                    elements.extend(
+                        (child, element_data, default, fixed, True)
+                        for child in reversed(children[:1])
+                    )
+                    continue
+
+                children = children[: max(1, options["min"])]
+                # occurrence removed by the user
+                if any(
+                    len(children_index.get(child.pk, [])) == 0
+                    for child in children
+                ):
+                    return None
+
+            elements.extend(
+                (
+                    child,
+                    element_data,
+                    default,
+                    fixed,
+                    # options not selected are not generated in a min tree
+                    self.min_tree
+                    and element.tag == "choice-iter"
+                    and child_index > 0,
+                )
+                for child_index, child in reversed(list(enumerate(children)))
+            )
+
+        return occurrence_data
+
+    def generate_occurrence(
+        self, schema_element, xsd_doc_data, data_structure=None
+    ):
+        """Generate data structure for a new occurrence of a schema element
+
+        Args:
+            schema_element:
+            xsd_doc_data:
+            data_structure:
+
+        Returns:
+
+        """
+        xml_doc_tree, namespaces = self.get_flat_schema(
+            xsd_doc_data,
+            schema_element.options.get("schema_location"),
+            data_structure,
+        )
 
         xpath_element = schema_element.options["xpath"]
         xsd_xpath = xpath_element["xsd"]
@@ -1475,7 +2578,7 @@ class XSDParser:
         if "xml" in xpath_element:
             xml_xpath = xpath_element["xml"]
 
-        xml_element = xml_doc_tree.xpath(xsd_xpath, namespaces=namespaces)[0]
+        xml_element = evaluate_xpath(xml_doc_tree, xsd_xpath, namespaces)[0]
 
         if "min" in schema_element.options:
             xml_element.attrib["minOccurs"] = str(
@@ -1517,33 +2620,102 @@ class XSDParser:
                 force_generation=True,
             )
 
-        tree_root = load_schema_data_in_db(
-            self.request, db_tree, data_structure=data_structure
-        )
-        generated_element = tree_root.children.all().order_by("pk")[0]
+        return db_tree
+
+    def generate_element_absent(
+        self,
+        element_id,
+        xsd_doc_data,
+        data_structure=None,
+        renderer_class=ListRenderer,
+    ):
+        """Generate data structure for an XML element absent from the tree
+
+        Args:
+            element_id:
+            xsd_doc_data:
+            data_structure:
+            renderer_class:
 
-        tree_root_options = tree_root.options
-        tree_root_options["real_root"] = str(schema_element.pk)
+        Returns:
+
+        """
 
-        tree_root.options = tree_root_options
+        self.parser_context = ParserContext()
 
-        renderer = renderer_class(tree_root, self.request)
-        html_form = renderer.render(True)
+        sub_element = data_structure_element_api.get_by_id(
+            element_id, self.request
+        )
+
+        if self.auto_key_keyref:
+            self.init_key_keyref(sub_element)
 
-        schema_element.children.add(generated_element)
+        schema_element = sub_element.parent
+        schema_xpath = schema_element.options["xpath"]["xml"]
 
-        if sub_element.children.count() == 0:
-            schema_element_to_pull = data_structure_element_api.get_by_id(
-                element_id, self.request
+        occurrences = list(schema_element.children.all().order_by("pk"))
+        filled_occurrence_ids = {
+            child.parent_id
+            for child in data_structure_element_api.get_by_parent_ids(
+                [occurrence.pk for occurrence in occurrences], self.request
+            )
+        }
+        # empty occurrence of an absent element, replaced by the new one
+        is_sub_element_removed = sub_element.pk not in filled_occurrence_ids
+        xpath_index = len(occurrences) + (0 if is_sub_element_removed else 1)
+
+        # copy an occurrence already in the form, preferably the one clicked
+        occurrence_data = None
+        source_occurrence = next(
+            (
+                occurrence
+                for occurrence in [sub_element] + occurrences
+                if occurrence.pk in filled_occurrence_ids
+            ),
+            None,
+        )
+        if source_occurrence is not None:
+            occurrence_data = self.copy_occurrence(source_occurrence)
+        if occurrence_data is not None:
+            source_index = _get_xpath_index(schema_xpath, occurrence_data)
+        else:
+            occurrence_data = self.generate_occurrence(
+                schema_element, xsd_doc_data, data_structure
+            ).children[0]
+            source_index = 1
+
+        if source_index is not None:
+            _set_xpath_index(
+                occurrence_data, schema_xpath, source_index, xpath_index
             )
 
-            schema_element.children.remove(schema_element_to_pull)
+        with transaction.atomic():
+            generated_element = load_schema_data_in_db(
+                self.request,
+                occurrence_data,
+                data_structure=data_structure,
+                parent=schema_element,
+            )
 
-        update_branch_xpath(schema_element, self.request)
+            if is_sub_element_removed:
+                data_structure_element_api.remove_child(
+                    schema_element, sub_element, self.request
+                )
 
-        tree_root.delete()
-        return html_form
+        # render the new occurrence alone, under its schema element
+        render_root = copy(schema_element)
+        render_root.options = dict(
+            schema_element.options, real_root=str(schema_element.pk)
+        )
+        renderer = renderer_class(render_root, self.request)
+        renderer.set_tree(
+            data_structure_element_api.get_branch(
+                generated_element, self.request
+            )
+        )
+        return renderer.render(True)
 
+    @generation_step
     def generate_sequence(
         self,
         element,
@@ -1576,17 +2748,16 @@ class XSDParser:
         # XSD xpath
         xsd_xpath = xml_tree.getpath(element)
 
-        db_element = {
-            "tag": "sequence",
-            "options": {
+        db_element = FormNode(
+            "sequence",
+            options={
                 "min": min_occurs,
                 "max": max_occurs,
-                "xpath": {"xsd": xsd_xpath, "xml": full_path},
+                "xpath": FormXPath(xsd_xpath, full_path),
                 "schema_location": schema_location,
             },
-            "value": None,
-            "children": [],
-        }
+            children=[],
+        )
         self.check_in_memory_elements()
 
         if min_occurs != 1 or max_occurs != 1:
@@ -1606,6 +2777,7 @@ class XSDParser:
                     edit_data_tree,
                     download_enabled=self.download_dependencies,
                     request=self.request,
+                    parser_context=self.parser_context,
                 )
                 if max_occurs != 1:
                     nb_occurrences_data = len(elements_found)
@@ -1631,17 +2803,13 @@ class XSDParser:
                 nb_occurrences = 1
 
             for x in range(0, int(nb_occurrences)):
-                db_elem_iter = {
-                    "tag": "sequence-iter",
-                    "value": None,
-                    "children": [],
-                }
+                db_elem_iter = FormNode("sequence-iter", children=[])
                 self.check_in_memory_elements()
 
                 # generates the sequence
                 for child in element:
                     if child.tag == "{0}element".format(LXML_SCHEMA_NAMESPACE):
-                        element_result = self.generate_element(
+                        element_result = yield self.generate_element(
                             child,
                             xml_tree,
                             choice_counter,
@@ -1650,11 +2818,11 @@ class XSDParser:
                             schema_location=schema_location,
                         )
 
-                        db_elem_iter["children"].append(element_result)
+                        db_elem_iter.children.append(element_result)
                     elif child.tag == "{0}sequence".format(
                         LXML_SCHEMA_NAMESPACE
                     ):
-                        sequence_result = self.generate_sequence(
+                        sequence_result = yield self.generate_sequence(
                             child,
                             xml_tree,
                             choice_counter,
@@ -1663,11 +2831,11 @@ class XSDParser:
                             schema_location=schema_location,
                         )
 
-                        db_elem_iter["children"].append(sequence_result)
+                        db_elem_iter.children.append(sequence_result)
                     elif child.tag == "{0}choice".format(
                         LXML_SCHEMA_NAMESPACE
                     ):
-                        choice_result = self.generate_choice(
+                        choice_result = yield self.generate_choice(
                             child,
                             xml_tree,
                             choice_counter,
@@ -1676,20 +2844,16 @@ class XSDParser:
                             schema_location=schema_location,
                         )
 
-                        db_elem_iter["children"].append(choice_result)
+                        db_elem_iter.children.append(choice_result)
                     elif child.tag == "{0}any".format(LXML_SCHEMA_NAMESPACE):
                         logger.debug("generate_sequence case not implemented.")
                     elif child.tag == "{0}group".format(LXML_SCHEMA_NAMESPACE):
                         logger.debug("generate_sequence case not implemented.")
 
-                db_element["children"].append(db_elem_iter)
+                db_element.children.append(db_elem_iter)
 
         else:  # min_occurs == 1 and max_occurs == 1
-            db_elem_iter = {
-                "tag": "sequence-iter",
-                "value": None,
-                "children": [],
-            }
+            db_elem_iter = FormNode("sequence-iter", children=[])
             self.check_in_memory_elements()
 
             # XSD xpath
@@ -1715,7 +2879,7 @@ class XSDParser:
             # generates the sequence
             for child in element:
                 if child.tag == "{0}element".format(LXML_SCHEMA_NAMESPACE):
-                    element_result = self.generate_element(
+                    element_result = yield self.generate_element(
                         child,
                         xml_tree,
                         choice_counter,
@@ -1724,9 +2888,9 @@ class XSDParser:
                         schema_location=schema_location,
                     )
 
-                    db_elem_iter["children"].append(element_result)
+                    db_elem_iter.children.append(element_result)
                 elif child.tag == "{0}sequence".format(LXML_SCHEMA_NAMESPACE):
-                    sequence_result = self.generate_sequence(
+                    sequence_result = yield self.generate_sequence(
                         child,
                         xml_tree,
                         choice_counter,
@@ -1735,9 +2899,9 @@ class XSDParser:
                         schema_location=schema_location,
                     )
 
-                    db_elem_iter["children"].append(sequence_result)
+                    db_elem_iter.children.append(sequence_result)
                 elif child.tag == "{0}choice".format(LXML_SCHEMA_NAMESPACE):
-                    choice_result = self.generate_choice(
+                    choice_result = yield self.generate_choice(
                         child,
                         xml_tree,
                         choice_counter,
@@ -1746,16 +2910,17 @@ class XSDParser:
                         schema_location=schema_location,
                     )
 
-                    db_elem_iter["children"].append(choice_result)
+                    db_elem_iter.children.append(choice_result)
                 elif child.tag == "{0}any".format(LXML_SCHEMA_NAMESPACE):
                     logger.info("generate_sequence case not implemented.")
                 elif child.tag == "{0}group".format(LXML_SCHEMA_NAMESPACE):
                     logger.info("generate_sequence case not implemented.")
 
-            db_element["children"].append(db_elem_iter)
+            db_element.children.append(db_elem_iter)
 
         return db_element
 
+    @generation_step
     def generate_choice(
         self,
         element,
@@ -1783,15 +2948,14 @@ class XSDParser:
         # (annotation?, (element|group|choice|sequence|any)*)
         # FIXME Group not supported
         # FIXME Choice not supported
-        db_element = {
-            "tag": "choice",
-            "options": {
-                "xpath": {"xsd": None, "xml": full_path},
+        db_element = FormNode(
+            "choice",
+            options={
+                "xpath": FormXPath(None, full_path),
                 "schema_location": schema_location,
             },
-            "value": None,
-            "children": [],
-        }
+            children=[],
+        )
         self.check_in_memory_elements()
 
         # init variables for buttons management
@@ -1808,21 +2972,24 @@ class XSDParser:
         # FIXME process differently this part
         if not isinstance(element, list):
 
-            app_info = get_app_info_options(element)
+            app_info = get_app_info_options(element, self.parser_context)
             if app_info:
                 if "label" in app_info:
-                    db_element["options"]["label"] = app_info["label"]
+                    db_element.options["label"] = app_info["label"]
                 if "tooltip" in app_info:
-                    db_element["options"]["tooltip"] = format_tooltip(
+                    db_element.options["tooltip"] = format_tooltip(
                         app_info["tooltip"]
                     )
                 # remove annotation tag from choice element to not break algorithm (choice_counter loading first element)
                 delete_annotations(element)
+                self.parser_context.clear_app_info_options(element)
 
             # XSD xpath: don't need it when multiple root (can't duplicate a root)
             xsd_xpath = xml_tree.getpath(element)
 
-            db_element["options"]["xpath"]["xsd"] = xsd_xpath
+            db_element.options["xpath"] = db_element.options["xpath"]._replace(
+                xsd=xsd_xpath
+            )
 
             # get element's min/max occurs attributes
             min_occurs, max_occurs = get_element_occurrences(element)
@@ -1839,6 +3006,7 @@ class XSDParser:
                     edit_data_tree,
                     download_enabled=self.download_dependencies,
                     request=self.request,
+                    parser_context=self.parser_context,
                 )
                 nb_occurrences_data = len(elements_found)
                 if max_occurs != 1:
@@ -1852,8 +3020,8 @@ class XSDParser:
 
             # 'occurs' key contains the tuple (minOccurs, nbOccurs, maxOccurs)
             # db_element['options'] = (min_occurs, nb_occurrences_data, max_occurs)
-            db_element["options"]["min"] = min_occurs
-            db_element["options"]["max"] = max_occurs
+            db_element.options["min"] = min_occurs
+            db_element.options["max"] = max_occurs
 
         # keeps track of elements to display depending on the selected choice
         if choice_counter is not None:
@@ -1869,8 +3037,12 @@ class XSDParser:
         if force_generation:
             nb_occurrences = 1
 
+        # get the schema namespaces, with the XSI prefix used by extensions
+        schema_context = self.parser_context.get_schema_context(xml_tree)
+        namespaces = schema_context.xsi_namespaces
+
         for x in range(0, int(nb_occurrences)):
-            db_child = {"tag": "choice-iter", "value": None, "children": []}
+            db_child = FormNode("choice-iter", children=[])
             self.check_in_memory_elements()
 
             element_found = None
@@ -1889,17 +3061,10 @@ class XSDParser:
                 if choiceChild.tag == "{0}element".format(
                     LXML_SCHEMA_NAMESPACE
                 ):
-                    # get the schema namespaces
-                    xml_tree_str = XSDTree.tostring(xml_tree)
-                    namespaces = get_namespaces(xml_tree_str)
-                    # add the XSI prefix used by extensions
-                    namespaces["xsi"] = (
-                        "http://www.w3.org/2001/XMLSchema-instance"
+                    target_namespace = schema_context.target_namespace
+                    target_namespace_prefix = (
+                        schema_context.target_namespace_prefix
                     )
-                    (
-                        target_namespace,
-                        target_namespace_prefix,
-                    ) = get_target_namespace(xml_tree, namespaces)
                     # Find the default element
                     if choiceChild.attrib.get("name") is not None:
                         opt_label = choiceChild.attrib.get("name")
@@ -1931,7 +3096,7 @@ class XSDParser:
                             ):
                                 # explicitly build the element if found
                                 xml_element = element_found
-                                db_child["value"] = counter
+                                db_child.value = counter
 
                         else:
                             # TODO: create prefix if no prefix?
@@ -1945,14 +3110,17 @@ class XSDParser:
                             )
                             if (
                                 len(
-                                    edit_data_tree.xpath(
-                                        element_path, namespaces=namespaces
+                                    find_data(
+                                        edit_data_tree,
+                                        element_path,
+                                        namespaces,
+                                        self.parser_context,
                                     )
                                 )
                                 != 0
                             ):
-                                db_child["value"] = counter
-                    element_result = self.generate_element(
+                                db_child.value = counter
+                    element_result = yield self.generate_element(
                         choiceChild,
                         xml_tree,
                         counter,
@@ -1963,7 +3131,7 @@ class XSDParser:
                     )
 
                     db_child_0 = element_result
-                    db_child["children"].append(db_child_0)
+                    db_child.children.append(db_child_0)
                 elif choiceChild.tag == "{0}group".format(
                     LXML_SCHEMA_NAMESPACE
                 ):
@@ -1971,7 +3139,7 @@ class XSDParser:
                 elif choiceChild.tag == "{0}choice".format(
                     LXML_SCHEMA_NAMESPACE
                 ):
-                    choice = self.generate_choice(
+                    choice = yield self.generate_choice(
                         choiceChild,
                         xml_tree,
                         counter,
@@ -1980,11 +3148,11 @@ class XSDParser:
                         schema_location=schema_location,
                     )
 
-                    db_child["children"].append(choice)
+                    db_child.children.append(choice)
                 elif choiceChild.tag == "{0}sequence".format(
                     LXML_SCHEMA_NAMESPACE
                 ):
-                    sequence = self.generate_sequence(
+                    sequence = yield self.generate_sequence(
                         choiceChild,
                         xml_tree,
                         counter,
@@ -1994,11 +3162,11 @@ class XSDParser:
                     )
 
                     db_child_0 = sequence
-                    db_child["children"].append(db_child_0)
+                    db_child.children.append(db_child_0)
                 elif choiceChild.tag == "{0}any".format(LXML_SCHEMA_NAMESPACE):
                     logger.info("generate_sequence case not implemented.")
 
-            db_element["children"].append(db_child)
+            db_element.children.append(db_child)
 
         return db_element
 
@@ -2020,6 +3188,8 @@ class XSDParser:
         Returns:
 
         """
+        self.parser_context = ParserContext()
+
         element = data_structure_element_api.get_by_id(
             element_id, self.request
         )
@@ -2028,40 +3198,11 @@ class XSDParser:
         if self.auto_key_keyref:
             self.init_key_keyref(element)
 
-        schema_location = None
-        if "schema_location" in element.options:
-            schema_location = element.options["schema_location"]
-
-        # if the xml element is from an imported schema
-        if schema_location is not None:
-            # open the imported file
-            download_enabled = self.download_dependencies
-            if download_enabled:
-                ref_xml_schema_file = send_get_request(
-                    element.options["schema_location"]
-                )
-                # get the content of the file
-                ref_xml_schema_content = ref_xml_schema_file.content
-                # build the XML tree
-                xml_doc_tree = XSDTree.build_tree(ref_xml_schema_content)
-                # get the namespaces from the imported schema
-                namespaces = get_namespaces(ref_xml_schema_content)
-            else:
-                raise ParserError("Dependency could not be downloaded")
-        else:
-            # build the XML tree
-            xml_doc_tree = XSDTree.build_tree(xsd_doc_data)
-            # get the namespaces
-            namespaces = get_namespaces(xsd_doc_data)
-
-        # flatten the includes
-        xml_doc_tree_str = XSDFlattenerDatabaseOrURL(
-            XSDTree.tostring(xml_doc_tree),
-            request=self.request,
-            download_enabled=self.download_dependencies,
-        ).get_flat()
-
-        xml_doc_tree = XSDTree.build_tree(xml_doc_tree_str)
+        xml_doc_tree, namespaces = self.get_flat_schema(
+            xsd_doc_data,
+            element.options.get("schema_location"),
+            data_structure,
+        )
 
         xpath_element = element.options["xpath"]
         xsd_xpath = xpath_element["xsd"]
@@ -2070,7 +3211,7 @@ class XSDParser:
         if "xml" in xpath_element:
             xml_xpath = xpath_element["xml"]
 
-        xml_element = xml_doc_tree.xpath(xsd_xpath, namespaces=namespaces)[0]
+        xml_element = evaluate_xpath(xml_doc_tree, xsd_xpath, namespaces)[0]
 
         # FIXME: Support all possible children element
         if element.tag == "element":
@@ -2106,6 +3247,7 @@ class XSDParser:
 
         return html_form
 
+    @generation_step
     def generate_simple_type(
         self,
         element,
@@ -2133,35 +3275,25 @@ class XSDParser:
 
         """
         # FIXME implement union, correct list
-        db_element = {
-            "tag": "simple_type",
-            "value": None,
-            "children": [],
-            "options": {
+        db_element = FormNode(
+            "simple_type",
+            options={
                 "name": (
                     element.attrib["name"] if "name" in element.attrib else ""
                 ),
                 "xmlns": get_element_namespace(element, xml_tree),
             },
-        }
+            children=[],
+        )
         self.check_in_memory_elements()
 
         # get namespace prefix to reference extension in xsi:type
-        xml_tree_str = XSDTree.tostring(xml_tree)
-        namespaces = get_namespaces(xml_tree_str)
-        target_namespace, target_namespace_prefix = get_target_namespace(
-            xml_tree, namespaces
+        db_element.options["ns_prefix"] = (
+            self.parser_context.get_schema_context(xml_tree).ns_prefix
         )
-        ns_prefix = None
-        if target_namespace is not None:
-            for prefix, namespace in namespaces.items():
-                if namespace == target_namespace:
-                    ns_prefix = prefix
-                    break
-        db_element["options"]["ns_prefix"] = ns_prefix
 
         if not self.ignore_modules:
-            if get_module_url(element) is not None:
+            if get_module_url(element, self.parser_context) is not None:
                 # XSD xpath: /element/complexType/sequence
                 xsd_xpath = xml_tree.getpath(element)
                 module = self.generate_module(
@@ -2172,20 +3304,24 @@ class XSDParser:
                     edit_data_tree=edit_data_tree,
                 )
 
-                db_element["children"].append(module)
+                db_element.children.append(module)
 
                 return db_element
 
         # check if the type has a name (can be referenced by an extension)
         if "name" in element.attrib and implicit_extension:
             # check if types extend this one
-            extensions = get_extensions(xml_tree, element.attrib["name"])
+            extensions = get_extensions(
+                xml_tree,
+                element.attrib["name"],
+                parser_context=self.parser_context,
+            )
 
             # the type has some possible extensions
             if len(extensions) > 0:
                 # add the base type that can be rendered alone without extensions
                 extensions.insert(0, element)
-                choice_content = self.generate_choice_extensions(
+                choice_content = yield self.generate_choice_extensions(
                     extensions,
                     xml_tree,
                     None,
@@ -2195,14 +3331,14 @@ class XSDParser:
                     is_fixed,
                     schema_location,
                 )
-                db_element["children"].append(choice_content)
+                db_element.children.append(choice_content)
                 return db_element
 
         restriction_child = element.find(
             "{0}restriction".format(LXML_SCHEMA_NAMESPACE)
         )
         if restriction_child is not None:
-            restriction = self.generate_restriction(
+            restriction = yield self.generate_restriction(
                 restriction_child,
                 xml_tree,
                 full_path,
@@ -2220,11 +3356,7 @@ class XSDParser:
                 if default_value is None:
                     default_value = ""
 
-                db_child = {
-                    "tag": "list",
-                    "value": default_value,
-                    "children": [],
-                }
+                db_child = FormNode("list", value=default_value, children=[])
                 self.check_in_memory_elements()
             else:
                 union_child = element.find(
@@ -2232,20 +3364,19 @@ class XSDParser:
                 )
                 if union_child is not None:
                     # TODO: provide UI for unions
-                    db_child = {
-                        "tag": "union",
-                        "value": default_value,
-                        "children": [],
-                    }
+                    db_child = FormNode(
+                        "union", value=default_value, children=[]
+                    )
                     self.check_in_memory_elements()
                 else:
-                    db_child = {"tag": "error"}
+                    db_child = FormNode("error")
                     self.check_in_memory_elements()
 
-        db_element["children"].append(db_child)
+        db_element.children.append(db_child)
 
         return db_element
 
+    @generation_step
     def generate_complex_type(
         self,
         element,
@@ -2285,37 +3416,25 @@ class XSDParser:
         #       )
         #   )
         # )
-        db_element = {
-            "tag": "complex_type",
-            "value": None,
-            "children": [],
-            "options": {
+        db_element = FormNode(
+            "complex_type",
+            options={
                 "name": (
                     element.attrib["name"] if "name" in element.attrib else ""
                 ),
                 "xmlns": get_element_namespace(element, xml_tree),
             },
-        }
+            children=[],
+        )
         self.check_in_memory_elements()
 
         # get namespace prefix to reference extension in xsi:type
-        xml_tree_str = XSDTree.tostring(xml_tree)
-        namespaces = get_namespaces(xml_tree_str)
-        target_namespace, target_namespace_prefix = get_target_namespace(
-            xml_tree, namespaces
+        db_element.options["ns_prefix"] = (
+            self.parser_context.get_schema_context(xml_tree).ns_prefix
         )
-        ns_prefix = None
-
-        if target_namespace is not None:
-            for prefix, namespace in namespaces.items():
-                if namespace == target_namespace:
-                    ns_prefix = prefix
-                    break
-
-        db_element["options"]["ns_prefix"] = ns_prefix
 
         if not self.ignore_modules:
-            if get_module_url(element) is not None:
+            if get_module_url(element, self.parser_context) is not None:
                 # XSD xpath: /element/complexType/sequence
                 xsd_xpath = xml_tree.getpath(element)
                 module = self.generate_module(
@@ -2325,14 +3444,18 @@ class XSDParser:
                     xml_tree=xml_tree,
                     edit_data_tree=edit_data_tree,
                 )
-                db_element["children"].append(module)
+                db_element.children.append(module)
 
                 return db_element
 
         # check if the type has a name (can be referenced by an extension)
         if "name" in element.attrib and implicit_extension:
             # check if types extend this one
-            extensions = get_extensions(xml_tree, element.attrib["name"])
+            extensions = get_extensions(
+                xml_tree,
+                element.attrib["name"],
+                parser_context=self.parser_context,
+            )
 
             # the type has some possible extensions
             if len(extensions) > 0:
@@ -2340,7 +3463,7 @@ class XSDParser:
                 if self.implicit_extension_base:
                     extensions.insert(0, element)
 
-                choice_content = self.generate_choice_extensions(
+                choice_content = yield self.generate_choice_extensions(
                     extensions,
                     xml_tree,
                     None,
@@ -2349,7 +3472,7 @@ class XSDParser:
                     default_value,
                     schema_location,
                 )
-                db_element["children"].append(choice_content)
+                db_element.children.append(choice_content)
                 return db_element
 
         # is it a simple content?
@@ -2357,7 +3480,7 @@ class XSDParser:
             "{0}simpleContent".format(LXML_SCHEMA_NAMESPACE)
         )
         if complex_type_child is not None:
-            result_simple_content = self.generate_simple_content(
+            result_simple_content = yield self.generate_simple_content(
                 complex_type_child,
                 xml_tree,
                 full_path=full_path,
@@ -2366,7 +3489,7 @@ class XSDParser:
                 is_fixed=is_fixed,
                 schema_location=schema_location,
             )
-            db_element["children"].append(result_simple_content)
+            db_element.children.append(result_simple_content)
 
             return db_element
 
@@ -2375,7 +3498,7 @@ class XSDParser:
             "{0}complexContent".format(LXML_SCHEMA_NAMESPACE)
         )
         if complex_type_child is not None:
-            complex_content_result = self.generate_complex_content(
+            complex_content_result = yield self.generate_complex_content(
                 complex_type_child,
                 xml_tree,
                 full_path=full_path,
@@ -2383,7 +3506,7 @@ class XSDParser:
                 default_value=default_value,
                 schema_location=schema_location,
             )
-            db_element["children"].append(complex_content_result)
+            db_element.children.append(complex_content_result)
 
             return db_element
 
@@ -2393,7 +3516,7 @@ class XSDParser:
         )
         if len(complex_type_children) > 0:
             for attribute in complex_type_children:
-                element_result = self.generate_element(
+                element_result = yield self.generate_element(
                     attribute,
                     xml_tree,
                     full_path=full_path,
@@ -2401,13 +3524,13 @@ class XSDParser:
                     schema_location=schema_location,
                 )
 
-                db_element["children"].append(element_result)
+                db_element.children.append(element_result)
         # does it contain sequence or all?
         complex_type_child = element.find(
             "{0}sequence".format(LXML_SCHEMA_NAMESPACE)
         )
         if complex_type_child is not None:
-            sequence_result = self.generate_sequence(
+            sequence_result = yield self.generate_sequence(
                 complex_type_child,
                 xml_tree,
                 full_path=full_path,
@@ -2415,13 +3538,13 @@ class XSDParser:
                 schema_location=schema_location,
             )
 
-            db_element["children"].append(sequence_result)
+            db_element.children.append(sequence_result)
         else:
             complex_type_child = element.find(
                 "{0}all".format(LXML_SCHEMA_NAMESPACE)
             )
             if complex_type_child is not None:
-                sequence_result = self.generate_sequence(
+                sequence_result = yield self.generate_sequence(
                     complex_type_child,
                     xml_tree,
                     full_path=full_path,
@@ -2429,14 +3552,14 @@ class XSDParser:
                     schema_location=schema_location,
                 )
 
-                db_element["children"].append(sequence_result)
+                db_element.children.append(sequence_result)
             else:
                 # does it contain choice ?
                 complex_type_child = element.find(
                     "{0}choice".format(LXML_SCHEMA_NAMESPACE)
                 )
                 if complex_type_child is not None:
-                    choice_result = self.generate_choice(
+                    choice_result = yield self.generate_choice(
                         complex_type_child,
                         xml_tree,
                         full_path=full_path,
@@ -2444,10 +3567,11 @@ class XSDParser:
                         schema_location=schema_location,
                     )
 
-                    db_element["children"].append(choice_result)
+                    db_element.children.append(choice_result)
 
         return db_element
 
+    @generation_step
     def generate_choice_extensions(
         self,
         element,
@@ -2474,15 +3598,14 @@ class XSDParser:
         Returns:
 
         """
-        db_element = {
-            "tag": "choice",
-            "options": {
-                "xpath": {"xsd": None, "xml": full_path},
+        db_element = FormNode(
+            "choice",
+            options={
+                "xpath": FormXPath(None, full_path),
                 "schema_location": schema_location,
             },
-            "value": None,
-            "children": [],
-        }
+            children=[],
+        )
         self.check_in_memory_elements()
 
         # init variables for buttons management
@@ -2501,14 +3624,11 @@ class XSDParser:
                     if self.min_tree:
                         return db_element
 
-        # get the schema namespaces
-        xml_tree_str = XSDTree.tostring(xml_tree)
-        namespaces = get_namespaces(xml_tree_str)
-        # add the XSI prefix used by extensions
-        namespaces["xsi"] = "http://www.w3.org/2001/XMLSchema-instance"
-        target_namespace, target_namespace_prefix = get_target_namespace(
-            xml_tree, namespaces
-        )
+        # get the schema namespaces, with the XSI prefix used by extensions
+        schema_context = self.parser_context.get_schema_context(xml_tree)
+        namespaces = schema_context.xsi_namespaces
+        target_namespace = schema_context.target_namespace
+        target_namespace_prefix = schema_context.target_namespace_prefix
 
         # if root xsi:type
         if full_path == "":
@@ -2517,12 +3637,7 @@ class XSDParser:
             is_root = False
 
         for x in range(0, int(nb_occurrences)):
-            db_child = {
-                "tag": "choice-iter",
-                "value": None,
-                "children": [],
-                "options": {},
-            }
+            db_child = FormNode("choice-iter", options={}, children=[])
             self.check_in_memory_elements()
 
             for counter, choiceChild in enumerate(list(element)):
@@ -2540,12 +3655,12 @@ class XSDParser:
                 ) or choiceChild.tag == "{0}complexType".format(
                     LXML_SCHEMA_NAMESPACE
                 ):
-                    result = dict()
+                    result = None
 
                     if choiceChild.tag == "{0}complexType".format(
                         LXML_SCHEMA_NAMESPACE
                     ):
-                        result = self.generate_complex_type(
+                        result = yield self.generate_complex_type(
                             choiceChild,
                             xml_tree,
                             full_path=full_path,
@@ -2559,7 +3674,7 @@ class XSDParser:
                     elif choiceChild.tag == "{0}simpleType".format(
                         LXML_SCHEMA_NAMESPACE
                     ):
-                        result = self.generate_simple_type(
+                        result = yield self.generate_simple_type(
                             choiceChild,
                             xml_tree,
                             full_path=full_path,
@@ -2593,27 +3708,30 @@ class XSDParser:
                             full_path, opt_label
                         )
 
-                        ns_elements = edit_data_tree.xpath(
-                            ns_element_path, namespaces=namespaces
+                        ns_elements = evaluate_xpath(
+                            edit_data_tree, ns_element_path, namespaces
                         )
-                        elements = edit_data_tree.xpath(
-                            element_path, namespaces=namespaces
+                        elements = evaluate_xpath(
+                            edit_data_tree, element_path, namespaces
                         )
 
                         if len(ns_elements) != 0 or len(elements) != 0:
-                            db_child["value"] = counter
+                            db_child.value = counter
 
                     # get label from app_info if present
-                    app_info = get_app_info_options(choiceChild)
+                    app_info = get_app_info_options(
+                        choiceChild, self.parser_context
+                    )
                     if "label" in app_info:
-                        result["options"]["label"] = app_info["label"]
+                        result.options["label"] = app_info["label"]
 
-                    db_child["children"].append(result)
+                    db_child.children.append(result)
 
-            db_element["children"].append(db_child)
+            db_element.children.append(db_child)
 
         return db_element
 
+    @generation_step
     def generate_complex_content(
         self,
         element,
@@ -2638,7 +3756,7 @@ class XSDParser:
         """
         # (annotation?,(restriction|extension))
 
-        db_element = {"tag": "complex_content", "value": None, "children": []}
+        db_element = FormNode("complex_content", children=[])
         self.check_in_memory_elements()
 
         # generates the content
@@ -2646,7 +3764,7 @@ class XSDParser:
             "{0}restriction".format(LXML_SCHEMA_NAMESPACE)
         )
         if restriction_child is not None:
-            restriction_result = self.generate_restriction(
+            restriction_result = yield self.generate_restriction(
                 restriction_child,
                 xml_tree,
                 full_path,
@@ -2655,12 +3773,12 @@ class XSDParser:
                 schema_location=schema_location,
             )
 
-            db_element["children"].append(restriction_result)
+            db_element.children.append(restriction_result)
         else:
             extension_child = element.find(
                 "{0}extension".format(LXML_SCHEMA_NAMESPACE)
             )
-            extension_result = self.generate_extension(
+            extension_result = yield self.generate_extension(
                 extension_child,
                 xml_tree,
                 full_path,
@@ -2669,7 +3787,7 @@ class XSDParser:
                 schema_location=schema_location,
             )
 
-            db_element["children"].append(extension_result)
+            db_element.children.append(extension_result)
 
         return db_element
 
@@ -2698,38 +3816,34 @@ class XSDParser:
                 "Modules are not getting ignored even though they are turned off"
             )
 
-        db_element: Dict[str, Any] = {
-            "tag": "module",
-            "value": None,
-            "options": {
+        db_element = FormNode(
+            "module",
+            options={
                 "data": None,
                 "attributes": None,
                 "params": None,
                 "multiple": False,
             },
-            "children": [],
-        }
+            children=[],
+        )
         self.check_in_memory_elements()
         # FIXME: refactor get module url
-        module_url = get_module_url(element)
+        module_url = get_module_url(element, self.parser_context)
 
         # check if a module is set for this element
         if module_url is not None:
             try:
-                module = module_api.get_by_url(module_url.path)
+                module = module_registry.get_registry()[module_url.path]
 
                 # add extra parameters coming from url parameters
                 if module_url.query != "":
-                    db_element["options"]["params"] = dict(
+                    db_element.options["params"] = dict(
                         parse_qsl(module_url.query)
                     )
 
-                db_element["options"]["xpath"] = {
-                    "xsd": xsd_xpath,
-                    "xml": xml_xpath,
-                }
+                db_element.options["xpath"] = FormXPath(xsd_xpath, xml_xpath)
 
-                db_element["options"]["multiple"] = module.multiple
+                db_element.options["multiple"] = module.multiple
 
                 # Get data to reload the module
                 reload_data = None
@@ -2737,10 +3851,14 @@ class XSDParser:
 
                 if self.editing:
                     # get the schema namespaces
-                    xml_tree_str = XSDTree.tostring(xml_tree)
-                    namespaces = get_namespaces(xml_tree_str)
-                    edit_elements = edit_data_tree.xpath(
-                        xml_xpath, namespaces=namespaces
+                    namespaces = self.parser_context.get_schema_context(
+                        xml_tree
+                    ).namespaces
+                    edit_elements = find_data(
+                        edit_data_tree,
+                        xml_xpath,
+                        namespaces,
+                        self.parser_context,
                     )
 
                     if module.multiple:
@@ -2768,15 +3886,16 @@ class XSDParser:
                                     "the XML document."
                                 )
 
-                db_element["options"]["url"] = module_url.path
-                db_element["options"]["data"] = reload_data
-                db_element["options"]["attributes"] = reload_attrib
+                db_element.options["url"] = module_url.path
+                db_element.options["data"] = reload_data
+                db_element.options["attributes"] = reload_attrib
             except Exception as exception:
                 logger.error(str(exception))
                 raise ParserError("Module not found.")
 
         return db_element
 
+    @generation_step
     def generate_simple_content(
         self,
         element,
@@ -2804,7 +3923,7 @@ class XSDParser:
         # (annotation?,(restriction|extension))
         # FIXME better support for extension
 
-        db_element = {"tag": "simple_content", "value": None, "children": []}
+        db_element = FormNode("simple_content", children=[])
         self.check_in_memory_elements()
 
         # generates the content
@@ -2812,7 +3931,7 @@ class XSDParser:
             "{0}restriction".format(LXML_SCHEMA_NAMESPACE)
         )
         if restriction_child is not None:
-            restriction_result = self.generate_restriction(
+            restriction_result = yield self.generate_restriction(
                 restriction_child,
                 xml_tree,
                 full_path,
@@ -2822,12 +3941,12 @@ class XSDParser:
                 schema_location=schema_location,
             )
 
-            db_element["children"].append(restriction_result)
+            db_element.children.append(restriction_result)
         else:
             extension_child = element.find(
                 "{0}extension".format(LXML_SCHEMA_NAMESPACE)
             )
-            extension_result = self.generate_extension(
+            extension_result = yield self.generate_extension(
                 extension_child,
                 xml_tree,
                 full_path,
@@ -2837,10 +3956,11 @@ class XSDParser:
                 schema_location=schema_location,
             )
 
-            db_element["children"].append(extension_result)
+            db_element.children.append(extension_result)
 
         return db_element
 
+    @generation_step
     def generate_restriction(
         self,
         element,
@@ -2870,17 +3990,16 @@ class XSDParser:
         #  https://www.w3.org/TR/xmlschema-1/#declare-datatype)
         # FIXME simpleType is a possible child only if the base attr has not
         #  been specified
-        db_element = {
-            "tag": "restriction",
-            "options": {
+        db_element = FormNode(
+            "restriction",
+            options={
                 "base": element.attrib.get(
                     "base"
                 ),  # TODO Change it to avoid having the namespace with it
                 "fixed": is_fixed,
             },
-            "value": None,
-            "children": [],
-        }
+            children=[],
+        )
         self.check_in_memory_elements()
 
         enumeration = element.findall(
@@ -2893,10 +4012,9 @@ class XSDParser:
             if is_fixed:
                 # Fixed
                 for enum in enumeration:
-                    db_child = {
-                        "tag": "enumeration",
-                        "value": enum.attrib.get("value"),
-                    }
+                    db_child = FormNode(
+                        "enumeration", value=enum.attrib.get("value")
+                    )
                     self.check_in_memory_elements()
 
                     if enum.attrib.get("value") == default_value:
@@ -2905,7 +4023,7 @@ class XSDParser:
                             enum.attrib.get("value"),
                             True,
                         )
-                        db_element["value"] = default_value
+                        db_element.value = default_value
                     else:
                         entry = (
                             enum.attrib.get("value"),
@@ -2914,7 +4032,7 @@ class XSDParser:
                         )
 
                     option_list.append(entry)
-                    db_element["children"].append(db_child)
+                    db_element.children.append(db_child)
             elif self.editing:
                 # Edition
                 default_value = (
@@ -2922,10 +4040,9 @@ class XSDParser:
                 )
 
                 for enum in enumeration:
-                    db_child = {
-                        "tag": "enumeration",
-                        "value": enum.attrib.get("value"),
-                    }
+                    db_child = FormNode(
+                        "enumeration", value=enum.attrib.get("value")
+                    )
                     self.check_in_memory_elements()
                     if (
                         default_value is not None
@@ -2936,7 +4053,7 @@ class XSDParser:
                             enum.attrib.get("value"),
                             True,
                         )
-                        db_element["value"] = default_value
+                        db_element.value = default_value
                     else:
                         entry = (
                             enum.attrib.get("value"),
@@ -2945,14 +4062,13 @@ class XSDParser:
                         )
 
                     option_list.append(entry)
-                    db_element["children"].append(db_child)
+                    db_element.children.append(db_child)
             else:
                 # New document
                 for enum in enumeration:
-                    db_child = {
-                        "tag": "enumeration",
-                        "value": enum.attrib.get("value"),
-                    }
+                    db_child = FormNode(
+                        "enumeration", value=enum.attrib.get("value")
+                    )
                     self.check_in_memory_elements()
                     entry = (
                         enum.attrib.get("value"),
@@ -2961,15 +4077,15 @@ class XSDParser:
                     )
                     option_list.append(entry)
 
-                    db_element["children"].append(db_child)
+                    db_element.children.append(db_child)
 
-                db_element["value"] = db_element["children"][0]["value"]
+                db_element.value = db_element.children[0].value
         else:
             simple_type = element.find(
                 "{0}simpleType".format(LXML_SCHEMA_NAMESPACE)
             )
             if simple_type is not None:
-                simple_type_result = self.generate_simple_type(
+                simple_type_result = yield self.generate_simple_type(
                     simple_type,
                     xml_tree,
                     full_path=full_path,
@@ -2985,13 +4101,14 @@ class XSDParser:
                 if default_value is None:
                     default_value = ""
 
-                db_child = {"tag": "input", "value": default_value}
+                db_child = FormNode("input", value=default_value)
                 self.check_in_memory_elements()
 
-            db_element["children"].append(db_child)
+            db_element.children.append(db_child)
 
         return db_element
 
+    @generation_step
     def generate_extension(
         self,
         element,
@@ -3018,11 +4135,7 @@ class XSDParser:
         """
         # FIXME doesn't represent all the possibilities
         #  (http://www.w3schools.com/xml/el_extension.asp)
-        db_element: Dict[str, Any] = {
-            "tag": "extension",
-            "value": None,
-            "children": [],
-        }
+        db_element = FormNode("extension", children=[])
         self.check_in_memory_elements()
 
         ##################################################
@@ -3031,42 +4144,37 @@ class XSDParser:
         # 'base' (required) is the only attribute to parse
         ##################################################
         if "base" in element.attrib:
-            xml_tree_str = XSDTree.tostring(xml_tree)
-            namespaces = get_namespaces(xml_tree_str)
-            default_prefix = get_default_prefix(namespaces)
-
-            target_namespace, target_namespace_prefix = get_target_namespace(
-                xml_tree, namespaces
-            )
+            schema_context = self.parser_context.get_schema_context(xml_tree)
             base_type, xml_tree, schema_location = get_element_type(
                 element,
                 xml_tree,
-                namespaces,
-                default_prefix,
-                target_namespace_prefix,
+                schema_context.namespaces,
+                schema_context.default_prefix,
+                schema_context.target_namespace_prefix,
                 schema_location,
                 "base",
                 download_enabled=self.download_dependencies,
                 request=self.request,
+                parser_context=self.parser_context,
             )
 
             # test if base is a built-in data types
             if not isinstance(base_type, etree._Element):
-                db_element["children"].append(
-                    {
-                        "tag": "input",
-                        "value": default_value,
-                        "options": {
+                db_element.children.append(
+                    FormNode(
+                        "input",
+                        value=default_value,
+                        options={
                             "fixed": is_fixed,
                         },
-                    }
+                    )
                 )
             else:  # not a built-in data type
                 # fixed not allowed for extensions with base complex type
                 if base_type.tag == "{0}complexType".format(
                     LXML_SCHEMA_NAMESPACE
                 ):
-                    complex_type_result = self.generate_complex_type(
+                    complex_type_result = yield self.generate_complex_type(
                         base_type,
                         xml_tree,
                         full_path=full_path,
@@ -3076,11 +4184,11 @@ class XSDParser:
                         implicit_extension=False,
                     )
 
-                    db_element["children"].append(complex_type_result)
+                    db_element.children.append(complex_type_result)
                 elif base_type.tag == "{0}simpleType".format(
                     LXML_SCHEMA_NAMESPACE
                 ):
-                    simple_type_result = self.generate_simple_type(
+                    simple_type_result = yield self.generate_simple_type(
                         base_type,
                         xml_tree,
                         full_path=full_path,
@@ -3091,17 +4199,17 @@ class XSDParser:
                         implicit_extension=False,
                     )
 
-                    db_element["children"].append(simple_type_result)
+                    db_element.children.append(simple_type_result)
 
         ##################################################
         # Parsing children
         ##################################################
         if (
-            "children" in db_element["children"][0]
+            db_element.children[0].children is not None
         ):  # Element extends simple or complex type
-            extended_element = db_element["children"][0]["children"]
+            extended_element = db_element.children[0].children
         else:  # Element extends one of the base types
-            extended_element = db_element["children"]
+            extended_element = db_element.children
 
         # does it contain any attributes?
         complex_type_children = element.findall(
@@ -3109,7 +4217,7 @@ class XSDParser:
         )
         if len(complex_type_children) > 0:
             for attribute in complex_type_children:
-                element_result = self.generate_element(
+                element_result = yield self.generate_element(
                     attribute,
                     xml_tree,
                     full_path=full_path,
@@ -3125,7 +4233,7 @@ class XSDParser:
             "{0}sequence".format(LXML_SCHEMA_NAMESPACE)
         )
         if complex_type_child is not None:
-            sequence_result = self.generate_sequence(
+            sequence_result = yield self.generate_sequence(
                 complex_type_child,
                 xml_tree,
                 full_path=full_path,
@@ -3139,7 +4247,7 @@ class XSDParser:
                 "{0}all".format(LXML_SCHEMA_NAMESPACE)
             )
             if complex_type_child is not None:
-                sequence_result = self.generate_sequence(
+                sequence_result = yield self.generate_sequence(
                     complex_type_child,
                     xml_tree,
                     full_path=full_path,
@@ -3154,7 +4262,7 @@ class XSDParser:
                     "{0}choice".format(LXML_SCHEMA_NAMESPACE)
                 )
                 if complex_type_child is not None:
-                    choice_result = self.generate_choice(
+                    choice_result = yield self.generate_choice(
                         complex_type_child,
                         xml_tree,
                         full_path=full_path,
@@ -3176,19 +4284,17 @@ class XSDParser:
         Returns:
 
         """
-        # remove indexes from the xpath
-        xpath = re.sub(r"\[[0-9]+]", "", full_path)
-        # remove namespaces
-        for prefix in list(element.nsmap.keys()):
-            xpath = re.sub(r"{}:".format(prefix), "", xpath)
-        for key in list(self.keys.keys()):
-            if self.keys[key]["xpath"] == xpath:
-                if self.keys[key]["module"] is not None:
-                    add_appinfo_child_to_element(
-                        element, MODULE_TAG_NAME, self.keys[key]["module"]
-                    )
-                    return True
-        return False
+        key_name = self.get_key_xpaths().get(
+            normalize_key_xpath(full_path, element.nsmap)
+        )
+        if key_name is None:
+            return False
+
+        add_appinfo_child_to_element(
+            element, MODULE_TAG_NAME, self.keys[key_name]["module"]
+        )
+        self.parser_context.clear_app_info_options(element)
+        return True
 
     def is_keyref(self, element, full_path):
         """Check if current element is used as a keyref
@@ -3200,20 +4306,48 @@ class XSDParser:
         Returns:
 
         """
-        # remove indexes from the xpath
-        xpath = re.sub(r"\[[0-9]+]", "", full_path)
-        # remove namespaces
-        for prefix in list(element.nsmap.keys()):
-            xpath = re.sub(r"{}:".format(prefix), "", xpath)
-        for keyref in list(self.keyrefs.keys()):
-            if self.keyrefs[keyref]["xpath"] == xpath:
-                add_appinfo_child_to_element(
-                    element,
-                    MODULE_TAG_NAME,
-                    "module-auto-keyref?keyref={}".format(keyref),
-                )
-                return True
-        return False
+        keyref_name = self.get_keyref_xpaths().get(
+            normalize_key_xpath(full_path, element.nsmap)
+        )
+        if keyref_name is None:
+            return False
+
+        add_appinfo_child_to_element(
+            element,
+            MODULE_TAG_NAME,
+            "module-auto-keyref?keyref={}".format(keyref_name),
+        )
+        self.parser_context.clear_app_info_options(element)
+        return True
+
+    def get_key_xpaths(self):
+        """Return the names of the keys with a module, by xpath (first key of
+        an xpath kept), index them on first access
+
+        Returns:
+
+        """
+        if self.key_xpaths is None:
+            self.key_xpaths = {}
+            for key_name, key in self.keys.items():
+                if key["module"] is not None:
+                    self.key_xpaths.setdefault(key["xpath"], key_name)
+
+        return self.key_xpaths
+
+    def get_keyref_xpaths(self):
+        """Return the names of the keyrefs, by xpath (first keyref of an xpath
+        kept), index them on first access
+
+        Returns:
+
+        """
+        if self.keyref_xpaths is None:
+            self.keyref_xpaths = {}
+            for keyref_name, keyref in self.keyrefs.items():
+                self.keyref_xpaths.setdefault(keyref["xpath"], keyref_name)
+
+        return self.keyref_xpaths
 
     def manage_key_keyref(self, element, full_path):
         """Collect key and keyref elements
@@ -3233,9 +4367,13 @@ class XSDParser:
         )
 
         # remove indexes from the xpath
-        full_path = re.sub(r"\[[0-9]+]", "", full_path)
+        full_path = XPATH_INDEX_PATTERN.sub("", full_path)
 
         if len(list_key) > 0:
+            # the indexes of the keys and keyrefs are rebuilt on next access
+            self.key_xpaths = None
+            self.keyref_xpaths = None
+
             for key in list_key:
                 key_name = key.attrib["name"]
                 key_field = ""
@@ -3246,10 +4384,9 @@ class XSDParser:
                 selector_xpath = selector.attrib["xpath"]
                 key_selector = full_path + "/" + selector_xpath
                 # remove namespaces
-                for prefix in list(selector.nsmap.keys()):
-                    key_selector = re.sub(
-                        r"{}:".format(prefix), "", key_selector
-                    )
+                key_selector = normalize_key_xpath(
+                    key_selector, selector.nsmap, remove_indexes=False
+                )
 
                 # FIXME: manage multiple fields
                 fields = key.findall("{0}field".format(LXML_SCHEMA_NAMESPACE))
@@ -3258,7 +4395,7 @@ class XSDParser:
                     key_field = key_selector + "/" + field_xpath
 
                 # look if a module is attached to the key
-                module_url = get_module_url(key)
+                module_url = get_module_url(key, self.parser_context)
                 if module_url is not None:
                     module = "{0}?key={1}".format(module_url.path, key_name)
                 else:
@@ -3284,10 +4421,9 @@ class XSDParser:
                 selector_xpath = selector.attrib["xpath"]
                 keyref_selector = full_path + "/" + selector_xpath
                 # remove namespaces
-                for prefix in list(selector.nsmap.keys()):
-                    keyref_selector = re.sub(
-                        r"{}:".format(prefix), "", keyref_selector
-                    )
+                keyref_selector = normalize_key_xpath(
+                    keyref_selector, selector.nsmap, remove_indexes=False
+                )
 
                 # FIXME: manage multiple fields
                 fields = keyref.findall(
@@ -3317,16 +4453,29 @@ class XSDParser:
         )
         if "keys" in root.options:
             self.keys = root.options["keys"]
+            self.key_xpaths = None
         if "keyrefs" in root.options:
             self.keyrefs = root.options["keyrefs"]
+            self.keyref_xpaths = None
 
     def check_in_memory_elements(self):
-        """Check if maximum number of in-memory elements is reached"""
+        """Check if maximum number of in-memory elements is reached. The
+        maximum is a soft budget when the form is streamed to the database."""
         # Increment element counter
         self.in_memory_elements += 1
 
         # Check that number of created elements below limit
         if self.in_memory_elements > PARSER_MAX_IN_MEMORY_ELEMENTS:
+            if self.branch_writer is not None:
+                # the branches of the next generated elements are saved
+                if not self.branch_writer.over_budget:
+                    logger.warning(
+                        "Maximum number of in-memory elements has been "
+                        "reached, saving the generated branches."
+                    )
+                    self.branch_writer.over_budget = True
+                return
+
             logger.error(
                 "Maximum number of in-memory elements has been reached. "
                 "Check the value of PARSER_MAX_IN_MEMORY_ELEMENTS."
@@ -3334,3 +4483,31 @@ class XSDParser:
             raise ParserError(
                 "A memory error occurred (PARSER_MAX_IN_MEMORY_ELEMENTS)."
             )
+
+    def save_generated_branches(self, db_element, in_memory_elements):
+        """Save the branches of the children of a generated element when the
+        form is streamed to the database, if they reach the batch size or if
+        the in-memory budget is exceeded
+
+        Args:
+            db_element:
+            in_memory_elements: number of in-memory elements before the
+                generation of the element
+
+        Returns:
+
+        """
+        if self.branch_writer is None:
+            return db_element
+
+        if (
+            self.in_memory_elements - in_memory_elements
+            >= self.branch_writer.batch_size
+            or self.in_memory_elements > PARSER_MAX_IN_MEMORY_ELEMENTS
+        ):
+            nb_elements = self.branch_writer.save_children(db_element)
+            self.in_memory_elements = max(
+                self.in_memory_elements - nb_elements, 0
+            )
+
+        return db_element
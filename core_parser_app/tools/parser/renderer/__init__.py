@@ -10,6 +10,8 @@ from django.template.backends.django import Template
 from core_parser_app.components.data_structure.models import (
     DataStructureElement,
 )
+from core_parser_app.components.enumeration import api as enumeration_api
+from core_parser_app.settings import PARSER_ENUMERATION_PAGED_THRESHOLD
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +47,12 @@ class DefaultRenderer:
 
         self.data = xsd_data
         self.warnings = []
+        # children of the rendered elements, by id of the parent
+        self.children_index = None
+        # rendered elements, by id
+        self.elements_index = None
+        # values of the enumerations of the rendered tree, by hash
+        self.enumerations_index = None
 
         default_renderer_path = join("renderer", "default")
         self.templates = {
@@ -60,6 +68,9 @@ class DefaultRenderer:
             "select": loader.get_template(
                 join(default_renderer_path, "inputs", "select.html")
             ),
+            "search": loader.get_template(
+                join(default_renderer_path, "inputs", "search.html")
+            ),
             "checkbox": loader.get_template(
                 join(default_renderer_path, "inputs", "checkbox.html")
             ),
@@ -83,6 +94,170 @@ class DefaultRenderer:
         if template_list is not None:
             self.templates.update(template_list)
 
+    def _get_children(self, element):
+        """Returns the children of an element, ordered by id. The rendered
+        tree is loaded on first access, then read from memory.
+
+        Args:
+            element:
+
+        Returns:
+
+        """
+        if self.children_index is None:
+            self._load_tree()
+
+        children = self.children_index.get(element.pk)
+        # element outside of the rendered tree
+        if children is None:
+            children = list(element.children.all().order_by("pk"))
+            self.children_index[element.pk] = children
+
+        return children
+
+    def _get_parent(self, element):
+        """Returns the parent of an element, from memory if it is part of the
+        rendered tree.
+
+        Args:
+            element:
+
+        Returns:
+
+        """
+        if self.elements_index is None:
+            self._load_tree()
+
+        parent = self.elements_index.get(element.parent_id)
+        # parent outside of the rendered tree
+        if parent is None and element.parent_id is not None:
+            parent = element.parent
+            self.elements_index[parent.pk] = parent
+
+        return parent
+
+    def _load_tree(self):
+        """Loads the rendered tree, indexes the elements by id and their
+        children by parent id
+
+        Returns:
+
+        """
+        self.elements_index = {self.data.pk: self.data}
+        self.children_index = {self.data.pk: []}
+
+        # branch indexed by path: load all its elements at once
+        if self.data.path:
+            for element in DataStructureElement.get_branch(self.data):
+                if element.pk == self.data.pk:
+                    continue
+                self.elements_index[element.pk] = element
+                self.children_index[element.pk] = []
+                self.children_index[element.parent_id].append(element)
+            return
+
+        # load the branch, one tree level at a time
+        parent_ids = [self.data.pk]
+        while len(parent_ids) > 0:
+            children = DataStructureElement.get_by_parent_ids(parent_ids)
+            parent_ids = []
+            for element in children:
+                self.elements_index[element.pk] = element
+                self.children_index[element.pk] = []
+                self.children_index[element.parent_id].append(element)
+                parent_ids.append(element.pk)
+
+    def set_tree(self, elements):
+        """Sets the rendered tree from loaded elements, instead of loading it
+        on first access
+
+        Args:
+            elements: descendants of the rendered element, parents first
+
+        Returns:
+
+        """
+        self.elements_index = {self.data.pk: self.data}
+        self.children_index = {self.data.pk: []}
+        for element in elements:
+            self.elements_index[element.pk] = element
+            self.children_index[element.pk] = []
+            self.children_index[element.parent_id].append(element)
+
+    def _get_enumeration(self, element):
+        """Returns the values of the enumeration of a restriction, None if
+        they are stored as children of the restriction. The enumerations of
+        the rendered tree are loaded on first access.
+
+        Args:
+            element:
+
+        Returns:
+
+        """
+        enumeration_hash = element.options.get("enumeration")
+        if enumeration_hash is None:
+            return None
+
+        if (
+            self.enumerations_index is None
+            or enumeration_hash not in self.enumerations_index
+        ):
+            self._load_enumerations(enumeration_hash)
+
+        return self.enumerations_index.get(enumeration_hash, [])
+
+    def _is_paged_enumeration(self, element):
+        """Checks if the values of the enumeration of a restriction are
+        loaded by page, from a search field
+
+        Args:
+            element:
+
+        Returns:
+
+        """
+        enumeration_size = element.options.get("enumeration_size")
+        return (
+            PARSER_ENUMERATION_PAGED_THRESHOLD > 0
+            and enumeration_size is not None
+            and enumeration_size > PARSER_ENUMERATION_PAGED_THRESHOLD
+        )
+
+    def _load_enumerations(self, enumeration_hash):
+        """Loads the enumerations of the rendered tree
+
+        Args:
+            enumeration_hash: hash of the enumeration to load
+
+        Returns:
+
+        """
+        if self.elements_index is None:
+            self._load_tree()
+        if self.enumerations_index is None:
+            self.enumerations_index = {}
+
+        # values of the paged enumerations are not rendered
+        enumeration_hashes = {
+            element.options.get("enumeration")
+            for element in self.elements_index.values()
+            if element.tag == "restriction"
+            and not self._is_paged_enumeration(element)
+        }
+        enumeration_hashes.add(enumeration_hash)
+        enumeration_hashes.difference_update(self.enumerations_index)
+        enumeration_hashes.discard(None)
+
+        self.enumerations_index.update(
+            enumeration_api.get_values_by_hashes(enumeration_hashes)
+        )
+        # enumerations not found are not loaded again
+        for missing_hash in enumeration_hashes.difference(
+            self.enumerations_index
+        ):
+            self.enumerations_index[missing_hash] = []
+
     def _load_template(self, tpl_key, tpl_data=None):
         """Loads an HTML template
 
@@ -236,6 +411,31 @@ class DefaultRenderer:
 
         return self._load_template("select", data)
 
+    def _render_search(
+        self, select_id, select_class, selected_value, element_options
+    ):
+        """Renders a drop down list with a search field, loading its options
+        by page
+
+        Args:
+            select_id:
+            select_class:
+            selected_value:
+            element_options:
+
+        Returns:
+
+        """
+        data = {
+            "select_id": select_id,
+            "select_class": select_class,
+            "selected_value": selected_value,
+            "fixed": element_options.get("fixed", False),
+            "tooltip": element_options.get("tooltip", ""),
+        }
+
+        return self._load_template("search", data)
+
     def _render_buttons(self, add_button, delete_button):
         """Displays buttons for a duplicable/removable element
 
@@ -6,7 +6,6 @@ from os.path import join
 
 from django.template import loader
 
-from core_parser_app.components.module import api as module_api
 from core_parser_app.tools.modules.views.module import AbstractModule
 from core_parser_app.tools.parser.renderer import DefaultRenderer
 
@@ -145,12 +144,12 @@ class ListRenderer(AbstractListRenderer):
         child_keys = []
         children_number = 0
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "elem-iter":
-                children[child.pk] = child.children.all().order_by("pk")
+                children[child.pk] = self._get_children(child)
                 child_keys.append(child.pk)
 
-                if child.children.count() > 0:
+                if len(children[child.pk]) > 0:
                     children_number += 1
             else:
                 message = (
@@ -188,7 +187,7 @@ class ListRenderer(AbstractListRenderer):
             sub_inputs = []
             sub_buttons = []
 
-            for child in children[child_key].all().order_by("pk"):
+            for child in children[child_key]:
                 if child.tag == "complex_type":
                     sub_elements.append(self.render_complex_type(child))
                     sub_inputs.append(False)
@@ -259,7 +258,7 @@ class ListRenderer(AbstractListRenderer):
         attributes = []
         simple = False
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "sequence":
                 html_content += self.render_sequence(child)
             elif child.tag == "simple_content":
@@ -296,12 +295,12 @@ class ListRenderer(AbstractListRenderer):
         child_keys = []
         children_number = 0
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "elem-iter":
-                children[child.pk] = child.children.all().order_by("pk")
+                children[child.pk] = self._get_children(child)
                 child_keys.append(child.pk)
 
-                if child.children.count() > 0:
+                if len(children[child.pk]) > 0:
                     children_number += 1
             else:
                 message = (
@@ -339,7 +338,7 @@ class ListRenderer(AbstractListRenderer):
             sub_inputs = []
             sub_buttons = []
 
-            for child in children[child_key].all().order_by("pk"):
+            for child in children[child_key]:
                 if child.tag == "simple_type":
                     sub_elements.append(self.render_simple_type(child))
                     sub_inputs.append(True)
@@ -405,12 +404,12 @@ class ListRenderer(AbstractListRenderer):
         child_keys = []
         children_number = 0
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "sequence-iter":
-                children[child.pk] = child.children.all().order_by("pk")
+                children[child.pk] = self._get_children(child)
                 child_keys.append(child.pk)
 
-                if child.children.count() > 0:
+                if len(children[child.pk]) > 0:
                     children_number += 1
             else:
                 message = (
@@ -452,7 +451,7 @@ class ListRenderer(AbstractListRenderer):
             sub_elements = []
             html_content = ""
 
-            for child in children[child_key].all().order_by("pk"):
+            for child in children[child_key]:
                 if child.tag == "element":
                     sub_elements.append(self.render_element(child))
                 elif child.tag == "sequence":
@@ -517,12 +516,12 @@ class ListRenderer(AbstractListRenderer):
         choice_values = {}
         children_number = 0
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "choice-iter":
-                children[child.pk] = child.children.all().order_by("pk")
+                children[child.pk] = self._get_children(child)
                 child_keys.append(child.pk)
 
-                if child.children.count() > 0:
+                if len(children[child.pk]) > 0:
                     children_number += 1
 
                 choice_values[child.pk] = child.value
@@ -557,7 +556,7 @@ class ListRenderer(AbstractListRenderer):
             html_content = ""
             options = []
 
-            for child in children[iter_element].all().order_by("pk"):
+            for child in children[iter_element]:
                 element_html = ""
                 is_selected_element = (
                     str(child.pk) == choice_values[iter_element]
@@ -620,7 +619,7 @@ class ListRenderer(AbstractListRenderer):
                 li_class = str(element.pk)
 
                 # Choice contains only one element, we don't generate the select
-                if children[iter_element].count() == 1:
+                if len(children[iter_element]) == 1:
                     html_content += options[0][1] + sub_content
                 else:  # Choice contains a list
                     html_content += f"{label} {self._render_select(None, 'choice', options, element_options=element.options)}{buttons}"
@@ -645,7 +644,7 @@ class ListRenderer(AbstractListRenderer):
         """
         html_content = ""
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "extension":
                 html_content += self.render_extension(child)
             elif child.tag == "restriction":
@@ -669,7 +668,7 @@ class ListRenderer(AbstractListRenderer):
         """
         html_content = ""
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "extension":
                 html_content += self.render_extension(child)
             elif child.tag == "restriction":
@@ -693,7 +692,7 @@ class ListRenderer(AbstractListRenderer):
         """
         html_content = ""
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "restriction":
                 html_content += self.render_restriction(child)
             elif child.tag == "list":
@@ -726,7 +725,7 @@ class ListRenderer(AbstractListRenderer):
         attributes = []
         simple = True
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "input":
                 html_content += self._render_input(child)
             elif child.tag == "attribute":
@@ -756,10 +755,28 @@ class ListRenderer(AbstractListRenderer):
         Returns:
 
         """
+        # large enumeration: the options are searched by page
+        if self._is_paged_enumeration(element):
+            return self._render_search(
+                element.pk, "restriction", element.value, element.options
+            )
+
+        enumeration = self._get_enumeration(element)
+        if enumeration is not None:
+            return self._render_select(
+                element.pk,
+                "restriction",
+                [
+                    (value, value, value == element.value)
+                    for value in enumeration
+                ],
+                element.options,
+            )
+
         options = []
         subhtml = ""
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "enumeration":
                 options.append(
                     (child.value, child.value, child.value == element.value)
@@ -791,10 +808,7 @@ class ListRenderer(AbstractListRenderer):
         module_options = element.options
         module_url = module_options["url"]
 
-        module = module_api.get_by_url(module_url)
-        module_view = AbstractModule.get_view_from_view_path(
-            module.view
-        ).as_view()
+        module_view = AbstractModule.get_module_view(module_url)
 
         module_request = self.request
         module_request.method = "GET"
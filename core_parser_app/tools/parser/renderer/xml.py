@@ -18,6 +18,45 @@ from core_parser_app.tools.parser.renderer import DefaultRenderer
 logger = logging.getLogger(__name__)
 
 
+class DeferredContent:
+    """Inner XML content made of strings and of elements, rendered when the
+    output reaches them"""
+
+    def __init__(self, chunks=None):
+        """Initializes the deferred content
+
+        Args:
+            chunks: strings and elements
+        """
+        self.chunks = chunks if chunks is not None else []
+
+    def __add__(self, other):
+        return DeferredContent(self.chunks + get_content_chunks(other))
+
+    def __radd__(self, other):
+        return DeferredContent(get_content_chunks(other) + self.chunks)
+
+    def __iadd__(self, other):
+        self.chunks.extend(get_content_chunks(other))
+        return self
+
+
+def get_content_chunks(content):
+    """Returns the chunks of an inner XML content
+
+    Args:
+        content: string or deferred content
+
+    Returns:
+
+    """
+    if isinstance(content, DeferredContent):
+        return list(content.chunks)
+    if content == "":
+        return []
+    return [content]
+
+
 class AbstractXmlRenderer(DefaultRenderer):
     """Abstract XML renderer class"""
 
@@ -50,6 +89,31 @@ class AbstractXmlRenderer(DefaultRenderer):
 
         return self._load_template("xml", data)
 
+    def _render_xml_start(self, name, attributes):
+        """Renders the start tag of an XML element
+
+        Args:
+            name:
+            attributes:
+
+        Returns:
+
+        """
+        if attributes:
+            return "<{0} {1}>".format(name, attributes)
+        return "<{0}>".format(name)
+
+    def _render_xml_end(self, name):
+        """Renders the end tag of an XML element
+
+        Args:
+            name:
+
+        Returns:
+
+        """
+        return "</{0}>".format(name)
+
 
 class XmlRenderer(AbstractXmlRenderer):
     """XML Renderer class"""
@@ -63,6 +127,8 @@ class XmlRenderer(AbstractXmlRenderer):
         super().__init__(xsd_data)
         self.request = request
         self.isRoot = True
+        # render nested elements when the output reaches them
+        self.streaming = False
 
     def render(self):
         """Renders form as XML
@@ -74,11 +140,7 @@ class XmlRenderer(AbstractXmlRenderer):
             return self.render_element(self.data)
         if self.data.tag == "choice":
             content = self.render_choice(self.data)
-            root = self.data.children.all().order_by("pk")[0]
-            root_elem_id = root.value
-            root_elem = data_structure_element_api.get_by_id(
-                root_elem_id, self.request
-            )
+            root_elem = self._get_selected_root_element()
             root_name = root_elem.options["name"]
 
             if (
@@ -98,6 +160,113 @@ class XmlRenderer(AbstractXmlRenderer):
         self.warnings.append(message)
         return ""
 
+    def render_stream(self):
+        """Renders form as XML, chunk by chunk. Each element is rendered when
+        the output reaches it.
+
+        Returns:
+
+        """
+        self.streaming = True
+        try:
+            if self.data.tag == "element":
+                yield from self._stream_element(self.data)
+            elif self.data.tag == "choice":
+                content = self.render_choice(self.data)
+                root_elem = self._get_selected_root_element()
+                root_name = root_elem.options["name"]
+
+                if content[0] == "":  # Multi-root with element
+                    yield from self._stream_content(content[1])
+                    return
+                # Multi-root with complexType
+                if (
+                    "xmlns" in root_elem.options
+                    and root_elem.options["xmlns"] is not None
+                ):
+                    xml_ns = ' xmlns="{}"'.format(root_elem.options["xmlns"])
+                    content[0] += xml_ns
+                yield self._render_xml_start(root_name, content[0])
+                yield from self._stream_content(content[1])
+                yield self._render_xml_end(root_name)
+            else:
+                message = "render: " + self.data.tag + " not handled"
+                self.warnings.append(message)
+        finally:
+            self.streaming = False
+
+    def _stream_content(self, content):
+        """Renders an inner XML content, chunk by chunk
+
+        Args:
+            content:
+
+        Returns:
+
+        """
+        for chunk in get_content_chunks(content):
+            if isinstance(chunk, str):
+                yield chunk
+            else:
+                yield from self._stream_element(chunk)
+
+    def _stream_element(self, element):
+        """Renders an element, chunk by chunk
+
+        Args:
+            element:
+
+        Returns:
+
+        """
+        element_name = element.options["name"]
+
+        for child in self._get_element_occurrences(element):
+            content = self._render_element_occurrence(element, child)
+
+            # content[2] has the value returned by a module (the entire
+            # tag, when multiple is True)
+            if content[2] != "":
+                if "".join(self._stream_content(content[1])) != "":
+                    raise RendererError(
+                        "ERROR: More values than expected were returned "
+                        "(Module multiple)."
+                    )
+                yield content[2]
+            else:
+                yield self._render_xml_start(element_name, content[0])
+                yield from self._stream_content(content[1])
+                yield self._render_xml_end(element_name)
+
+    def _render_nested_element(self, element):
+        """Renders an element nested in the content of another element. When
+        streaming, the element is rendered later, when the output reaches it.
+
+        Args:
+            element:
+
+        Returns:
+
+        """
+        if self.streaming:
+            return DeferredContent([element])
+        return self.render_element(element)
+
+    def _get_selected_root_element(self):
+        """Gets the root element selected in a multi-root choice
+
+        Returns:
+
+        """
+        root = self._get_children(self.data)[0]
+        root_elem_id = root.value
+
+        for child in self._get_children(root):
+            if str(child.pk) == root_elem_id:
+                return child
+
+        return data_structure_element_api.get_by_id(root_elem_id, self.request)
+
     def _get_parent_element(self, element):
         """Gets the parent element (with tag element, not the direct parent)
         of the current element.
@@ -109,10 +278,10 @@ class XmlRenderer(AbstractXmlRenderer):
 
         """
         try:
-            parent = element.parent
+            parent = self._get_parent(element)
 
             while parent.tag != "element":
-                parent = parent.parent
+                parent = self._get_parent(parent)
 
             return parent
         except Exception as e:
@@ -132,104 +301,117 @@ class XmlRenderer(AbstractXmlRenderer):
 
         """
         xml_string = ""
-        children = {}
-        child_keys = []
-        children_number = 0
+        element_name = element.options["name"]
 
-        for child in element.children.all().order_by("pk"):
-            if child.tag == "elem-iter":
-                children[child.pk] = child.children.all().order_by("pk")
-                child_keys.append(child.pk)
+        for child in self._get_element_occurrences(element):
+            content = self._render_element_occurrence(element, child)
+
+            # content[2] has the value returned by a module (the entire
+            # tag, when multiple is True)
+            if content[2] != "":
+                if content[1] != "":
+                    raise RendererError(
+                        "ERROR: More values than expected were returned "
+                        "(Module multiple)."
+                    )
+                xml_string += content[2]
+            else:
+                xml_string += self._render_xml(
+                    element_name, content[0], content[1]
+                )
+
+        return xml_string
+
+    def _get_element_occurrences(self, element):
+        """Gets the occurrences of an element
+
+        Args:
+            element:
 
-                if child.children.count() > 0:
-                    children_number += 1
+        Returns:
+
+        """
+        occurrences = []
+
+        for child in self._get_children(element):
+            if child.tag == "elem-iter":
+                occurrences += self._get_children(child)
             else:
                 message = (
                     "render_element (iteration): " + child.tag + " not handled"
                 )
                 self.warnings.append(message)
 
-        element_name = element.options["name"]
+        return occurrences
 
-        for child_key in child_keys:
-            for child in children[child_key]:
-                content = ["", "", ""]
-
-                # add XML Schema instance prefix if root
-                if self.isRoot:
-                    xsi = ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
-                    content[0] += xsi
-                    self.isRoot = False
-
-                if child.tag == "complex_type":
-                    tmp_content = self.render_complex_type(child)
-                    content[0] += tmp_content[0]
-                    content[1] += tmp_content[1]
-                    content[2] += tmp_content[2]
-                elif child.tag == "input":
-                    tmp_content = (
-                        child.value if child.value is not None else ""
-                    )
-                    content[1] += (
-                        XmlEntities().escape_xml_entities(tmp_content)
-                        if AUTO_ESCAPE_XML_ENTITIES
-                        else tmp_content
-                    )
-                elif child.tag == "simple_type":
-                    tmp_content = self.render_simple_type(child)
-                    content[0] += tmp_content[0]
-                    content[1] += tmp_content[1]
-                    content[2] += tmp_content[2]
-                elif child.tag == "module":
-                    tmp_content = self.render_module(child)
-
-                    if child.options["multiple"]:
-                        content[2] += tmp_content[1]
-                    else:
-                        content[1] += tmp_content[1]
-                else:
-                    message = "render_element: " + child.tag + " not handled"
-                    self.warnings.append(message)
+    def _render_element_occurrence(self, element, child):
+        """Renders the content of an occurrence of an element
 
-                # namespaces
-                parent = self._get_parent_element(element)
-                if parent is not None:
-                    if (
-                        "xmlns" in element.options
-                        and element.options["xmlns"] is not None
-                    ):
-                        if (
-                            "xmlns" in parent.options
-                            and element.options["xmlns"]
-                            != parent.options["xmlns"]
-                        ):
-                            xmlns = ' xmlns="{}"'.format(
-                                element.options["xmlns"]
-                            )
-                            content[0] += xmlns
-                else:
-                    if (
-                        "xmlns" in element.options
-                        and element.options["xmlns"] is not None
-                    ):
-                        xmlns = ' xmlns="{}"'.format(element.options["xmlns"])
-                        content[0] += xmlns
-
-                # content[2] has the value returned by a module (the entire
-                # tag, when multiple is True)
-                if content[2] != "":
-                    if content[1] != "":
-                        raise RendererError(
-                            "ERROR: More values than expected were returned "
-                            "(Module multiple)."
-                        )
-                    xml_string += content[2]
-                else:
-                    xml_string += self._render_xml(
-                        element_name, content[0], content[1]
-                    )
+        Args:
+            element:
+            child:
 
-        return xml_string
+        Returns:
+
+        """
+        content = ["", "", ""]
+
+        # add XML Schema instance prefix if root
+        if self.isRoot:
+            xsi = ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            content[0] += xsi
+            self.isRoot = False
+
+        if child.tag == "complex_type":
+            tmp_content = self.render_complex_type(child)
+            content[0] += tmp_content[0]
+            content[1] += tmp_content[1]
+            content[2] += tmp_content[2]
+        elif child.tag == "input":
+            tmp_content = child.value if child.value is not None else ""
+            content[1] += (
+                XmlEntities().escape_xml_entities(tmp_content)
+                if AUTO_ESCAPE_XML_ENTITIES
+                else tmp_content
+            )
+        elif child.tag == "simple_type":
+            tmp_content = self.render_simple_type(child)
+            content[0] += tmp_content[0]
+            content[1] += tmp_content[1]
+            content[2] += tmp_content[2]
+        elif child.tag == "module":
+            tmp_content = self.render_module(child)
+
+            if child.options["multiple"]:
+                content[2] += tmp_content[1]
+            else:
+                content[1] += tmp_content[1]
+        else:
+            message = "render_element: " + child.tag + " not handled"
+            self.warnings.append(message)
+
+        # namespaces
+        parent = self._get_parent_element(element)
+        if parent is not None:
+            if (
+                "xmlns" in element.options
+                and element.options["xmlns"] is not None
+            ):
+                if (
+                    "xmlns" in parent.options
+                    and element.options["xmlns"] != parent.options["xmlns"]
+                ):
+                    xmlns = ' xmlns="{}"'.format(element.options["xmlns"])
+                    content[0] += xmlns
+        else:
+            if (
+                "xmlns" in element.options
+                and element.options["xmlns"] is not None
+            ):
+                xmlns = ' xmlns="{}"'.format(element.options["xmlns"])
+                content[0] += xmlns
+
+        return content
 
     def render_attribute(self, element):
         """Renders an attribute
@@ -244,9 +426,9 @@ class XmlRenderer(AbstractXmlRenderer):
         attr_list = []
         children = []
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "elem-iter":
-                children += child.children.all().order_by("pk")
+                children += self._get_children(child)
             else:
                 message = (
                     "render_attribute (iteration): "
@@ -334,7 +516,7 @@ class XmlRenderer(AbstractXmlRenderer):
         # XML content: attributes, inner content, outer content
         content = ["", "", ""]
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             tmp_content = ["", "", ""]
 
             # add XML Schema instance prefix if root
@@ -380,9 +562,9 @@ class XmlRenderer(AbstractXmlRenderer):
         content = ["", "", ""]
         children = []
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "sequence-iter":
-                children += child.children.all().order_by("pk")
+                children += self._get_children(child)
             else:
                 message = (
                     "render_sequence (iteration): "
@@ -395,7 +577,7 @@ class XmlRenderer(AbstractXmlRenderer):
             tmp_content = ["", "", ""]
 
             if child.tag == "element":
-                tmp_content[1] += self.render_element(child)
+                tmp_content[1] += self._render_nested_element(child)
             elif child.tag == "sequence":
                 tmp_content = self.render_sequence(child)
             elif child.tag == "choice":
@@ -421,7 +603,7 @@ class XmlRenderer(AbstractXmlRenderer):
         """
         content = ["", "", ""]
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             tmp_content = ["", "", ""]
 
             if child.tag == "extension":
@@ -451,7 +633,7 @@ class XmlRenderer(AbstractXmlRenderer):
         """
         content = ["", "", ""]
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             tmp_content = ["", "", ""]
 
             if child.tag == "extension":
@@ -484,9 +666,9 @@ class XmlRenderer(AbstractXmlRenderer):
         child_keys = []
         choice_values = {}
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             if child.tag == "choice-iter":
-                children[child.pk] = child.children.all().order_by("pk")
+                children[child.pk] = self._get_children(child)
                 child_keys.append(child.pk)
                 choice_values[child.pk] = child.value
             else:
@@ -502,7 +684,7 @@ class XmlRenderer(AbstractXmlRenderer):
                 # FIXME change orders of conditions
                 if child.tag == "element":
                     if str(child.pk) == choice_values[iter_element]:
-                        tmp_content[1] = self.render_element(child)
+                        tmp_content[1] = self._render_nested_element(child)
                 elif child.tag == "sequence":
                     if str(child.pk) == choice_values[iter_element]:
                         tmp_content = self.render_sequence(child)
@@ -577,7 +759,7 @@ class XmlRenderer(AbstractXmlRenderer):
         """
         content = ["", "", ""]
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             tmp_content = ["", "", ""]
 
             if child.tag == "restriction":
@@ -617,7 +799,14 @@ class XmlRenderer(AbstractXmlRenderer):
         content = ["", "", ""]
         value = element.value
 
-        for child in element.children.all().order_by("pk"):
+        # the selected value is rendered, the enumeration is not loaded
+        if element.options.get("enumeration") is not None:
+            content[1] = value if value is not None else ""
+            if AUTO_ESCAPE_XML_ENTITIES:
+                content[1] = XmlEntities().escape_xml_entities(content[1])
+            return content
+
+        for child in self._get_children(element):
             tmp_content = ["", "", ""]
 
             if child.tag == "enumeration":
@@ -656,7 +845,7 @@ class XmlRenderer(AbstractXmlRenderer):
         """
         content = ["", "", ""]
 
-        for child in element.children.all().order_by("pk"):
+        for child in self._get_children(element):
             tmp_content = ["", "", ""]
 
             if child.tag == "input":
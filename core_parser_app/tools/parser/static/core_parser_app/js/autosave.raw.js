@@ -1 +1,2 @@
-var dataStructureElementUrl = "{% url 'core_parser_app_data_structure_element_value' %}";
\ No newline at end of file
+var dataStructureElementUrl = "{% url 'core_parser_app_data_structure_element_value' %}";
+var dataStructureElementEnumerationUrl = "{% url 'core_parser_app_data_structure_element_enumeration' %}";
\ No newline at end of file
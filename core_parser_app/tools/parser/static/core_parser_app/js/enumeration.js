@@ -0,0 +1,49 @@
+(function() {
+    "use strict";
+
+    // delay before searching, in milliseconds
+    var searchDelay = 300;
+
+    // Replace the options of a restriction by the values starting with the
+    // searched prefix, keeping the selected value
+    var searchEnumeration = function($input) {
+        var $select = $('#' + $input.data('select-id'));
+        var selectedValue = $select.val();
+
+        $.ajax({
+            'url': dataStructureElementEnumerationUrl,
+            'type': 'GET',
+            'dataType': 'json',
+            'data': {
+                'id': $select.attr('id'),
+                'prefix': $input.val(),
+                'page': 1
+            },
+            success: function(data) {
+                $select.empty();
+                if (selectedValue !== null && data.values.indexOf(selectedValue) === -1) {
+                    $select.append($('<option>').val(selectedValue).text(selectedValue));
+                }
+                $.each(data.values, function(index, value) {
+                    $select.append($('<option>').val(value).text(value));
+                });
+                if (data.has_next) {
+                    $select.append($('<option>').prop('disabled', true).text('...'));
+                }
+                $select.val(selectedValue);
+            },
+            error: function() {
+                console.error('An error occurred when searching element ' + $select.attr('id'));
+            }
+        });
+    };
+
+    var searchTimeout = null;
+    $(document).on('input', 'input.enumeration-search-input', function() {
+        var $input = $(this);
+        clearTimeout(searchTimeout);
+        searchTimeout = setTimeout(function() {
+            searchEnumeration($input);
+        }, searchDelay);
+    });
+})();
@@ -0,0 +1,115 @@
+"""Cache utils
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU cache, with an optional time-to-live on entries"""
+
+    def __init__(self, max_size, ttl=None):
+        """Initialize the cache
+
+        Args:
+            max_size: maximum number of entries (0 disables the cache)
+            ttl: number of seconds an entry stays fresh (None: no expiry)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value of a fresh entry, None otherwise
+
+        Args:
+            key:
+
+        Returns:
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._is_expired(entry):
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def peek(self, key):
+        """Return the value of an entry, even expired, without updating the
+        statistics or the order of the entries
+
+        Args:
+            key:
+
+        Returns:
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+
+    def set(self, key, value):
+        """Add or refresh an entry, evict the least recently used entries
+
+        Args:
+            key:
+            value:
+
+        Returns:
+
+        """
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and reset the statistics
+
+        Returns:
+
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Return the statistics of the cache
+
+        Returns:
+
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+    def _is_expired(self, entry):
+        """Check if an entry is expired
+
+        Args:
+            entry:
+
+        Returns:
+
+        """
+        return self.ttl is not None and time.monotonic() - entry[0] > self.ttl
@@ -4,10 +4,13 @@
 import logging
 from urllib.parse import urlparse
 
+from lxml import etree
+
 from xml_utils.commons.constants import LXML_SCHEMA_NAMESPACE
 
-from core_parser_app.components.module import api as module_api
-from core_parser_app.settings import MODULE_TAG_NAME
+from core_parser_app.components.module import registry as module_registry
+from core_parser_app.settings import MODULE_TAG_NAME, PARSER_XPATH_CACHE_SIZE
+from core_parser_app.tools.parser.utils.cache import LRUCache
 
 
 logger = logging.getLogger(__name__)
@@ -21,23 +24,68 @@ APP_INFO_OPTIONS = [
     MODULE_TAG_NAME,
 ]
 
+APP_INFO_PATH = "./{0}annotation/{0}appinfo".format(LXML_SCHEMA_NAMESPACE)
+ANNOTATION_PATH = "./{0}annotation".format(LXML_SCHEMA_NAMESPACE)
+
+# compiled XPath expressions, by expression and namespaces
+XPATH_CACHE = LRUCache(PARSER_XPATH_CACHE_SIZE)
+
+
+def get_compiled_xpath(expression, namespaces=None):
+    """Return the compiled XPath of an expression, compile it on first access
+
+    Args:
+        expression:
+        namespaces:
+
+    Returns:
+
+    """
+    key = (
+        expression,
+        tuple(sorted(namespaces.items())) if namespaces else (),
+    )
+    compiled_xpath = XPATH_CACHE.get(key)
+    if compiled_xpath is None:
+        compiled_xpath = etree.XPath(expression, namespaces=namespaces)
+        XPATH_CACHE.set(key, compiled_xpath)
+
+    return compiled_xpath
 
-def get_app_info_options(element):
+
+def evaluate_xpath(xml_tree, expression, namespaces=None):
+    """Evaluate an XPath expression on an XML tree or element, with a compiled
+    XPath from the cache
+
+    Args:
+        xml_tree:
+        expression:
+        namespaces:
+
+    Returns:
+
+    """
+    return get_compiled_xpath(expression, namespaces)(xml_tree)
+
+
+def get_app_info_options(element, parser_context=None):
     """Gets app info options of the element if present. Options are specific to the parser
 
     Args:
         element:
+        parser_context: context of the parse, to read the options once per element
 
     Returns:
 
     """
+    if parser_context is not None:
+        return parser_context.get_app_info_options(element)
+
     # Initialize dictionary to return
     app_info = {}
 
     # Get app info of the element
-    app_info_elements = element.findall(
-        "./{0}annotation/{0}appinfo".format(LXML_SCHEMA_NAMESPACE)
-    )
+    app_info_elements = element.findall(APP_INFO_PATH)
     # Browse the app info
     for app_info_element in app_info_elements:
         # get the elements in the app info
@@ -62,9 +110,7 @@ def delete_annotations(element):
     Returns:
 
     """
-    annotations = element.findall(
-        "./{0}annotation".format(LXML_SCHEMA_NAMESPACE)
-    )
+    annotations = element.findall(ANNOTATION_PATH)
     for annotation in annotations:
         element.remove(annotation)
 
@@ -121,17 +167,18 @@ def get_attribute_occurrences(element):
     return min_occurs, max_occurs
 
 
-def get_module_url(element):
+def get_module_url(element, parser_context=None):
     """Gets url of the module attached to element
 
     Args:
         element:
+        parser_context:
 
     Returns:
 
     """
     # get the app info of the element
-    app_info = get_app_info_options(element)
+    app_info = get_app_info_options(element, parser_context)
 
     # check if a module is set for this element
     if MODULE_TAG_NAME in app_info:
@@ -145,7 +192,7 @@ def get_module_url(element):
         url_path = parsed_url.path
 
         # check that the url is registered in the system
-        if url_path in module_api.get_all_urls():
+        if url_path in module_registry.get_registry():
             return parsed_url
 
     return None
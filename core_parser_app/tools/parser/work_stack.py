@@ -0,0 +1,85 @@
+"""Explicit work stack of the generation steps of the parser
+"""
+
+from functools import wraps
+from inspect import isgenerator
+
+
+def generation_step(step_function):
+    """Make a generator method of the parser a generation step: the steps it
+    yields are run on the work stack of the parser, and their results are
+    sent back to it. Outside a generation, calling the step runs it to the
+    end and returns its result.
+
+    Args:
+        step_function: generator method, yielding the steps it depends on
+
+    Returns:
+
+    """
+
+    @wraps(step_function)
+    def run_step(parser, *args, **kwargs):
+        """Return the step to the running step that yields it, or run it
+
+        Args:
+            parser:
+            args:
+            kwargs:
+
+        Returns:
+
+        """
+        step = step_function(parser, *args, **kwargs)
+        if parser.work_stack is not None:
+            return step
+
+        parser.work_stack = [step]
+        try:
+            return run_work_stack(parser.work_stack)
+        finally:
+            parser.work_stack = None
+
+    return run_step
+
+
+def run_work_stack(work_stack):
+    """Run the steps of a work stack, the top step first, and return the
+    result of the bottom step. An exception raised by a step is thrown into
+    the step that yielded it. A yielded value that is not a step (e.g. the
+    result of a patched method) is sent back as it is.
+
+    Args:
+        work_stack: list of started or new steps
+
+    Returns:
+
+    """
+    result = None
+    exception = None
+    while True:
+        step = work_stack[-1]
+        try:
+            if exception is not None:
+                step_exception, exception = exception, None
+                next_step = step.throw(step_exception)
+            else:
+                next_step = step.send(result)
+        except StopIteration as stop:
+            work_stack.pop()
+            if len(work_stack) == 0:
+                return stop.value
+            result = stop.value
+            continue
+        except Exception as step_exception:
+            work_stack.pop()
+            if len(work_stack) == 0:
+                raise
+            exception = step_exception
+            continue
+
+        if isgenerator(next_step):
+            work_stack.append(next_step)
+            result = None
+        else:
+            result = next_step
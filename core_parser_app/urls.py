@@ -16,6 +16,11 @@ urlpatterns = [
         user_ajax.data_structure_element_value,
         name="core_parser_app_data_structure_element_value",
     ),
+    re_path(
+        r"^data-structure-element/enumeration",
+        user_ajax.data_structure_element_enumeration,
+        name="core_parser_app_data_structure_element_enumeration",
+    ),
     re_path(
         r"^template/modules/(?P<pk>\w+)",
         common_views.ManageModulesUserView.as_view(
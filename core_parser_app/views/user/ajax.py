@@ -11,6 +11,7 @@ from core_main_app.commons.exceptions import DoesNotExist
 from core_parser_app.components.data_structure_element import (
     api as data_structure_element_api,
 )
+from core_parser_app.components.enumeration import api as enumeration_api
 
 
 @login_required
@@ -90,3 +91,46 @@ def save_data_structure_element_value(request):
         )
     except (AccessControlError, DoesNotExist) as exc:
         return HttpResponseBadRequest(json.dumps({"message": str(exc)}))
+
+
+@login_required
+def data_structure_element_enumeration(request):
+    """Endpoint for the enumeration values of a restriction, searched by
+    prefix and returned by page
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    if "id" not in request.GET:
+        return HttpResponseBadRequest()
+
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        return HttpResponseBadRequest()
+    if page < 1:
+        return HttpResponseBadRequest()
+
+    try:
+        element = data_structure_element_api.get_by_id(
+            request.GET["id"], request
+        )
+        enumeration_hash = element.options.get("enumeration")
+        if element.tag != "restriction" or enumeration_hash is None:
+            return HttpResponseBadRequest(
+                json.dumps({"message": "Element has no enumeration."})
+            )
+
+        values, has_next = enumeration_api.get_values_page(
+            enumeration_hash, prefix=request.GET.get("prefix", ""), page=page
+        )
+
+        return HttpResponse(
+            json.dumps({"values": values, "page": page, "has_next": has_next}),
+            content_type="application/json",
+        )
+    except (AccessControlError, DoesNotExist) as exc:
+        return HttpResponseBadRequest(json.dumps({"message": str(exc)}))
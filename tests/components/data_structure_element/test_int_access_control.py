@@ -3,8 +3,10 @@
 
 from unittest.mock import Mock
 
-from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import connection
 from django.http import HttpRequest
+from django.test.utils import CaptureQueriesContext
 
 from core_main_app.access_control.exceptions import AccessControlError
 from core_main_app.commons.exceptions import DoesNotExist
@@ -13,6 +15,7 @@ from core_main_app.utils.integration_tests.integration_base_test_case import (
 )
 from core_parser_app.access_control import (
     _check_data_structure_elements_access,
+    _check_data_structure_element_queryset_access,
 )
 from core_parser_app.components.data_structure.models import (
     DataStructureElement,
@@ -450,6 +453,92 @@ class TestAddChild(IntegrationBaseTestCase):
         )
 
 
+class TestDeleteBranch(IntegrationBaseTestCase):
+    """Test Delete Branch"""
+
+    def setUp(self):
+        """setUp"""
+
+        self.fixtures = DataStructureElementFixtures()
+        self.fixtures.insert_data(user=self.fixtures.default_owner_with_perm)
+
+        self.users = {
+            "anon": AnonymousUser(),
+            "user": self.fixtures.other_user_with_perm,
+            "owner": self.fixtures.default_owner_with_perm,
+            "superuser": self.fixtures.superuser,
+        }
+
+        self.mock_request = Mock(spec=HttpRequest)
+
+    def test_anonymous_cannot_perform_operation(self):
+        """test_anonymous_cannot_perform_operation"""
+
+        self.mock_request.user = self.users["anon"]
+
+        with self.assertRaises(AccessControlError):
+            data_structure_element_api.delete_branch(
+                self.fixtures.data_structure_element_collection["1000"],
+                self.mock_request,
+            )
+
+    def test_user_not_owner_cannot_perform_operation(self):
+        """test_user_not_owner_cannot_perform_operation"""
+
+        self.mock_request.user = self.users["user"]
+
+        with self.assertRaises(AccessControlError):
+            data_structure_element_api.delete_branch(
+                self.fixtures.data_structure_element_collection["1000"],
+                self.mock_request,
+            )
+
+    def test_user_not_owner_of_descendant_cannot_perform_operation(self):
+        """test_user_not_owner_of_descendant_cannot_perform_operation"""
+
+        data_structure_element = (
+            self.fixtures.data_structure_element_collection["1121"]
+        )
+        data_structure_element.user = str(self.users["user"].id)
+        data_structure_element.save()
+        self.mock_request.user = self.users["owner"]
+
+        with self.assertRaises(AccessControlError):
+            data_structure_element_api.delete_branch(
+                self.fixtures.data_structure_element_collection["1000"],
+                self.mock_request,
+            )
+        self.assertTrue(
+            DataStructureElement.objects.filter(
+                pk=data_structure_element.pk
+            ).exists()
+        )
+
+    def test_owner_can_perform_operation(self):
+        """test_owner_can_perform_operation"""
+
+        self.mock_request.user = self.users["owner"]
+
+        result = data_structure_element_api.delete_branch(
+            self.fixtures.data_structure_element_collection["1000"],
+            self.mock_request,
+        )
+
+        self.assertEqual(result, 6)
+
+    def test_superuser_can_perform_operation(self):
+        """test_superuser_can_perform_operation"""
+
+        self.mock_request.user = self.users["superuser"]
+
+        result = data_structure_element_api.delete_branch(
+            self.fixtures.data_structure_element_collection["1000"],
+            self.mock_request,
+        )
+
+        self.assertEqual(result, 6)
+
+
 class TestGetRootElement(IntegrationBaseTestCase):
     """Test Get Root Element"""
 
@@ -608,3 +697,76 @@ class TestDataStructureElementPermissionWithoutOwnersWithoutPerm(
                 [self.fixtures.data_structure_element_collection["root"]],
                 AnonymousUser(),
             )
+
+
+class TestDataStructureElementAccessQueries(IntegrationBaseTestCase):
+    """Test the number of queries of the access to data structure elements"""
+
+    def setUp(self):
+        """setUp"""
+
+        self.fixtures = DataStructureElementFixtures()
+        self.fixtures.insert_data(user=self.fixtures.default_owner_with_perm)
+        self.owner = self.fixtures.default_owner_with_perm
+
+    def _get_elements(self):
+        """Return the elements of the data structure, loaded from the database"""
+        return list(
+            DataStructureElement.objects.filter(
+                data_structure=self.fixtures.data_structure
+            )
+        )
+
+    def test_access_queries_do_not_depend_on_number_of_elements(self):
+        """test_access_queries_do_not_depend_on_number_of_elements"""
+        data_structure_element_list = self._get_elements()[:1]
+        with CaptureQueriesContext(connection) as context:
+            _check_data_structure_elements_access(
+                data_structure_element_list, self.owner
+            )
+        self.owner = User.objects.get(pk=self.owner.pk)
+        data_structure_element_list = self._get_elements()
+
+        with self.assertNumQueries(len(context.captured_queries)):
+            _check_data_structure_elements_access(
+                data_structure_element_list, self.owner
+            )
+
+    def test_anonymous_group_permissions_are_queried_once_by_user(self):
+        """test_anonymous_group_permissions_are_queried_once_by_user"""
+        anonymous_user = AnonymousUser()
+        permissions = {}
+        with self.assertRaises(AccessControlError):
+            _check_data_structure_elements_access(
+                self._get_elements(), anonymous_user, permissions
+            )
+
+        data_structure_element_list = self._get_elements()[:1]
+
+        # data structure permission and anonymous permissions are cached
+        with self.assertNumQueries(0):
+            with self.assertRaises(AccessControlError):
+                _check_data_structure_elements_access(
+                    data_structure_element_list, anonymous_user, permissions
+                )
+
+    def test_queryset_access_is_checked_without_loading_elements(self):
+        """test_queryset_access_is_checked_without_loading_elements"""
+        queryset = DataStructureElement.objects.filter(
+            data_structure=self.fixtures.data_structure
+        )
+
+        _check_data_structure_element_queryset_access(queryset, self.owner)
+
+        self.assertIsNone(queryset._result_cache)
+
+    def test_queryset_access_of_other_owner_raises_acl_error(self):
+        """test_queryset_access_of_other_owner_raises_acl_error"""
+        queryset = DataStructureElement.objects.filter(
+            data_structure=self.fixtures.data_structure
+        )
+
+        with self.assertRaises(AccessControlError):
+            _check_data_structure_element_queryset_access(
+                queryset, self.fixtures.other_user_with_perm
+            )
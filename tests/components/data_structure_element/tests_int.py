@@ -5,6 +5,12 @@ from unittest.mock import Mock
 
 from django.http import HttpRequest
 
+from core_parser_app.components.data_structure.models import (
+    DataStructureElement,
+    PATH_MAX_LENGTH,
+    XPATH_INDEX_LENGTH,
+)
+
 from core_main_app.commons import exceptions
 from core_main_app.utils.integration_tests.integration_base_test_case import (
     IntegrationBaseTestCase,
@@ -12,6 +18,7 @@ from core_main_app.utils.integration_tests.integration_base_test_case import (
 from core_parser_app.components.data_structure_element import (
     api as data_structure_element_api,
 )
+from core_parser_app.system import api as system_api
 from tests.components.data_structure_element.fixtures.fixtures import (
     DataStructureElementFixtures,
 )
@@ -97,6 +104,66 @@ class TestDataStructureElementGetByXpath(IntegrationBaseTestCase):
         # Act
         self.assertEqual(result.count(), 0)
 
+    def test_data_get_by_xpath_restricted_to_data_structure(self):
+        """test_data_get_by_xpath_restricted_to_data_structure"""
+        element = self.fixtures.data_structure_element_collection["1121"]
+
+        result = data_structure_element_api.get_by_xpath(
+            element.options["xpath"]["xml"],
+            self.mock_request,
+            data_structure_id=self.fixtures.data_structure.id,
+        )
+        other_result = data_structure_element_api.get_by_xpath(
+            element.options["xpath"]["xml"],
+            self.mock_request,
+            data_structure_id=self.fixtures.data_structure.id + 1,
+        )
+
+        self.assertEqual(list(result), [element])
+        self.assertEqual(other_result.count(), 0)
+
+    def test_data_get_by_xpath_uses_updated_options(self):
+        """test_data_get_by_xpath_uses_updated_options"""
+        element = self.fixtures.data_structure_element_collection["1121"]
+        element.options["xpath"]["xml"] = "new_xpath_value"
+        data_structure_element_api.upsert(element, self.mock_request)
+
+        result = data_structure_element_api.get_by_xpath(
+            "new_xpath_value", self.mock_request
+        )
+
+        self.assertEqual(list(result), [element])
+
+    def test_data_get_by_xpath_uses_bulk_updated_options(self):
+        """test_data_get_by_xpath_uses_bulk_updated_options"""
+        element = self.fixtures.data_structure_element_collection["1121"]
+        element.options["xpath"]["xml"] = "new_xpath_value"
+        data_structure_element_api.bulk_update(
+            [element], ["options"], self.mock_request
+        )
+
+        result = data_structure_element_api.get_by_xpath(
+            "new_xpath_value", self.mock_request
+        )
+
+        self.assertEqual(list(result), [element])
+
+    def test_data_get_by_xpath_matches_whole_long_xpath(self):
+        """test_data_get_by_xpath_matches_whole_long_xpath"""
+        prefix = "/ns:root" * XPATH_INDEX_LENGTH
+        elements = []
+        for name in ["1121", "1200"]:
+            element = self.fixtures.data_structure_element_collection[name]
+            element.options["xpath"] = {"xml": f"{prefix}/ns:leaf_{name}"}
+            data_structure_element_api.upsert(element, self.mock_request)
+            elements.append(element)
+
+        result = data_structure_element_api.get_by_xpath(
+            f"{prefix}/ns:leaf_1200", self.mock_request
+        )
+
+        self.assertEqual(list(result), elements[1:])
+
 
 class TestDataStructureElementGetRootElement(IntegrationBaseTestCase):
     """Test Data Structure Element Get Root Element"""
@@ -176,3 +243,264 @@ class TestDataStructureElementGetRootElement(IntegrationBaseTestCase):
             self.assertEqual(
                 result, self.fixtures.data_structure_element_collection["root"]
             )
+
+
+class TestDataStructureElementDeleteBranch(IntegrationBaseTestCase):
+    """Test Data Structure Element Delete Branch"""
+
+    def setUp(self):
+        """setUp"""
+
+        self.fixtures = DataStructureElementFixtures()
+        self.fixtures.insert_data()
+        self.mock_request = Mock(spec=HttpRequest)
+        self.mock_request.user = self.fixtures.default_owner_with_perm
+
+    def test_delete_branch_deletes_element_and_descendants(self):
+        """test_delete_branch_deletes_element_and_descendants"""
+        collection = self.fixtures.data_structure_element_collection
+
+        deleted_count = data_structure_element_api.delete_branch(
+            collection["1000"], self.mock_request
+        )
+
+        self.assertEqual(deleted_count, 6)
+        self.assertEqual(
+            set(DataStructureElement.objects.values_list("pk", flat=True)),
+            {collection["root"].pk, collection["2000"].pk},
+        )
+
+    def test_delete_branch_of_leaf_deletes_leaf(self):
+        """test_delete_branch_of_leaf_deletes_leaf"""
+        collection = self.fixtures.data_structure_element_collection
+
+        deleted_count = data_structure_element_api.delete_branch(
+            collection["1121"], self.mock_request
+        )
+
+        self.assertEqual(deleted_count, 1)
+        self.assertEqual(collection["1120"].children.count(), 0)
+
+    def test_delete_branch_queries_do_not_depend_on_branch_width(self):
+        """test_delete_branch_queries_do_not_depend_on_branch_width"""
+        element_1200 = self.fixtures.data_structure_element_collection["1200"]
+        DataStructureElement.bulk_create(
+            [
+                DataStructureElement(
+                    user=self.fixtures.default_user_id,
+                    tag="tag",
+                    parent=element_1200,
+                    data_structure=self.fixtures.data_structure,
+                )
+                for _ in range(100)
+            ]
+        )
+
+        with self.assertNumQueries(10):
+            deleted_count = system_api.delete_branch_from_db(
+                str(self.fixtures.data_structure_element_collection["1000"].pk)
+            )
+
+        self.assertEqual(deleted_count, 106)
+
+    def test_system_delete_branch_raises_does_not_exist_if_not_found(self):
+        """test_system_delete_branch_raises_does_not_exist_if_not_found"""
+        with self.assertRaises(exceptions.DoesNotExist):
+            system_api.delete_branch_from_db(-1)
+
+
+class TestDataStructureElementPath(IntegrationBaseTestCase):
+    """Test Data Structure Element Path"""
+
+    def setUp(self):
+        """setUp"""
+
+        self.fixtures = DataStructureElementFixtures()
+        self.fixtures.insert_data()
+        self.collection = self.fixtures.data_structure_element_collection
+        self.mock_request = Mock(spec=HttpRequest)
+        self.mock_request.user = self.fixtures.default_owner_with_perm
+
+    def _get_branch_tags(self, data_structure_element):
+        """Return the tags of the branch of an element, from the database"""
+        data_structure_element.refresh_from_db()
+        return [
+            element.tag
+            for element in DataStructureElement.get_branch(
+                data_structure_element
+            )
+        ]
+
+    def test_saved_element_path_extends_parent_path(self):
+        """test_saved_element_path_extends_parent_path"""
+        for child, parent in [("1100", "1000"), ("1121", "1120")]:
+            self.assertEqual(
+                self.collection[child].path,
+                self.collection[parent].path
+                + DataStructureElement.get_path_segment(
+                    self.collection[child].pk
+                ),
+            )
+
+    def test_get_branch_returns_elements_in_document_order(self):
+        """test_get_branch_returns_elements_in_document_order"""
+        self.assertEqual(
+            self._get_branch_tags(self.collection["1000"]),
+            [
+                "tag_1000",
+                "tag_1100",
+                "tag_1110",
+                "tag_1120",
+                "tag_1121",
+                "tag_1200",
+            ],
+        )
+
+    def test_add_child_moves_paths_of_branch(self):
+        """test_add_child_moves_paths_of_branch"""
+        data_structure_element_api.add_child(
+            self.collection["2000"], self.collection["1100"], self.mock_request
+        )
+
+        self.assertEqual(
+            self._get_branch_tags(self.collection["2000"]),
+            ["tag_2000", "tag_1100", "tag_1110", "tag_1120", "tag_1121"],
+        )
+        self.assertEqual(
+            self._get_branch_tags(self.collection["1000"]),
+            ["tag_1000", "tag_1200"],
+        )
+
+    def test_remove_child_makes_branch_a_tree(self):
+        """test_remove_child_makes_branch_a_tree"""
+        data_structure_element_api.remove_child(
+            self.collection["1000"], self.collection["1100"], self.mock_request
+        )
+
+        self.assertEqual(
+            self._get_branch_tags(self.collection["1100"]),
+            ["tag_1100", "tag_1110", "tag_1120", "tag_1121"],
+        )
+        self.assertEqual(
+            self.collection["1100"].path,
+            DataStructureElement.get_path_segment(self.collection["1100"].pk),
+        )
+
+    def _get_branch_paths(self, data_structure_element):
+        """Return the paths of the branch of an element, by tag"""
+        return {
+            tag: path
+            for tag, path in DataStructureElement.objects.filter(
+                pk__in=[
+                    values[0]
+                    for values in DataStructureElement.get_branch_values(
+                        data_structure_element.pk
+                    )
+                ]
+            ).values_list("tag", "path")
+        }
+
+    def _add_child_at_depth(self, parent, child, parent_path_length):
+        """Add a child to a parent, whose path is replaced by a path of the
+        given length"""
+        DataStructureElement.objects.filter(pk=parent.pk).update(
+            path="1" * parent_path_length
+        )
+        parent.refresh_from_db()
+        data_structure_element_api.add_child(parent, child, self.mock_request)
+
+    def test_build_path_longer_than_max_length_sets_no_path(self):
+        """test_build_path_longer_than_max_length_sets_no_path"""
+        self.collection["1100"].build_path("1" * PATH_MAX_LENGTH)
+
+        self.assertIsNone(self.collection["1100"].path)
+
+    def test_add_child_too_deep_for_paths_keeps_branch(self):
+        """test_add_child_too_deep_for_paths_keeps_branch"""
+        self._add_child_at_depth(
+            self.collection["2000"], self.collection["1100"], PATH_MAX_LENGTH
+        )
+
+        self.assertEqual(
+            self._get_branch_tags(self.collection["2000"]),
+            ["tag_2000", "tag_1100", "tag_1110", "tag_1120", "tag_1121"],
+        )
+        self.assertEqual(
+            set(self._get_branch_paths(self.collection["1100"]).values()),
+            {None},
+        )
+        self.assertEqual(
+            DataStructureElement.delete_branch(self.collection["2000"].pk), 5
+        )
+
+    def test_deep_branch_is_indexed_again_when_moved_up(self):
+        """test_deep_branch_is_indexed_again_when_moved_up"""
+        self._add_child_at_depth(
+            self.collection["2000"], self.collection["1100"], PATH_MAX_LENGTH
+        )
+
+        data_structure_element_api.remove_child(
+            self.collection["2000"], self.collection["1100"], self.mock_request
+        )
+
+        paths = self._get_branch_paths(self.collection["1100"])
+        self.assertEqual(
+            paths["tag_1121"],
+            paths["tag_1120"]
+            + DataStructureElement.get_path_segment(
+                self.collection["1121"].pk
+            ),
+        )
+        self.assertEqual(
+            self._get_branch_tags(self.collection["1100"]),
+            ["tag_1100", "tag_1110", "tag_1120", "tag_1121"],
+        )
+
+    def test_children_of_deepest_indexed_element_are_indexed_when_moved_up(
+        self,
+    ):
+        """test_children_of_deepest_indexed_element_are_indexed_when_moved_up"""
+        segment_length = len(
+            DataStructureElement.get_path_segment(self.collection["1100"].pk)
+        )
+        self._add_child_at_depth(
+            self.collection["2000"],
+            self.collection["1100"],
+            PATH_MAX_LENGTH - segment_length,
+        )
+        paths = self._get_branch_paths(self.collection["1100"])
+        self.assertIsNotNone(paths["tag_1100"])
+        self.assertIsNone(paths["tag_1110"])
+
+        data_structure_element_api.remove_child(
+            self.collection["2000"], self.collection["1100"], self.mock_request
+        )
+
+        paths = self._get_branch_paths(self.collection["1100"])
+        self.assertEqual(
+            paths["tag_1110"],
+            paths["tag_1100"]
+            + DataStructureElement.get_path_segment(
+                self.collection["1110"].pk
+            ),
+        )
+        self.assertEqual(
+            paths["tag_1121"],
+            paths["tag_1120"]
+            + DataStructureElement.get_path_segment(
+                self.collection["1121"].pk
+            ),
+        )
+
+    def test_save_with_new_parent_moves_paths_of_branch(self):
+        """test_save_with_new_parent_moves_paths_of_branch"""
+        element = DataStructureElement.objects.get(
+            pk=self.collection["1120"].pk
+        )
+        element.parent = self.collection["1200"]
+        element.save()
+
+        self.assertEqual(
+            self._get_branch_tags(self.collection["1200"]),
+            ["tag_1200", "tag_1120", "tag_1121"],
+        )
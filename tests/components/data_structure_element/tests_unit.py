@@ -140,3 +140,21 @@ class TestDataStructureElementUpsert(TestCase):
 
         # Assert
         self.assertIsInstance(result, DataStructureElement)
+
+
+class TestDataStructureElementGetPathSegment(TestCase):
+    """Test Data Structure Element Get Path Segment"""
+
+    def test_segments_sort_like_ids(self):
+        """test_segments_sort_like_ids"""
+        ids = [1, 9, 10, 35, 36, 1295, 1296, 2**31 - 1, 2**31, 2**63 - 1]
+
+        segments = [DataStructureElement.get_path_segment(id) for id in ids]
+
+        self.assertEqual(segments, sorted(segments))
+
+    def test_segment_of_a_32_bits_id_is_7_characters_long(self):
+        """test_segment_of_a_32_bits_id_is_7_characters_long"""
+        self.assertEqual(
+            len(DataStructureElement.get_path_segment(2**31 - 1)), 7
+        )
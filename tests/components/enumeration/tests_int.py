@@ -0,0 +1,87 @@
+""" Integration tests of the enumeration api
+"""
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.enumeration import api as enumeration_api
+from core_parser_app.components.enumeration.models import Enumeration
+
+
+class TestEnumerationBulkGetOrCreate(IntegrationBaseTestCase):
+    """Test Enumeration Bulk Get Or Create"""
+
+    def setUp(self):
+        """setUp"""
+        self.values = ["m", "cm"]
+
+    def test_bulk_get_or_create_saves_values_once(self):
+        """test_bulk_get_or_create_saves_values_once"""
+        enumeration_hash = enumeration_api.get_hash(self.values)
+
+        for _ in range(2):
+            enumeration_api.bulk_get_or_create({enumeration_hash: self.values})
+
+        self.assertEqual(Enumeration.objects.count(), 1)
+        self.assertEqual(
+            enumeration_api.get_values_by_hashes([enumeration_hash]),
+            {enumeration_hash: self.values},
+        )
+
+    def test_hash_depends_on_values_order(self):
+        """test_hash_depends_on_values_order"""
+        self.assertNotEqual(
+            enumeration_api.get_hash(self.values),
+            enumeration_api.get_hash(self.values[::-1]),
+        )
+
+
+class TestEnumerationGetValuesByHashes(IntegrationBaseTestCase):
+    """Test Enumeration Get Values By Hashes"""
+
+    def setUp(self):
+        """setUp"""
+        enumeration_api.bulk_get_or_create(
+            {enumeration_api.get_hash(["m"]): ["m"]}
+        )
+
+    def test_get_values_by_hashes_ignores_unknown_hashes(self):
+        """test_get_values_by_hashes_ignores_unknown_hashes"""
+        self.assertEqual(enumeration_api.get_values_by_hashes(["hash"]), {})
+
+
+class TestEnumerationGetValuesPage(IntegrationBaseTestCase):
+    """Test Enumeration Get Values Page"""
+
+    def setUp(self):
+        """setUp"""
+        values = ["ma", "n", "Mb", "mc"]
+        self.enumeration_hash = enumeration_api.get_hash(values)
+        enumeration_api.bulk_get_or_create({self.enumeration_hash: values})
+
+    def test_get_values_page_returns_values_with_prefix_in_order(self):
+        """test_get_values_page_returns_values_with_prefix_in_order"""
+        self.assertEqual(
+            enumeration_api.get_values_page(
+                self.enumeration_hash, prefix="m", page_size=2
+            ),
+            (["ma", "Mb"], True),
+        )
+
+    def test_get_values_page_ignores_prefix_case(self):
+        """test_get_values_page_ignores_prefix_case"""
+        self.assertEqual(
+            enumeration_api.get_values_page(
+                self.enumeration_hash, prefix="M", page_size=3
+            ),
+            (["ma", "Mb", "mc"], False),
+        )
+
+    def test_get_values_page_returns_last_page(self):
+        """test_get_values_page_returns_last_page"""
+        self.assertEqual(
+            enumeration_api.get_values_page(
+                self.enumeration_hash, prefix="m", page=2, page_size=2
+            ),
+            (["mc"], False),
+        )
@@ -0,0 +1,117 @@
+""" Integration tests of the form skeleton api
+"""
+
+from core_main_app.components.template.models import Template
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.form_skeleton import api as form_skeleton_api
+from core_parser_app.components.form_skeleton.models import FormSkeleton
+from core_parser_app.components.module.models import Module
+from core_parser_app.tools.parser.node import FormNode, FormXPath
+
+
+def _save_form(
+    template_id, parser_options, has_modules=False, access_scope=""
+):
+    """Save a form skeleton for a template"""
+    form_skeleton_api.save_form(
+        template_id,
+        "hash",
+        access_scope,
+        parser_options,
+        FormNode(
+            "element",
+            options={"name": "a", "xpath": FormXPath(None, "/a")},
+            children=[FormNode("elem-iter", children=[])],
+        ),
+        {"key": {"xpath": "/a"}},
+        {},
+        has_modules=has_modules,
+    )
+
+
+class TestFormSkeletonApi(IntegrationBaseTestCase):
+    """Test Form Skeleton Api"""
+
+    def setUp(self):
+        """setUp"""
+        self.template = Template(
+            filename="template.xsd", content="<schema/>", hash="hash"
+        )
+        self.template.save()
+
+    def test_get_form_returns_saved_form(self):
+        """test_get_form_returns_saved_form"""
+        _save_form(self.template.pk, "options")
+
+        form_root, keys, keyrefs = form_skeleton_api.get_form(
+            self.template.pk, "hash", "", "options"
+        )
+
+        self.assertDictEqual(
+            form_root.to_dict(),
+            {
+                "tag": "element",
+                "value": None,
+                "options": {
+                    "name": "a",
+                    "xpath": {"xsd": None, "xml": "/a"},
+                },
+                "children": [
+                    {"tag": "elem-iter", "value": None, "children": []}
+                ],
+            },
+        )
+        self.assertEqual(keys, {"key": {"xpath": "/a"}})
+        self.assertEqual(keyrefs, {})
+
+    def test_get_form_with_other_options_returns_none(self):
+        """test_get_form_with_other_options_returns_none"""
+        _save_form(self.template.pk, "options")
+
+        self.assertIsNone(
+            form_skeleton_api.get_form(self.template.pk, "hash", "", "other")
+        )
+
+    def test_get_form_of_other_access_scope_returns_none(self):
+        """test_get_form_of_other_access_scope_returns_none"""
+        _save_form(self.template.pk, "options", access_scope="1")
+
+        self.assertIsNone(
+            form_skeleton_api.get_form(self.template.pk, "hash", "", "options")
+        )
+        self.assertIsNone(
+            form_skeleton_api.get_form(
+                self.template.pk, "hash", "2", "options"
+            )
+        )
+
+    def test_save_form_twice_keeps_one_skeleton(self):
+        """test_save_form_twice_keeps_one_skeleton"""
+        for _ in range(2):
+            _save_form(self.template.pk, "options")
+
+        self.assertEqual(FormSkeleton.objects.count(), 1)
+
+    def test_save_template_deletes_its_skeletons(self):
+        """test_save_template_deletes_its_skeletons"""
+        _save_form(self.template.pk, "options")
+
+        self.template.save()
+
+        self.assertEqual(FormSkeleton.objects.count(), 0)
+
+    def test_save_module_deletes_skeletons_with_modules(self):
+        """test_save_module_deletes_skeletons_with_modules"""
+        _save_form(self.template.pk, "modules", has_modules=True)
+        _save_form(self.template.pk, "options")
+
+        Module(name="module", url="/module", view="module.view").save()
+
+        self.assertEqual(
+            list(
+                FormSkeleton.objects.values_list("parser_options", flat=True)
+            ),
+            ["options"],
+        )
@@ -0,0 +1,71 @@
+""" Integration tests of the module registry
+"""
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.module import registry as module_registry
+from core_parser_app.components.module.models import Module
+from core_parser_app.tools.modules.discover import reload_modules
+
+
+class TestModuleRegistry(IntegrationBaseTestCase):
+    """Test Module Registry"""
+
+    def setUp(self):
+        """setUp"""
+        self.module = Module(
+            name="module", url="/module", view="module.view", multiple=True
+        )
+        self.module.save()
+        module_registry.invalidate_registry()
+
+    def tearDown(self):
+        """tearDown"""
+        module_registry.invalidate_registry()
+
+    def test_registry_contains_modules(self):
+        """test_registry_contains_modules"""
+        registry = module_registry.get_registry()
+
+        self.assertEqual(
+            registry["/module"],
+            module_registry.RegisteredModule("module.view", True),
+        )
+
+    def test_registry_is_read_only(self):
+        """test_registry_is_read_only"""
+        with self.assertRaises(TypeError):
+            module_registry.get_registry()["/other"] = None
+
+    def test_registry_is_loaded_once(self):
+        """test_registry_is_loaded_once"""
+        module_registry.get_registry()
+
+        with self.assertNumQueries(0):
+            module_registry.get_registry()
+
+    def test_registry_is_invalidated_when_module_is_saved(self):
+        """test_registry_is_invalidated_when_module_is_saved"""
+        module_registry.get_registry()
+
+        self.module.multiple = False
+        self.module.save()
+
+        self.assertFalse(module_registry.get_registry()["/module"].multiple)
+
+    def test_registry_is_invalidated_when_module_is_deleted(self):
+        """test_registry_is_invalidated_when_module_is_deleted"""
+        module_registry.get_registry()
+
+        self.module.delete()
+
+        self.assertNotIn("/module", module_registry.get_registry())
+
+    def test_registry_is_invalidated_when_modules_are_reloaded(self):
+        """test_registry_is_invalidated_when_modules_are_reloaded"""
+        module_registry.get_registry()
+
+        reload_modules([])
+
+        self.assertEqual(len(module_registry.get_registry()), 0)
@@ -0,0 +1,103 @@
+"""XPath accessor integration testing
+"""
+
+from unittest.mock import Mock
+
+from django.db import connection
+from django.http import HttpRequest
+from django.test.utils import CaptureQueriesContext
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.data_structure.models import (
+    DataStructureElement,
+)
+from core_parser_app.tools.modules.xpathaccessor import XPathAccessor
+from tests.components.data_structure_element.fixtures.fixtures import (
+    DataStructureElementFixtures,
+)
+
+
+class TestGetElement(IntegrationBaseTestCase):
+    """Test Get Element"""
+
+    def setUp(self):
+        """setUp"""
+        self.fixtures = DataStructureElementFixtures()
+        self.fixtures.insert_data()
+        self.collection = self.fixtures.data_structure_element_collection
+
+        self.mock_request = Mock(spec=HttpRequest)
+        self.mock_request.user = self.fixtures.default_owner_with_perm
+        self.mock_request.POST = {"module_id": self.collection["1121"].pk}
+        self.xpath_accessor = XPathAccessorImplementation(self.mock_request)
+
+    def test_get_element_returns_element_with_xpath(self):
+        """test_get_element_returns_element_with_xpath"""
+        result = self.xpath_accessor._get_element(
+            self.collection["1000"].pk, "value_xpath"
+        )
+
+        self.assertEqual(result, self.collection["1121"])
+
+    def test_get_element_returns_none_if_xpath_not_found(self):
+        """test_get_element_returns_none_if_xpath_not_found"""
+        result = self.xpath_accessor._get_element(
+            self.collection["1000"].pk, "wrong_xpath"
+        )
+
+        self.assertIsNone(result)
+
+    def test_get_element_queries_by_tree_level(self):
+        """test_get_element_queries_by_tree_level"""
+        with CaptureQueriesContext(connection) as one_level_queries:
+            self.xpath_accessor._get_element(
+                self.collection["1110"].pk, "wrong_xpath"
+            )
+        with CaptureQueriesContext(connection) as tree_queries:
+            self.xpath_accessor._get_element(
+                self.collection["1000"].pk, "wrong_xpath"
+            )
+
+        # each of the 3 more levels below 1000 costs the queries of one
+        # level, whatever its number of elements
+        self.assertEqual(
+            len(tree_queries) - len(one_level_queries),
+            3 * (len(one_level_queries) - 1),
+        )
+
+    def test_get_form_element_returns_element_with_xpath(self):
+        """test_get_form_element_returns_element_with_xpath"""
+        result = self.xpath_accessor._get_form_element(
+            self.fixtures.data_structure.pk,
+            self.collection["1000"],
+            "value_xpath",
+        )
+
+        self.assertEqual(result, self.collection["1121"])
+
+    def test_get_form_element_without_path_returns_element_with_xpath(self):
+        """test_get_form_element_without_path_returns_element_with_xpath"""
+        DataStructureElement.objects.filter(
+            pk=self.collection["1121"].pk
+        ).update(path=None)
+
+        result = self.xpath_accessor._get_form_element(
+            self.fixtures.data_structure.pk,
+            self.collection["1000"],
+            "value_xpath",
+        )
+
+        self.assertEqual(result, self.collection["1121"])
+
+
+class XPathAccessorImplementation(XPathAccessor):
+    """XPath Accessor Implementation"""
+
+    def set_xpath_accessor(self, request):
+        """Set xpath accessor
+
+        Args:
+            request: HTTP request
+        """
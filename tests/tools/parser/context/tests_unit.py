@@ -0,0 +1,262 @@
+""" Unit tests for `core_parser_app.tools.parser.context` package.
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+from core_parser_app.tools.parser import context
+from core_parser_app.tools.parser.context import ParserContext
+
+XSD_NS = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema' "
+    "xmlns:test='http://test.com' targetNamespace='http://test.com' "
+    "elementFormDefault='qualified'>"
+    "<xs:element name='root'/>"
+    "</xs:schema>"
+)
+
+XSD_SYMBOLS = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+    "<xs:import namespace='http://import.com' schemaLocation='import.xsd'/>"
+    "<xs:element name='root' type='base'/>"
+    "<xs:complexType name='base'><xs:sequence/></xs:complexType>"
+    "<xs:simpleType name='base'><xs:restriction base='xs:string'/>"
+    "</xs:simpleType>"
+    "<xs:complexType name='derived'><xs:complexContent>"
+    "<xs:extension base='base'/></xs:complexContent></xs:complexType>"
+    "<xs:complexType name='base'/>"
+    "</xs:schema>"
+)
+
+XML_DATA = (
+    "<root xmlns:test='http://test.com' xmlns:other='http://other.com'>"
+    "<item id='1'><name>a</name></item>"
+    "<!-- comment -->"
+    "<item><name>b</name><name>c</name></item>"
+    "<test:item test:id='2'><test:name>d</test:name></test:item>"
+    "<other:item><name>e</name></other:item>"
+    "</root>"
+)
+
+XSD_APP_INFO = (
+    "<xs:element xmlns:xs='http://www.w3.org/2001/XMLSchema' name='root'>"
+    "<xs:annotation><xs:appinfo><label>Root</label></xs:appinfo>"
+    "</xs:annotation></xs:element>"
+)
+
+XML_DATA_NAMESPACES = {"test": "http://test.com", "other": "http://other.com"}
+
+XSD_NO_NS = (
+    "<xsd:schema xmlns:xsd='http://www.w3.org/2001/XMLSchema'>"
+    "<xsd:element name='root'/>"
+    "</xsd:schema>"
+)
+
+
+class TestParserContextGetSchemaContext(TestCase):
+    """Unit tests for `ParserContext.get_schema_context` method."""
+
+    def setUp(self):
+        """setUp"""
+        self.parser_context = ParserContext()
+
+    def test_schema_context_with_target_namespace(self):
+        """test_schema_context_with_target_namespace"""
+        schema_context = self.parser_context.get_schema_context(
+            XSDTree.build_tree(XSD_NS)
+        )
+
+        self.assertEqual(schema_context.default_prefix, "xs")
+        self.assertEqual(schema_context.target_namespace, "http://test.com")
+        self.assertEqual(schema_context.target_namespace_prefix, "test")
+        self.assertEqual(schema_context.ns_prefix, "test")
+        self.assertEqual(schema_context.element_form_default, "qualified")
+        self.assertEqual(schema_context.attribute_form_default, "unqualified")
+        self.assertIn("xsi", schema_context.xsi_namespaces)
+        self.assertNotIn("xsi", schema_context.namespaces)
+
+    def test_schema_context_without_target_namespace(self):
+        """test_schema_context_without_target_namespace"""
+        schema_context = self.parser_context.get_schema_context(
+            XSDTree.build_tree(XSD_NO_NS)
+        )
+
+        self.assertEqual(schema_context.default_prefix, "xsd")
+        self.assertIsNone(schema_context.target_namespace)
+        self.assertEqual(schema_context.target_namespace_prefix, "")
+        self.assertIsNone(schema_context.ns_prefix)
+        self.assertEqual(schema_context.element_form_default, "unqualified")
+
+    @patch.object(context, "get_namespaces")
+    def test_schema_context_computed_once_per_tree(self, mock_get_namespaces):
+        """test_schema_context_computed_once_per_tree"""
+        mock_get_namespaces.return_value = {}
+        xml_tree = XSDTree.build_tree(XSD_NO_NS)
+
+        first_context = self.parser_context.get_schema_context(xml_tree)
+        second_context = self.parser_context.get_schema_context(xml_tree)
+
+        self.assertIs(first_context, second_context)
+        self.assertEqual(mock_get_namespaces.call_count, 1)
+
+    def test_schema_context_by_tree(self):
+        """test_schema_context_by_tree"""
+        main_context = self.parser_context.get_schema_context(
+            XSDTree.build_tree(XSD_NS)
+        )
+        import_context = self.parser_context.get_schema_context(
+            XSDTree.build_tree(XSD_NO_NS)
+        )
+
+        self.assertIsNot(main_context, import_context)
+        self.assertEqual(import_context.default_prefix, "xsd")
+
+
+class TestParserContextGetSymbolTable(TestCase):
+    """Unit tests for `ParserContext.get_symbol_table` method."""
+
+    def setUp(self):
+        """setUp"""
+        self.xml_tree = XSDTree.build_tree(XSD_SYMBOLS)
+        self.symbol_table = ParserContext().get_symbol_table(self.xml_tree)
+
+    def test_get_definition_returns_first_definition_of_kind(self):
+        """test_get_definition_returns_first_definition_of_kind"""
+        self.assertIs(
+            self.symbol_table.get_definition("complexType", "base"),
+            self.xml_tree.getroot()[2],
+        )
+        self.assertIs(
+            self.symbol_table.get_definition("simpleType", "base"),
+            self.xml_tree.getroot()[3],
+        )
+        self.assertIsNone(self.symbol_table.get_definition("element", "base"))
+
+    def test_get_extensions_returns_copy_of_derived_types(self):
+        """test_get_extensions_returns_copy_of_derived_types"""
+        extensions = self.symbol_table.get_extensions("base")
+        extensions.insert(0, None)
+
+        self.assertEqual(
+            self.symbol_table.get_extensions("base"),
+            [self.xml_tree.getroot()[4]],
+        )
+
+    def test_get_import_by_namespace(self):
+        """test_get_import_by_namespace"""
+        self.assertEqual(
+            self.symbol_table.get_import("http://import.com").attrib[
+                "schemaLocation"
+            ],
+            "import.xsd",
+        )
+        self.assertIsNone(self.symbol_table.get_import(None))
+
+    def test_symbol_table_built_once_per_tree(self):
+        """test_symbol_table_built_once_per_tree"""
+        parser_context = ParserContext()
+
+        self.assertIs(
+            parser_context.get_symbol_table(self.xml_tree),
+            parser_context.get_symbol_table(self.xml_tree),
+        )
+
+
+class TestParserContextGetDataPathIndex(TestCase):
+    """Unit tests for `ParserContext.get_data_path_index` method."""
+
+    def setUp(self):
+        """setUp"""
+        self.xml_root = XSDTree.transform_to_xml(XML_DATA)
+        self.data_path_index = ParserContext().get_data_path_index(
+            self.xml_root
+        )
+
+    def test_find_returns_same_data_as_xpath(self):
+        """test_find_returns_same_data_as_xpath"""
+        for xpath in [
+            "/root",
+            "/root[1]",
+            "/other",
+            "/root/item",
+            "/root/item[2]",
+            "/root/item[3]",
+            "/root/item/name",
+            "/root/item/name[2]",
+            "/root/item[2]/name[1]",
+            "/root/test:item/test:name",
+            '/root/*[local-name()="item"]',
+            '/root/*[local-name()="item"][3]/*[local-name()="name"]',
+            "/root/item/@id",
+            "/root/test:item/@test:id",
+            '/root/*[local-name()="item"]/@*[local-name()="id"]',
+            "/root/item/@missing",
+        ]:
+            with self.subTest(xpath=xpath):
+                self.assertEqual(
+                    self.data_path_index.find(xpath, XML_DATA_NAMESPACES),
+                    self.xml_root.xpath(xpath, namespaces=XML_DATA_NAMESPACES),
+                )
+
+    def test_find_returns_none_for_unsupported_xpath(self):
+        """test_find_returns_none_for_unsupported_xpath"""
+        for xpath in [
+            "root/item",
+            "//item",
+            '/root/item[@xsi:type="a"]',
+            "/root/item/@id[1]",
+            "/root/@id/name",
+            "/root/unknown:item",
+        ]:
+            with self.subTest(xpath=xpath):
+                self.assertIsNone(
+                    self.data_path_index.find(xpath, XML_DATA_NAMESPACES)
+                )
+
+    def test_data_path_index_built_once_per_root(self):
+        """test_data_path_index_built_once_per_root"""
+        parser_context = ParserContext()
+
+        data_path_index = parser_context.get_data_path_index(self.xml_root)
+
+        self.assertIs(
+            parser_context.get_data_path_index(self.xml_root), data_path_index
+        )
+
+
+class TestParserContextGetAppInfoOptions(TestCase):
+    """Unit tests for `ParserContext.get_app_info_options` method."""
+
+    def setUp(self):
+        """setUp"""
+        self.element = XSDTree.fromstring(XSD_APP_INFO)
+        self.parser_context = ParserContext()
+
+    @patch.object(context, "get_app_info_options")
+    def test_app_info_options_read_once_per_element(
+        self, mock_get_app_info_options
+    ):
+        """test_app_info_options_read_once_per_element"""
+        mock_get_app_info_options.return_value = {"label": "Root"}
+
+        self.parser_context.get_app_info_options(self.element)
+        app_info = self.parser_context.get_app_info_options(self.element)
+
+        self.assertEqual(app_info, {"label": "Root"})
+        mock_get_app_info_options.assert_called_once_with(self.element)
+
+    def test_clear_app_info_options_reads_changed_annotations(self):
+        """test_clear_app_info_options_reads_changed_annotations"""
+        self.assertEqual(
+            self.parser_context.get_app_info_options(self.element),
+            {"label": "Root"},
+        )
+        self.element.remove(self.element[0])
+
+        self.parser_context.clear_app_info_options(self.element)
+
+        self.assertEqual(
+            self.parser_context.get_app_info_options(self.element), {}
+        )
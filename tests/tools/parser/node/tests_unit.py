@@ -0,0 +1,168 @@
+""" Unit tests for `core_parser_app.tools.parser.node` package.
+"""
+
+from copy import deepcopy
+from unittest import TestCase
+
+from core_parser_app.tools.parser.node import (
+    ElementOptions,
+    FormNode,
+    FormOptions,
+    FormXPath,
+    dump_form_nodes,
+    load_form_nodes,
+)
+
+
+class TestFormNodeGetOptions(TestCase):
+    """Unit tests for `FormNode.get_options` method."""
+
+    def test_get_options_converts_xpath_to_dict(self):
+        """test_get_options_converts_xpath_to_dict"""
+        node = FormNode(
+            "element",
+            options={"name": "a", "xpath": FormXPath("/xs:schema", "/a")},
+        )
+
+        self.assertEqual(
+            node.get_options(),
+            {"name": "a", "xpath": {"xsd": "/xs:schema", "xml": "/a"}},
+        )
+
+    def test_get_options_returns_common_options_in_generation_order(self):
+        """test_get_options_returns_common_options_in_generation_order"""
+        node = FormNode(
+            "sequence",
+            options={"label": "a", "xpath": FormXPath(None, "/a"), "min": 1},
+        )
+
+        self.assertEqual(list(node.get_options()), ["min", "xpath", "label"])
+
+    def test_get_options_of_node_without_options_returns_none(self):
+        """test_get_options_of_node_without_options_returns_none"""
+        self.assertIsNone(FormNode("elem-iter", children=[]).get_options())
+
+
+class TestFormOptions(TestCase):
+    """Unit tests for `FormOptions` class."""
+
+    def test_node_options_are_stored_by_tag(self):
+        """test_node_options_are_stored_by_tag"""
+        self.assertIsInstance(
+            FormNode("attribute", options={}).options, ElementOptions
+        )
+        self.assertIs(
+            type(FormNode("choice-iter", options={}).options), FormOptions
+        )
+
+    def test_common_options_are_stored_in_slots(self):
+        """test_common_options_are_stored_in_slots"""
+        options = ElementOptions({"name": "a", "module": None})
+
+        self.assertEqual(options.name, "a")
+        self.assertIsNone(options.module)
+        self.assertIsNone(options.other_options)
+
+    def test_other_options_are_stored_in_dict(self):
+        """test_other_options_are_stored_in_dict"""
+        options = ElementOptions({"name": "a", "keys": {}})
+
+        self.assertEqual(options.other_options, {"keys": {}})
+        self.assertEqual(options, {"name": "a", "keys": {}})
+
+    def test_options_behave_as_dict(self):
+        """test_options_behave_as_dict"""
+        options = ElementOptions({"name": "a", "real_root": "1"})
+        options["min"] = 0
+        del options["name"]
+        del options["real_root"]
+
+        self.assertNotIn("name", options)
+        self.assertEqual(options.get("min"), 0)
+        self.assertEqual(len(options), 1)
+        self.assertEqual(dict(options, max=1), {"min": 0, "max": 1})
+        with self.assertRaises(KeyError):
+            options["name"]
+        with self.assertRaises(KeyError):
+            del options["real_root"]
+
+    def test_deepcopy_returns_independent_options(self):
+        """test_deepcopy_returns_independent_options"""
+        options = ElementOptions({"name": "a", "keys": {"key": []}})
+
+        options_copy = deepcopy(options)
+        options_copy["name"] = "b"
+        options_copy["keys"]["key"].append(1)
+
+        self.assertEqual(options, {"name": "a", "keys": {"key": []}})
+        self.assertEqual(options_copy, {"name": "b", "keys": {"key": [1]}})
+
+
+class TestFormNodeToDict(TestCase):
+    """Unit tests for `FormNode.to_dict` method."""
+
+    def test_to_dict_returns_nested_dicts(self):
+        """test_to_dict_returns_nested_dicts"""
+        node = FormNode(
+            "element",
+            options={"xpath": FormXPath(None, "/a")},
+            children=[
+                FormNode(
+                    "elem-iter",
+                    children=[FormNode("input", value="1", options={})],
+                )
+            ],
+        )
+
+        self.assertDictEqual(
+            node.to_dict(),
+            {
+                "tag": "element",
+                "value": None,
+                "options": {"xpath": {"xsd": None, "xml": "/a"}},
+                "children": [
+                    {
+                        "tag": "elem-iter",
+                        "value": None,
+                        "children": [
+                            {"tag": "input", "value": "1", "options": {}}
+                        ],
+                    }
+                ],
+            },
+        )
+
+    def test_deepcopy_returns_independent_tree(self):
+        """test_deepcopy_returns_independent_tree"""
+        node = FormNode("choice-iter", children=[FormNode("input", value="")])
+
+        node_copy = deepcopy(node)
+        node_copy.children[0].value = "1"
+
+        self.assertEqual(node.children[0].value, "")
+        self.assertEqual(node_copy.to_dict()["children"][0]["value"], "1")
+
+
+class TestLoadFormNodes(TestCase):
+    """Unit tests for `load_form_nodes` function."""
+
+    def test_load_dumped_form_returns_same_tree(self):
+        """test_load_dumped_form_returns_same_tree"""
+        node = FormNode(
+            "element",
+            options={"xpath": FormXPath("/xs:schema", "/a")},
+            children=[
+                FormNode(
+                    "elem-iter",
+                    children=[
+                        FormNode("input", value="1"),
+                        FormNode("sequence", options={}, children=[]),
+                    ],
+                ),
+                FormNode("elem-iter", children=[FormNode("error")]),
+            ],
+        )
+
+        self.assertDictEqual(
+            load_form_nodes(dump_form_nodes(node)).to_dict(), node.to_dict()
+        )
@@ -45,7 +45,7 @@ class ParserCreateChoiceTestSuite(TestCase):
 
         expected_element = self.choice_data_handler.get_json(xsd_files)
 
-        self.assertDictEqual(expected_element, result_string)
+        self.assertDictEqual(expected_element, result_string.to_dict())
 
     def test_create_element_unbounded(self):
         """test_create_element_unbounded"""
@@ -62,7 +62,7 @@ class ParserCreateChoiceTestSuite(TestCase):
 
         expected_element = self.choice_data_handler.get_json(xsd_files)
 
-        self.assertDictEqual(expected_element, result_string)
+        self.assertDictEqual(expected_element, result_string.to_dict())
 
     def test_create_sequence_basic(self):
         """test_create_sequence_basic"""
@@ -79,7 +79,7 @@ class ParserCreateChoiceTestSuite(TestCase):
 
         expected_element = self.choice_data_handler.get_json(xsd_files)
 
-        self.assertDictEqual(expected_element, result_string)
+        self.assertDictEqual(expected_element, result_string.to_dict())
 
     def test_create_sequence_unbounded(self):
         """test_create_sequence_unbounded"""
@@ -96,7 +96,7 @@ class ParserCreateChoiceTestSuite(TestCase):
 
         expected_element = self.choice_data_handler.get_json(xsd_files)
 
-        self.assertDictEqual(expected_element, result_string)
+        self.assertDictEqual(expected_element, result_string.to_dict())
 
 
 class ParserReloadChoiceTestSuite(TestCase):
@@ -140,7 +140,7 @@ class ParserReloadChoiceTestSuite(TestCase):
             xsd_files + ".reload"
         )
 
-        self.assertDictEqual(expected_element, result_string)
+        self.assertDictEqual(expected_element, result_string.to_dict())
 
     def test_reload_element_unbounded(self):
         """test_reload_element_unbounded"""
@@ -166,7 +166,7 @@ class ParserReloadChoiceTestSuite(TestCase):
             xsd_files + ".reload"
         )
 
-        self.assertDictEqual(expected_element, result_string)
+        self.assertDictEqual(expected_element, result_string.to_dict())
 
     def test_reload_sequence_basic(self):
         """test_reload_sequence_basic"""
@@ -192,7 +192,7 @@ class ParserReloadChoiceTestSuite(TestCase):
             xsd_files + ".reload"
         )
 
-        self.assertDictEqual(expected_element, result_string)
+        self.assertDictEqual(expected_element, result_string.to_dict())
 
     def test_reload_sequence_unbounded(self):
         """test_reload_sequence_unbounded"""
@@ -218,4 +218,4 @@ class ParserReloadChoiceTestSuite(TestCase):
             xsd_files + ".reload"
         )
 
-        self.assertDictEqual(expected_element, result_string)
+        self.assertDictEqual(expected_element, result_string.to_dict())
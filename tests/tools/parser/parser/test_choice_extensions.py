@@ -5,7 +5,7 @@ method.
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
-from core_parser_app.tools.parser import parser
+from core_parser_app.tools.parser import context, parser
 from xml_utils.commons.constants import LXML_SCHEMA_NAMESPACE
 
 
@@ -26,9 +26,9 @@ class TestGenerateChoiceExtensions(TestCase):
 
         self.mock_xsd_parser = parser.XSDParser()
 
-    @patch.object(parser, "XSDTree")
-    @patch.object(parser, "get_namespaces")
-    @patch.object(parser, "get_target_namespace")
+    @patch.object(context, "XSDTree")
+    @patch.object(context, "get_namespaces")
+    @patch.object(context, "get_target_namespace")
     @patch.object(parser.XSDParser, "generate_complex_type")
     def test_complex_type_calls_generate_complex_type(
         self,
@@ -48,9 +48,9 @@ class TestGenerateChoiceExtensions(TestCase):
 
         mock_generate_complex_type.assert_called()
 
-    @patch.object(parser, "XSDTree")
-    @patch.object(parser, "get_namespaces")
-    @patch.object(parser, "get_target_namespace")
+    @patch.object(context, "XSDTree")
+    @patch.object(context, "get_namespaces")
+    @patch.object(context, "get_target_namespace")
     @patch.object(parser.XSDParser, "generate_simple_type")
     def test_simple_type_calls_generate_simple_type(
         self,
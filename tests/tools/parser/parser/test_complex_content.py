@@ -48,7 +48,7 @@ class ParserCreateComplexContentTestSuite(TestCase):
         )
 
         expected_dict = self.complex_content_data_handler.get_json(xsd_files)
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_create_restriction_basic(self):
         """test_create_restriction_basic"""
@@ -66,7 +66,7 @@ class ParserCreateComplexContentTestSuite(TestCase):
 
         # Load expected dictionary and compare with result
         expected_dict = self.complex_content_data_handler.get_json(xsd_files)
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
 
 class ParserReloadComplexContentTestSuite(TestCase):
@@ -114,7 +114,7 @@ class ParserReloadComplexContentTestSuite(TestCase):
         expected_dict = self.complex_content_data_handler.get_json(
             f"{xsd_files}.reload"
         )
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_reload_restriction_basic(self):
         """test_reload_restriction_basic"""
@@ -141,4 +141,4 @@ class ParserReloadComplexContentTestSuite(TestCase):
         expected_dict = self.complex_content_data_handler.get_json(
             f"{xsd_files}.reload"
         )
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
@@ -42,7 +42,7 @@ class ParserCreateComplexTypeTestSuite(TestCase):
         )
 
         expected_dict = self.complex_type_data_handler.get_json(xsd_files)
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_create_sequence_basic(self):
         """test_create_sequence_basic"""
@@ -57,7 +57,7 @@ class ParserCreateComplexTypeTestSuite(TestCase):
         )
 
         expected_dict = self.complex_type_data_handler.get_json(xsd_files)
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_create_simple_content_basic(self):
         """test_create_simple_content_basic"""
@@ -72,7 +72,7 @@ class ParserCreateComplexTypeTestSuite(TestCase):
         )
 
         expected_dict = self.complex_type_data_handler.get_json(xsd_files)
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_create_complex_content_basic(self):
         """test_create_complex_content_basic"""
@@ -87,7 +87,7 @@ class ParserCreateComplexTypeTestSuite(TestCase):
         )
 
         expected_dict = self.complex_type_data_handler.get_json(xsd_files)
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_create_attribute_basic(self):
         """test_create_attribute_basic"""
@@ -102,7 +102,7 @@ class ParserCreateComplexTypeTestSuite(TestCase):
         )
 
         expected_dict = self.complex_type_data_handler.get_json(xsd_files)
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_create_multiple_basic(self):
         """test_create_multiple_basic"""
@@ -117,7 +117,7 @@ class ParserCreateComplexTypeTestSuite(TestCase):
         )
 
         expected_dict = self.complex_type_data_handler.get_json(xsd_files)
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
 
 class ParserReloadComplexTypeTestSuite(TestCase):
@@ -160,7 +160,7 @@ class ParserReloadComplexTypeTestSuite(TestCase):
         expected_dict = self.complex_type_data_handler.get_json(
             f"{xsd_files}.reload"
         )
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_reload_sequence_basic(self):
         """test_reload_sequence_basic"""
@@ -186,7 +186,7 @@ class ParserReloadComplexTypeTestSuite(TestCase):
         expected_dict = self.complex_type_data_handler.get_json(
             f"{xsd_files}.reload"
         )
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_reload_simple_content_basic(self):
         """test_reload_simple_content_basic"""
@@ -215,7 +215,7 @@ class ParserReloadComplexTypeTestSuite(TestCase):
         expected_dict = self.complex_type_data_handler.get_json(
             f"{xsd_files}.reload"
         )
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_reload_complex_content_basic(self):
         """test_reload_complex_content_basic"""
@@ -241,7 +241,7 @@ class ParserReloadComplexTypeTestSuite(TestCase):
         expected_dict = self.complex_type_data_handler.get_json(
             f"{xsd_files}.reload"
         )
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_reload_attribute_basic(self):
         """test_reload_attribute_basic"""
@@ -267,7 +267,7 @@ class ParserReloadComplexTypeTestSuite(TestCase):
         expected_dict = self.complex_type_data_handler.get_json(
             f"{xsd_files}.reload"
         )
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
 
     def test_reload_multiple_basic(self):
         """test_reload_multiple_basic"""
@@ -293,4 +293,4 @@ class ParserReloadComplexTypeTestSuite(TestCase):
         expected_dict = self.complex_type_data_handler.get_json(
             f"{xsd_files}.reload"
         )
-        self.assertDictEqual(result_string, expected_dict)
+        self.assertDictEqual(result_string.to_dict(), expected_dict)
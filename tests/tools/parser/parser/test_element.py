@@ -44,7 +44,7 @@ class ParserGenerateElementTestSuite(TestCase):
 
         # Load expected dictionary and compare with result
         expected_dict = self.element_data_handler.get_json(xsd_files)
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_create_simple_type_basic_ns(self):
         """setUp"""
@@ -61,7 +61,7 @@ class ParserGenerateElementTestSuite(TestCase):
 
         # Load expected dictionary and compare with result
         expected_dict = self.element_data_handler.get_json(xsd_files)
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_create_simple_type_unbounded(self):
         """setUp"""
@@ -79,7 +79,7 @@ class ParserGenerateElementTestSuite(TestCase):
 
         # Load expected dictionary and compare with result
         expected_dict = self.element_data_handler.get_json(xsd_files)
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_create_simple_type_unbounded_ns(self):
         """setUp"""
@@ -97,7 +97,7 @@ class ParserGenerateElementTestSuite(TestCase):
 
         # Load expected dictionary and compare with result
         expected_dict = self.element_data_handler.get_json(xsd_files)
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_create_complex_type_basic(self):
         """setUp"""
@@ -114,7 +114,7 @@ class ParserGenerateElementTestSuite(TestCase):
 
         # Load expected dictionary and compare with result
         expected_dict = self.element_data_handler.get_json(xsd_files)
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_create_complex_type_unbounded(self):
         """setUp"""
@@ -132,7 +132,7 @@ class ParserGenerateElementTestSuite(TestCase):
 
         # Load expected dictionary and compare with result
         expected_dict = self.element_data_handler.get_json(xsd_files)
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
 
 class ParserReloadElementTestSuite(TestCase):
@@ -173,7 +173,7 @@ class ParserReloadElementTestSuite(TestCase):
         expected_dict = self.element_data_handler.get_json(
             xsd_files + ".reload"
         )
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_reload_simple_type_basic_ns(self):
         """test_reload_simple_type_basic_ns"""
@@ -198,7 +198,7 @@ class ParserReloadElementTestSuite(TestCase):
         expected_dict = self.element_data_handler.get_json(
             xsd_files + ".reload"
         )
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_reload_simple_type_unbounded(self):
         """test_reload_simple_type_unbounded"""
@@ -225,7 +225,7 @@ class ParserReloadElementTestSuite(TestCase):
         expected_dict = self.element_data_handler.get_json(
             xsd_files + ".reload"
         )
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_reload_simple_type_unbounded_ns(self):
         """test_reload_simple_type_unbounded_ns"""
@@ -252,7 +252,7 @@ class ParserReloadElementTestSuite(TestCase):
         expected_dict = self.element_data_handler.get_json(
             xsd_files + ".reload"
         )
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_reload_complex_type_basic(self):
         """test_reload_complex_type_basic"""
@@ -275,7 +275,7 @@ class ParserReloadElementTestSuite(TestCase):
         expected_dict = self.element_data_handler.get_json(
             xsd_files + ".reload"
         )
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_create_complex_type_unbounded(self):
         """test_create_complex_type_unbounded"""
@@ -302,4 +302,4 @@ class ParserReloadElementTestSuite(TestCase):
         expected_dict = self.element_data_handler.get_json(
             xsd_files + ".reload"
         )
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
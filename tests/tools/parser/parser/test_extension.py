@@ -43,7 +43,7 @@ class ParserCreateExtensionTestSuite(TestCase):
         )
         expected_dict = self.extension_data_handler.get_json(xsd_files)
 
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_generate_extension_with_single_child_attribute_returns_expected_json_dict(
         self,
@@ -61,7 +61,7 @@ class ParserCreateExtensionTestSuite(TestCase):
         )
         expected_dict = self.extension_data_handler.get_json(xsd_files)
 
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_generate_extension_with_single_child_choice_returns_expected_json_dict(
         self,
@@ -79,7 +79,7 @@ class ParserCreateExtensionTestSuite(TestCase):
         )
         expected_dict = self.extension_data_handler.get_json(xsd_files)
 
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_generate_extension_with_single_child_sequence_returns_expected_json_dict(
         self,
@@ -97,7 +97,7 @@ class ParserCreateExtensionTestSuite(TestCase):
         )
         expected_dict = self.extension_data_handler.get_json(xsd_files)
 
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
 
 class ParserReloadExtensionTestSuite(TestCase):
@@ -145,7 +145,7 @@ class ParserReloadExtensionTestSuite(TestCase):
         expected_dict = self.extension_data_handler.get_json(
             xsd_files + ".reload"
         )
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_generate_extension_with_single_child_attribute_returns_expected_json_dict(
         self,
@@ -175,7 +175,7 @@ class ParserReloadExtensionTestSuite(TestCase):
         expected_dict = self.extension_data_handler.get_json(
             xsd_files + ".reload"
         )
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_generate_extension_with_single_child_choice_returns_expected_json_dict(
         self,
@@ -204,7 +204,7 @@ class ParserReloadExtensionTestSuite(TestCase):
         expected_dict = self.extension_data_handler.get_json(
             xsd_files + ".reload"
         )
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_generate_extension_with_single_child_sequence_returns_expected_json_dict(
         self,
@@ -233,4 +233,4 @@ class ParserReloadExtensionTestSuite(TestCase):
         expected_dict = self.extension_data_handler.get_json(
             xsd_files + ".reload"
         )
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
@@ -0,0 +1,150 @@
+""" Integration tests for the new forms created from form skeletons by
+`core_parser_app.tools.parser.parser.XSDParser`.
+"""
+
+from unittest.mock import Mock, patch
+
+from django.http import HttpRequest
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.data_structure.models import (
+    DataStructureElement,
+)
+from core_parser_app.components.form_skeleton.models import FormSkeleton
+from core_parser_app.tools.parser import parser
+from core_parser_app.tools.parser.parser import XSDParser
+from tests.components.data_structure_element.fixtures.fixtures import (
+    DataStructureElementFixtures,
+)
+
+XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+    "<xs:element name='root'><xs:complexType><xs:sequence>"
+    "<xs:element name='item' minOccurs='2' maxOccurs='unbounded'>"
+    "<xs:complexType><xs:sequence>"
+    "<xs:element name='name' type='xs:string' default='a'/>"
+    "<xs:choice><xs:element name='a' type='xs:string'/>"
+    "<xs:element name='b' type='xs:integer'/></xs:choice>"
+    "</xs:sequence><xs:attribute name='id' type='xs:string'/>"
+    "</xs:complexType></xs:element>"
+    "</xs:sequence></xs:complexType></xs:element>"
+    "</xs:schema>"
+)
+
+XML = "<root><item><name>b</name><b>1</b></item></root>"
+
+
+class TestGenerateFormSkeleton(IntegrationBaseTestCase):
+    """Integration tests for the new forms created from form skeletons."""
+
+    def setUp(self):
+        """setUp"""
+        self.fixture = DataStructureElementFixtures()
+        self.fixture.insert_data()
+        self.mock_request = Mock(spec=HttpRequest)
+        self.mock_request.user = self.fixture.default_owner_with_perm
+
+        patcher = patch.object(parser, "PARSER_FORM_SKELETON_CACHE", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _generate_form(self, xml=None, request=None):
+        """Generate the form of the schema, and return its elements in
+        document order, with the position of the selected child of the
+        choices
+
+        Args:
+            xml:
+            request:
+
+        Returns:
+
+        """
+        request = request or self.mock_request
+        root_id = XSDParser(request=request).generate_form(
+            XSD,
+            xml,
+            data_structure=self.fixture.data_structure,
+            request=request,
+        )
+        elements = list(
+            DataStructureElement.get_branch(
+                DataStructureElement.objects.get(pk=root_id)
+            )
+        )
+        element_ids = [element.pk for element in elements]
+        return [
+            (
+                element.tag,
+                (
+                    element_ids.index(int(element.value))
+                    if element.tag == "choice-iter"
+                    else element.value
+                ),
+                element.options,
+            )
+            for element in elements
+        ]
+
+    @patch.object(
+        XSDParser,
+        "generate_element",
+        autospec=True,
+        side_effect=XSDParser.generate_element,
+    )
+    def test_new_form_is_created_from_skeleton(self, mock_generate_element):
+        """test_new_form_is_created_from_skeleton"""
+        form = self._generate_form()
+        generated_elements = mock_generate_element.call_count
+
+        self.assertEqual(self._generate_form(), form)
+        self.assertEqual(mock_generate_element.call_count, generated_elements)
+        self.assertEqual(FormSkeleton.objects.count(), 1)
+
+    @patch.object(
+        XSDParser,
+        "generate_element",
+        autospec=True,
+        side_effect=XSDParser.generate_element,
+    )
+    def test_skeleton_is_not_shared_between_users(self, mock_generate_element):
+        """test_skeleton_is_not_shared_between_users"""
+        other_request = Mock(spec=HttpRequest)
+        other_request.user = self.fixture.superuser
+        self._generate_form()
+        generated_elements = mock_generate_element.call_count
+
+        self._generate_form(request=other_request)
+
+        self.assertEqual(
+            mock_generate_element.call_count, 2 * generated_elements
+        )
+        self.assertEqual(FormSkeleton.objects.count(), 2)
+
+    @patch.object(
+        parser, "load_schema_data_in_db", side_effect=Exception("error")
+    )
+    def test_failed_form_is_not_saved_as_skeleton(
+        self, mock_load_schema_data_in_db
+    ):
+        """test_failed_form_is_not_saved_as_skeleton"""
+        with self.assertRaises(parser.ParserError):
+            self._generate_form()
+
+        self.assertEqual(FormSkeleton.objects.count(), 0)
+
+    def test_edited_form_is_not_saved_as_skeleton(self):
+        """test_edited_form_is_not_saved_as_skeleton"""
+        form = self._generate_form(XML)
+
+        self.assertEqual(FormSkeleton.objects.count(), 0)
+        self.assertNotEqual(self._generate_form(), form)
+
+    @patch.object(parser, "PARSER_FORM_SKELETON_CACHE", False)
+    def test_skeleton_cache_disabled_saves_no_skeleton(self):
+        """test_skeleton_cache_disabled_saves_no_skeleton"""
+        self._generate_form()
+
+        self.assertEqual(FormSkeleton.objects.count(), 0)
@@ -0,0 +1,314 @@
+""" Integration tests for `XSDParser.generate_element_absent` and
+`XSDParser.generate_choice_absent` methods.
+"""
+
+import re
+from unittest.mock import Mock, patch
+
+from django.db import connection
+from django.http import HttpRequest
+from django.test.utils import CaptureQueriesContext
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.data_structure.models import (
+    DataStructureElement,
+)
+from core_parser_app.tools.parser import parser
+from tests.components.data_structure_element.fixtures.fixtures import (
+    DataStructureElementFixtures,
+)
+
+XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+    "<xs:element name='root'><xs:complexType><xs:sequence>"
+    "<xs:element name='item' maxOccurs='unbounded'>"
+    "<xs:complexType><xs:choice>"
+    "<xs:element name='a' type='xs:string'/>"
+    "<xs:element name='b' type='xs:integer'/>"
+    "</xs:choice></xs:complexType></xs:element>"
+    "</xs:sequence></xs:complexType></xs:element>"
+    "</xs:schema>"
+)
+
+
+class TestGenerateAbsent(IntegrationBaseTestCase):
+    """Integration tests for the generation of absent elements."""
+
+    def setUp(self):
+        """setUp"""
+        self.fixture = DataStructureElementFixtures()
+        self.fixture.insert_data()
+        self.mock_request = Mock(spec=HttpRequest)
+        self.mock_request.user = self.fixture.default_owner_with_perm
+
+        parser.FLAT_SCHEMA_CACHE.clear()
+        self.addCleanup(parser.FLAT_SCHEMA_CACHE.clear)
+
+        self.xsd_parser = parser.XSDParser(request=self.mock_request)
+        self.root_id = self.xsd_parser.generate_form(
+            XSD,
+            data_structure=self.fixture.data_structure,
+            request=self.mock_request,
+        )
+
+    def _get_element(self, tag, xpath):
+        """Return the element of the form with the given tag and xpath"""
+        return DataStructureElement.objects.get(
+            data_structure=self.fixture.data_structure,
+            tag=tag,
+            xpath=xpath,
+        )
+
+    def test_generate_element_absent_adds_occurrence(self):
+        """test_generate_element_absent_adds_occurrence"""
+        schema_element = self._get_element("element", "/root[1]/item")
+        elem_iter = schema_element.children.get()
+
+        html_form = self.xsd_parser.generate_element_absent(
+            elem_iter.pk, XSD, data_structure=self.fixture.data_structure
+        )
+
+        self.assertIn("item", html_form)
+        self.assertEqual(schema_element.children.count(), 2)
+
+    @patch.object(
+        parser,
+        "XSDFlattenerDatabaseOrURL",
+        wraps=parser.XSDFlattenerDatabaseOrURL,
+    )
+    def test_generate_absent_flattens_schema_once(self, mock_flattener):
+        """test_generate_absent_flattens_schema_once"""
+        schema_element = self._get_element("element", "/root[1]/item")
+        for _ in range(2):
+            self.xsd_parser.generate_element_absent(
+                schema_element.children.first().pk,
+                XSD,
+                data_structure=self.fixture.data_structure,
+            )
+
+        choice = self._get_element("choice", "/root[1]/item[1]")
+        self.xsd_parser.generate_choice_absent(
+            choice.children.first().children.last().pk,
+            XSD,
+            data_structure=self.fixture.data_structure,
+        )
+
+        self.assertEqual(mock_flattener.call_count, 1)
+        self.assertEqual(schema_element.children.count(), 3)
+
+    def _add_occurrence(self, schema_element):
+        """Add an occurrence of a schema element, from its first one"""
+        return self.xsd_parser.generate_element_absent(
+            schema_element.children.order_by("pk").first().pk,
+            XSD,
+            data_structure=self.fixture.data_structure,
+        )
+
+    def _get_branch_values(self, occurrence, xpath_index=None):
+        """Return the tags, values and xpaths of the branch of an occurrence,
+        with the index of the item xpath replaced"""
+        return [
+            (
+                element.tag,
+                element.value,
+                (
+                    re.sub(
+                        r"item\[[0-9]+\]",
+                        f"item[{xpath_index}]",
+                        element.xpath,
+                    )
+                    if element.xpath and xpath_index is not None
+                    else element.xpath
+                ),
+            )
+            for element in DataStructureElement.get_branch(occurrence)
+            if element.tag != "choice-iter"
+        ]
+
+    @patch.object(
+        parser.XSDParser,
+        "generate_occurrence",
+        autospec=True,
+        side_effect=parser.XSDParser.generate_occurrence,
+    )
+    def test_generate_element_absent_copies_sibling_occurrence(
+        self, mock_generate_occurrence
+    ):
+        """test_generate_element_absent_copies_sibling_occurrence"""
+        schema_element = self._get_element("element", "/root[1]/item")
+        # occurrence generated by the parser
+        with patch.object(
+            parser.XSDParser, "copy_occurrence", return_value=None
+        ):
+            generated_html_form = self._add_occurrence(schema_element)
+        copied_html_form = self._add_occurrence(schema_element)
+
+        self.assertEqual(mock_generate_occurrence.call_count, 1)
+        # same form, but for the ids and the index of the occurrence
+        self.assertEqual(
+            re.sub(r"[0-9]+", "", generated_html_form),
+            re.sub(r"[0-9]+", "", copied_html_form),
+        )
+        occurrences = list(schema_element.children.order_by("pk"))
+        self.assertEqual(len(occurrences), 3)
+        self.assertEqual(
+            self._get_branch_values(occurrences[2]),
+            self._get_branch_values(occurrences[1], xpath_index=3),
+        )
+
+    def test_copied_occurrence_has_values_of_new_occurrence(self):
+        """test_copied_occurrence_has_values_of_new_occurrence"""
+        schema_element = self._get_element("element", "/root[1]/item")
+        generated_branch = self._get_branch_values(
+            schema_element.children.get(), xpath_index=2
+        )
+        DataStructureElement.objects.filter(
+            data_structure=self.fixture.data_structure, tag="input"
+        ).update(value="value")
+
+        self._add_occurrence(schema_element)
+
+        occurrences = list(schema_element.children.order_by("pk"))
+        self.assertEqual(
+            self._get_branch_values(occurrences[1]), generated_branch
+        )
+        choice_iter = DataStructureElement.objects.get(
+            parent=self._get_element("choice", "/root[1]/item[2]")
+        )
+        self.assertEqual(
+            choice_iter.value, str(choice_iter.children.order_by("pk")[0].pk)
+        )
+
+    def test_copied_occurrence_has_default_value_of_schema(self):
+        """test_copied_occurrence_has_default_value_of_schema"""
+        xsd = (
+            "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+            "<xs:element name='root'><xs:complexType><xs:sequence>"
+            "<xs:element name='item' type='xs:string' default=' value '"
+            " maxOccurs='unbounded'/>"
+            "</xs:sequence></xs:complexType></xs:element>"
+            "</xs:schema>"
+        )
+        root_id = self.xsd_parser.generate_form(
+            xsd,
+            data_structure=self.fixture.data_structure,
+            request=self.mock_request,
+        )
+        schema_element = next(
+            element
+            for element in DataStructureElement.get_branch(
+                DataStructureElement.objects.get(pk=root_id)
+            )
+            if element.tag == "element" and element.xpath == "/root[1]/item"
+        )
+        DataStructureElement.objects.filter(
+            parent__parent=schema_element, tag="input"
+        ).update(value="other value")
+
+        self.xsd_parser.generate_element_absent(
+            schema_element.children.get().pk,
+            xsd,
+            data_structure=self.fixture.data_structure,
+        )
+
+        self.assertEqual(
+            list(
+                DataStructureElement.objects.filter(
+                    parent__parent=schema_element, tag="input"
+                )
+                .order_by("pk")
+                .values_list("value", flat=True)
+            ),
+            ["other value", "value"],
+        )
+
+    @patch.object(
+        parser.XSDParser,
+        "generate_occurrence",
+        autospec=True,
+        side_effect=parser.XSDParser.generate_occurrence,
+    )
+    def test_occurrence_with_other_choice_is_generated(
+        self, mock_generate_occurrence
+    ):
+        """test_occurrence_with_other_choice_is_generated"""
+        schema_element = self._get_element("element", "/root[1]/item")
+        choice_iter = DataStructureElement.objects.get(
+            parent=self._get_element("choice", "/root[1]/item[1]")
+        )
+        choice_iter.value = str(choice_iter.children.order_by("pk")[1].pk)
+        choice_iter.save()
+
+        self._add_occurrence(schema_element)
+
+        self.assertEqual(mock_generate_occurrence.call_count, 1)
+        self.assertEqual(schema_element.children.count(), 2)
+
+    def test_update_branch_xpath_saves_changed_elements_only(self):
+        """test_update_branch_xpath_saves_changed_elements_only"""
+        schema_element = self._get_element("element", "/root[1]/item")
+        for _ in range(2):
+            self.xsd_parser.generate_element_absent(
+                schema_element.children.first().pk,
+                XSD,
+                data_structure=self.fixture.data_structure,
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            parser.update_branch_xpath(schema_element, self.mock_request)
+
+        self.assertFalse(
+            any(
+                query["sql"].startswith("UPDATE")
+                for query in context.captured_queries
+            )
+        )
+        self.assertEqual(
+            sorted(
+                DataStructureElement.objects.filter(
+                    tag="choice", data_structure=self.fixture.data_structure
+                ).values_list("xpath", flat=True)
+            ),
+            ["/root[1]/item[1]", "/root[1]/item[2]", "/root[1]/item[3]"],
+        )
+
+    def test_get_flat_schema_returns_private_copy(self):
+        """test_get_flat_schema_returns_private_copy"""
+        first_tree, namespaces = self.xsd_parser.get_flat_schema(XSD)
+        first_tree.getroot().clear()
+
+        second_tree, _ = self.xsd_parser.get_flat_schema(XSD)
+
+        self.assertEqual(len(second_tree.getroot()), 1)
+        self.assertIn("xs", namespaces)
+
+    @patch.object(
+        parser,
+        "XSDFlattenerDatabaseOrURL",
+        wraps=parser.XSDFlattenerDatabaseOrURL,
+    )
+    def test_get_flat_schema_is_not_shared_between_users(self, mock_flattener):
+        """test_get_flat_schema_is_not_shared_between_users"""
+        other_request = Mock(spec=HttpRequest)
+        other_request.user = Mock(id=-1, is_authenticated=True)
+        other_parser = parser.XSDParser(request=other_request)
+
+        self.xsd_parser.get_flat_schema(XSD)
+        other_parser.get_flat_schema(XSD)
+        self.xsd_parser.get_flat_schema(XSD)
+
+        self.assertEqual(mock_flattener.call_count, 2)
+        self.assertIs(
+            mock_flattener.call_args_list[1].kwargs["request"], other_request
+        )
+
+    def test_get_flat_schema_of_import_without_download_raises_error(self):
+        """test_get_flat_schema_of_import_without_download_raises_error"""
+        self.xsd_parser.download_dependencies = False
+
+        with self.assertRaises(parser.ParserError):
+            self.xsd_parser.get_flat_schema(
+                XSD, schema_location="http://import.com/import.xsd"
+            )
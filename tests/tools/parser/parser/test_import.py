@@ -0,0 +1,199 @@
+""" Unit tests for `core_parser_app.tools.parser.parser.import_xml_tree` function.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+from urllib.parse import urlparse
+
+from lxml import etree
+
+from core_parser_app.tools.parser import parser
+from core_parser_app.tools.parser.context import ParserContext
+from core_parser_app.tools.parser.utils import cache
+from xml_utils.commons.constants import LXML_SCHEMA_NAMESPACE
+
+IMPORTED_XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema' "
+    "targetNamespace='http://import.com'>"
+    "<xs:simpleType name='{0}'><xs:restriction base='xs:string'/>"
+    "</xs:simpleType>"
+    "</xs:schema>"
+)
+
+
+class MockFileResponse:
+    """Response of the file-backed stand-in of the HTTP fetch"""
+
+    def __init__(self, path):
+        with open(path, "rb") as schema_file:
+            self.content = schema_file.read()
+        self.status_code = 200
+        self.headers = {}
+
+
+class TestImportXmlTree(TestCase):
+    """Unit tests for `import_xml_tree` function."""
+
+    def setUp(self):
+        """setUp"""
+        self.directory = tempfile.mkdtemp()
+        self.schema_path = os.path.join(self.directory, "import.xsd")
+        self._write_schema("FirstType")
+
+        self.el_import = etree.Element(
+            "{0}import".format(LXML_SCHEMA_NAMESPACE),
+            namespace="http://import.com",
+            schemaLocation="file://{0}".format(self.schema_path),
+        )
+
+        parser.IMPORTED_SCHEMA_CACHE.clear()
+        patcher = patch.object(
+            parser,
+            "send_get_request",
+            side_effect=lambda url, **kwargs: MockFileResponse(
+                urlparse(url).path
+            ),
+        )
+        self.mock_send_get_request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """tearDown"""
+        parser.IMPORTED_SCHEMA_CACHE.clear()
+        shutil.rmtree(self.directory)
+
+    def _write_schema(self, type_name):
+        """Write the imported schema"""
+        with open(self.schema_path, "w") as schema_file:
+            schema_file.write(IMPORTED_XSD.format(type_name))
+
+    def _type_name(self, xml_tree):
+        """Return the name of the type of the imported schema"""
+        return xml_tree.getroot()[0].attrib["name"]
+
+    def test_import_download_disabled_raises_parser_error(self):
+        """test_import_download_disabled_raises_parser_error"""
+        with self.assertRaises(parser.ParserError):
+            parser.import_xml_tree(self.el_import, download_enabled=False)
+
+    def test_import_is_downloaded_once(self):
+        """test_import_is_downloaded_once"""
+        first_tree, schema_location = parser.import_xml_tree(self.el_import)
+        second_tree, _ = parser.import_xml_tree(self.el_import)
+
+        self.assertEqual(
+            schema_location, self.el_import.attrib["schemaLocation"]
+        )
+        self.assertEqual(self.mock_send_get_request.call_count, 1)
+        self.assertEqual(parser.IMPORTED_SCHEMA_CACHE.info()["hits"], 1)
+        self.assertEqual(parser.IMPORTED_SCHEMA_CACHE.info()["misses"], 1)
+        self.assertEqual(self._type_name(second_tree), "FirstType")
+
+    def test_import_is_not_shared_between_users(self):
+        """test_import_is_not_shared_between_users"""
+        first_request = Mock(user=Mock(id=1, is_authenticated=True))
+        second_request = Mock(user=Mock(id=2, is_authenticated=True))
+
+        parser.import_xml_tree(self.el_import, request=first_request)
+        parser.import_xml_tree(self.el_import, request=second_request)
+        parser.import_xml_tree(self.el_import, request=first_request)
+
+        self.assertEqual(self.mock_send_get_request.call_count, 2)
+        self.assertEqual(parser.IMPORTED_SCHEMA_CACHE.info()["hits"], 1)
+
+    def test_import_of_anonymous_users_is_shared(self):
+        """test_import_of_anonymous_users_is_shared"""
+        anonymous_request = Mock(user=Mock(is_authenticated=False))
+
+        parser.import_xml_tree(self.el_import, request=anonymous_request)
+        parser.import_xml_tree(self.el_import)
+
+        self.assertEqual(self.mock_send_get_request.call_count, 1)
+
+    def test_import_returns_private_copy_of_cached_tree(self):
+        """test_import_returns_private_copy_of_cached_tree"""
+        first_tree, _ = parser.import_xml_tree(self.el_import)
+        first_tree.getroot().remove(first_tree.getroot()[0])
+
+        second_tree, _ = parser.import_xml_tree(self.el_import)
+
+        self.assertIsNot(first_tree, second_tree)
+        self.assertEqual(self._type_name(second_tree), "FirstType")
+
+    def test_import_returns_same_tree_during_a_parse(self):
+        """test_import_returns_same_tree_during_a_parse"""
+        parser_context = ParserContext()
+
+        first_tree, _ = parser.import_xml_tree(
+            self.el_import, parser_context=parser_context
+        )
+        second_tree, _ = parser.import_xml_tree(
+            self.el_import, parser_context=parser_context
+        )
+
+        self.assertIs(first_tree, second_tree)
+
+    @patch.object(cache.time, "monotonic")
+    def test_expired_import_is_downloaded_again(self, mock_monotonic):
+        """test_expired_import_is_downloaded_again"""
+        mock_monotonic.return_value = 0
+        parser.import_xml_tree(self.el_import)
+
+        self._write_schema("SecondType")
+        mock_monotonic.return_value = parser.IMPORTED_SCHEMA_CACHE.ttl + 1
+        xml_tree, _ = parser.import_xml_tree(self.el_import)
+
+        self.assertEqual(self.mock_send_get_request.call_count, 2)
+        self.assertEqual(self._type_name(xml_tree), "SecondType")
+
+    @patch.object(
+        parser.XSDTree, "build_tree", wraps=parser.XSDTree.build_tree
+    )
+    @patch.object(cache.time, "monotonic")
+    def test_expired_unchanged_import_is_not_parsed_again(
+        self, mock_monotonic, mock_build_tree
+    ):
+        """test_expired_unchanged_import_is_not_parsed_again"""
+        mock_monotonic.return_value = 0
+        parser.import_xml_tree(self.el_import)
+
+        mock_monotonic.return_value = parser.IMPORTED_SCHEMA_CACHE.ttl + 1
+        xml_tree, _ = parser.import_xml_tree(self.el_import)
+
+        self.assertEqual(self.mock_send_get_request.call_count, 2)
+        self.assertEqual(mock_build_tree.call_count, 1)
+        self.assertEqual(self._type_name(xml_tree), "FirstType")
+
+    def test_least_recently_used_import_is_evicted(self):
+        """test_least_recently_used_import_is_evicted"""
+        with patch.object(parser.IMPORTED_SCHEMA_CACHE, "max_size", 1):
+            parser.import_xml_tree(self.el_import)
+            other_import = etree.Element(
+                "{0}import".format(LXML_SCHEMA_NAMESPACE),
+                namespace="http://import.com",
+                schemaLocation="file://{0}?v=2".format(self.schema_path),
+            )
+            parser.import_xml_tree(other_import)
+            parser.import_xml_tree(self.el_import)
+
+        self.assertEqual(self.mock_send_get_request.call_count, 3)
+        self.assertEqual(parser.IMPORTED_SCHEMA_CACHE.info()["size"], 1)
+
+    def test_flat_imported_schema_is_reused_until_content_changes(self):
+        """test_flat_imported_schema_is_reused_until_content_changes"""
+        schema_location = self.el_import.attrib["schemaLocation"]
+        parser.FLAT_SCHEMA_CACHE.clear()
+        self.addCleanup(parser.FLAT_SCHEMA_CACHE.clear)
+
+        first_schema = parser.load_flat_imported_schema(schema_location)
+        second_schema = parser.load_flat_imported_schema(schema_location)
+
+        self._write_schema("SecondType")
+        parser.IMPORTED_SCHEMA_CACHE.clear()
+        third_schema = parser.load_flat_imported_schema(schema_location)
+
+        self.assertIs(first_schema, second_schema)
+        self.assertEqual(self._type_name(third_schema.xml_tree), "SecondType")
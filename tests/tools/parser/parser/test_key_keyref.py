@@ -0,0 +1,165 @@
+""" Unit tests for the key and keyref methods of
+`core_parser_app.tools.parser.parser.XSDParser` class.
+"""
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+from urllib.parse import urlparse
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.module import registry as module_registry
+from core_parser_app.components.module.models import Module
+from core_parser_app.tools.parser import parser
+from core_parser_app.tools.parser.parser import XSDParser
+from core_parser_app.tools.parser.utils.xml import get_app_info_options
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema' "
+    "xmlns:t='http://test.com' targetNamespace='http://test.com'>"
+    "<xs:element name='root'>"
+    "<xs:key name='itemKey'><xs:selector xpath='t:item'/>"
+    "<xs:field xpath='@id'/></xs:key>"
+    "<xs:keyref name='itemRef' refer='t:itemKey'>"
+    "<xs:selector xpath='t:ref'/><xs:field xpath='@item'/></xs:keyref>"
+    "</xs:element>"
+    "<xs:attribute name='id'/>"
+    "</xs:schema>"
+)
+
+XSD_MODULES = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+    "<xs:element name='root'><xs:complexType><xs:sequence>"
+    "<xs:element name='item'><xs:complexType>"
+    "<xs:attribute name='id' type='xs:string'/></xs:complexType>"
+    "</xs:element>"
+    "<xs:element name='ref'><xs:complexType>"
+    "<xs:attribute name='item' type='xs:string'/></xs:complexType>"
+    "</xs:element>"
+    "</xs:sequence></xs:complexType>"
+    "<xs:key name='itemKey'>"
+    "<xs:annotation><xs:appinfo><module>/mod-key</module></xs:appinfo>"
+    "</xs:annotation>"
+    "<xs:selector xpath='item'/><xs:field xpath='@id'/></xs:key>"
+    "<xs:keyref name='itemRef' refer='itemKey'>"
+    "<xs:selector xpath='ref'/><xs:field xpath='@item'/></xs:keyref>"
+    "</xs:element>"
+    "</xs:schema>"
+)
+
+
+class TestKeyKeyref(TestCase):
+    """Unit tests for the key and keyref methods of `XSDParser` class."""
+
+    def setUp(self):
+        """setUp"""
+        xml_tree = XSDTree.build_tree(XSD)
+        self.root_element = xml_tree.getroot()[0]
+        self.attribute = xml_tree.getroot()[1]
+        self.parser = XSDParser()
+
+    @patch.object(parser, "get_module_url")
+    def test_is_key_matches_xpath_without_indexes_and_prefixes(
+        self, mock_get_module_url
+    ):
+        """test_is_key_matches_xpath_without_indexes_and_prefixes"""
+        mock_get_module_url.return_value = urlparse("module-auto-key")
+        self.parser.manage_key_keyref(self.root_element, "/t:root[1]")
+
+        self.assertTrue(
+            self.parser.is_key(self.attribute, "/t:root[1]/t:item[3]/@id")
+        )
+        self.assertEqual(
+            get_app_info_options(self.attribute),
+            {"module": "module-auto-key?key=itemKey"},
+        )
+
+    def test_is_key_without_module_returns_false(self):
+        """test_is_key_without_module_returns_false"""
+        self.parser.manage_key_keyref(self.root_element, "/t:root")
+
+        self.assertFalse(
+            self.parser.is_key(self.attribute, "/t:root/t:item/@id")
+        )
+
+    def test_is_keyref_matches_xpath_without_indexes_and_prefixes(self):
+        """test_is_keyref_matches_xpath_without_indexes_and_prefixes"""
+        self.parser.manage_key_keyref(self.root_element, "/t:root")
+
+        self.assertTrue(
+            self.parser.is_keyref(self.attribute, "/t:root/t:ref[2]/@item")
+        )
+        self.assertFalse(
+            self.parser.is_keyref(self.attribute, "/t:root/t:item/@item")
+        )
+        self.assertEqual(
+            get_app_info_options(self.attribute),
+            {"module": "module-auto-keyref?keyref=itemRef"},
+        )
+
+    @patch.object(parser.data_structure_element_api, "get_root_element")
+    def test_init_key_keyref_restores_keyrefs_of_the_form(
+        self, mock_get_root_element
+    ):
+        """test_init_key_keyref_restores_keyrefs_of_the_form"""
+        self.parser.manage_key_keyref(self.root_element, "/t:root")
+        self.assertTrue(
+            self.parser.is_keyref(self.attribute, "/t:root/t:ref/@item")
+        )
+        mock_get_root_element.return_value = Mock(
+            options={
+                "keys": {},
+                "keyrefs": {
+                    "otherRef": {
+                        "xpath": "/root/other/@item",
+                        "refer": "itemKey",
+                        "module_ids": [],
+                    }
+                },
+            }
+        )
+
+        self.parser.init_key_keyref(self.root_element)
+
+        self.assertFalse(
+            self.parser.is_keyref(self.attribute, "/t:root/t:ref/@item")
+        )
+        self.assertTrue(
+            self.parser.is_keyref(self.attribute, "/t:root/t:other/@item")
+        )
+
+
+class TestGenerateKeyKeyrefModules(IntegrationBaseTestCase):
+    """Integration tests for the modules generated for keys and keyrefs."""
+
+    def setUp(self):
+        """setUp"""
+        for url in ["/mod-key", "module-auto-keyref"]:
+            Module(name=url, url=url, view="module.view").save()
+        module_registry.invalidate_registry()
+        self.addCleanup(module_registry.invalidate_registry)
+
+    def test_generate_element_adds_key_and_keyref_modules(self):
+        """test_generate_element_adds_key_and_keyref_modules"""
+        xml_tree = XSDTree.build_tree(XSD_MODULES)
+        form_root = XSDParser().generate_element(
+            xml_tree.getroot()[0], xml_tree
+        )
+
+        modules = []
+        nodes = [form_root]
+        while len(nodes) > 0:
+            node = nodes.pop()
+            if node.tag == "module":
+                modules.append((node.options["url"], node.options["params"]))
+            nodes.extend(node.children or [])
+
+        self.assertCountEqual(
+            modules,
+            [
+                ("/mod-key", {"key": "itemKey"}),
+                ("module-auto-keyref", {"keyref": "itemRef"}),
+            ],
+        )
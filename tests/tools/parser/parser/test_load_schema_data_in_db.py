@@ -0,0 +1,268 @@
+""" Integration tests for `core_parser_app.tools.parser.parser.load_schema_data_in_db`
+function.
+"""
+
+from copy import copy
+from unittest.mock import Mock, patch
+
+from django.db import connection
+from django.http import HttpRequest
+from django.test.utils import CaptureQueriesContext
+
+from core_main_app.access_control.exceptions import AccessControlError
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.data_structure import (
+    models as data_structure_models,
+)
+from core_parser_app.components.data_structure.models import (
+    DataStructureElement,
+    PATH_MAX_LENGTH,
+)
+from core_parser_app.components.enumeration import api as enumeration_api
+from core_parser_app.tools.parser.node import FormNode
+from core_parser_app.tools.parser.parser import (
+    XSDParser,
+    load_schema_data_in_db,
+)
+from tests.components.data_structure_element.fixtures.fixtures import (
+    DataStructureElementFixtures,
+)
+
+
+def _generate_element(tag, value=None, children=None):
+    """Return generated form data"""
+    return FormNode(
+        tag,
+        value=value,
+        options={},
+        children=children if children is not None else [],
+    )
+
+
+class TestLoadSchemaDataInDb(IntegrationBaseTestCase):
+    """Integration tests for `load_schema_data_in_db` function."""
+
+    def setUp(self):
+        """setUp"""
+        self.fixtures = DataStructureElementFixtures()
+        self.fixtures.insert_data()
+
+        self.mock_request = Mock(spec=HttpRequest)
+        self.mock_request.user = self.fixtures.default_owner_with_perm
+
+    def test_load_creates_tree(self):
+        """test_load_creates_tree"""
+        xsd_data = _generate_element(
+            "element",
+            children=[
+                _generate_element(
+                    "sequence", children=[_generate_element("a")]
+                ),
+                _generate_element("b", value=" 1 "),
+            ],
+        )
+
+        root_element = load_schema_data_in_db(
+            self.mock_request, xsd_data, self.fixtures.data_structure
+        )
+
+        children = list(root_element.children.all().order_by("pk"))
+        self.assertEqual([child.tag for child in children], ["sequence", "b"])
+        self.assertEqual(children[1].value, "1")
+        self.assertEqual(children[0].children.get().tag, "a")
+        self.assertEqual(root_element.user, self.fixtures.default_user_id)
+
+    def test_load_sets_paths_in_document_order(self):
+        """test_load_sets_paths_in_document_order"""
+        xsd_data = _generate_element(
+            "element",
+            children=[
+                _generate_element(
+                    "sequence", children=[_generate_element("a")]
+                ),
+                _generate_element("b"),
+            ],
+        )
+
+        root_element = load_schema_data_in_db(
+            self.mock_request, xsd_data, self.fixtures.data_structure
+        )
+
+        self.assertEqual(
+            [
+                element.tag
+                for element in DataStructureElement.get_branch(root_element)
+            ],
+            ["element", "sequence", "a", "b"],
+        )
+
+    def test_load_stores_enumerations_once(self):
+        """test_load_stores_enumerations_once"""
+        restriction = _generate_element(
+            "restriction",
+            value="m",
+            children=[
+                _generate_element("enumeration", value=" m "),
+                _generate_element("enumeration", value="cm"),
+            ],
+        )
+        xsd_data = _generate_element(
+            "element", children=[restriction, copy(restriction)]
+        )
+
+        root_element = load_schema_data_in_db(
+            self.mock_request, xsd_data, self.fixtures.data_structure
+        )
+
+        restrictions = list(root_element.children.all())
+        self.assertEqual(len(DataStructureElement.get_branch(root_element)), 3)
+        enumeration_hash = restrictions[0].options["enumeration"]
+        self.assertEqual(
+            restrictions[1].options["enumeration"], enumeration_hash
+        )
+        self.assertEqual(
+            enumeration_api.get_values_by_hashes([enumeration_hash]),
+            {enumeration_hash: ["m", "cm"]},
+        )
+
+    def test_load_sets_choice_iter_value_to_selected_child(self):
+        """test_load_sets_choice_iter_value_to_selected_child"""
+        xsd_data = _generate_element(
+            "choice",
+            children=[
+                _generate_element(
+                    "choice-iter",
+                    value=1,
+                    children=[_generate_element("a"), _generate_element("b")],
+                ),
+                _generate_element(
+                    "choice-iter",
+                    children=[_generate_element("c"), _generate_element("d")],
+                ),
+            ],
+        )
+
+        root_element = load_schema_data_in_db(
+            self.mock_request, xsd_data, self.fixtures.data_structure
+        )
+
+        choice_iters = root_element.children.all().order_by("pk")
+        for choice_iter, selected_tag in zip(choice_iters, ["b", "c"]):
+            choice_iter.refresh_from_db()
+            selected_child = choice_iter.children.get(pk=choice_iter.value)
+            self.assertEqual(selected_child.tag, selected_tag)
+
+    def test_load_queries_by_tree_level(self):
+        """test_load_queries_by_tree_level"""
+        xsd_data = _generate_element(
+            "element",
+            children=[
+                _generate_element("a", children=[_generate_element("c")] * 50)
+            ]
+            * 50,
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            load_schema_data_in_db(
+                self.mock_request, xsd_data, self.fixtures.data_structure
+            )
+
+        # less than one query by element
+        self.assertLess(len(context.captured_queries), 50)
+
+    def test_load_raises_acl_error_if_user_has_no_permission(self):
+        """test_load_raises_acl_error_if_user_has_no_permission"""
+        self.mock_request.user = self.fixtures.user_without_perm
+
+        with self.assertRaises(AccessControlError):
+            load_schema_data_in_db(
+                self.mock_request,
+                _generate_element("element"),
+                self.fixtures.data_structure,
+            )
+
+
+class TestLoadDeepSchemaDataInDb(IntegrationBaseTestCase):
+    """Integration tests for the paths of the forms of deep schemas."""
+
+    def setUp(self):
+        """setUp"""
+        self.fixtures = DataStructureElementFixtures()
+        self.fixtures.insert_data()
+
+        self.mock_request = Mock(spec=HttpRequest)
+        self.mock_request.user = self.fixtures.default_owner_with_perm
+
+    def test_paths_of_deep_form_fit_in_max_length(self):
+        """test_paths_of_deep_form_fit_in_max_length"""
+        depth = 40
+        xsd = (
+            "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+            + "".join(
+                f"<xs:element name='e{index}'><xs:complexType><xs:sequence>"
+                for index in range(depth)
+            )
+            + "<xs:element name='leaf' type='xs:string'/>"
+            + "</xs:sequence></xs:complexType></xs:element>" * depth
+            + "</xs:schema>"
+        )
+
+        root_element_id = XSDParser(request=self.mock_request).generate_form(
+            xsd,
+            data_structure=self.fixtures.data_structure,
+            request=self.mock_request,
+        )
+
+        branch = list(
+            DataStructureElement.get_branch(
+                DataStructureElement.get_by_id(root_element_id)
+            )
+        )
+        self.assertEqual(
+            len([element for element in branch if element.tag == "element"]),
+            depth + 1,
+        )
+        max_path = max((element.path for element in branch), key=len)
+        self.assertLessEqual(len(max_path), PATH_MAX_LENGTH)
+        # the paths still fit once ids reach 32 bits
+        nb_levels = len(
+            [
+                element
+                for element in branch
+                if max_path.startswith(element.path)
+            ]
+        )
+        self.assertLessEqual(
+            nb_levels * len(DataStructureElement.get_path_segment(2**31 - 1)),
+            PATH_MAX_LENGTH,
+        )
+
+    @patch.object(data_structure_models, "PATH_MAX_LENGTH", 64)
+    def test_form_deeper_than_paths_is_stored(self):
+        """test_form_deeper_than_paths_is_stored"""
+        depth = 40
+        xsd_data = _generate_element("leaf")
+        for _ in range(depth):
+            xsd_data = _generate_element("element", children=[xsd_data])
+
+        root_element = load_schema_data_in_db(
+            self.mock_request, xsd_data, self.fixtures.data_structure
+        )
+
+        branch = DataStructureElement.get_branch(root_element)
+        self.assertEqual(
+            [element.tag for element in branch], ["element"] * depth + ["leaf"]
+        )
+        self.assertEqual(
+            [element.parent_id for element in branch[1:]],
+            [element.pk for element in branch[:-1]],
+        )
+        self.assertIsNone(branch[-1].path)
+        self.assertEqual(
+            len(
+                DataStructureElement.get_branch_values(root_element.pk, "tag")
+            ),
+            depth + 1,
+        )
@@ -0,0 +1,130 @@
+""" Integration tests for the depth budget of the forms generated by
+`core_parser_app.tools.parser.parser.XSDParser`.
+"""
+
+import sys
+from unittest.mock import Mock, patch
+
+from django.http import HttpRequest
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.data_structure.models import (
+    DataStructureElement,
+)
+from core_parser_app.tools.parser import parser
+from core_parser_app.tools.parser.exceptions import ParserError
+from core_parser_app.tools.parser.parser import XSDParser
+from tests.components.data_structure_element.fixtures.fixtures import (
+    DataStructureElementFixtures,
+)
+
+NESTED_XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+    "<xs:element name='a'><xs:complexType><xs:sequence>"
+    "<xs:element name='b'><xs:complexType><xs:sequence>"
+    "<xs:element name='c' type='xs:string'/>"
+    "</xs:sequence></xs:complexType></xs:element>"
+    "</xs:sequence></xs:complexType></xs:element>"
+    "</xs:schema>"
+)
+
+RECURSIVE_XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+    "<xs:element name='node' type='nodeType'/>"
+    "<xs:complexType name='nodeType'><xs:sequence>"
+    "<xs:element name='node' type='nodeType'/>"
+    "</xs:sequence></xs:complexType>"
+    "</xs:schema>"
+)
+
+
+def _get_chained_xsd(depth):
+    """Return a schema of the given number of elements of named types nested
+    in each other
+
+    Args:
+        depth:
+
+    Returns:
+
+    """
+    return (
+        "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+        "<xs:element name='e0' type='t0'/>"
+        + "".join(
+            f"<xs:complexType name='t{index}'><xs:sequence>"
+            f"<xs:element name='e{index + 1}' type='t{index + 1}'/>"
+            "</xs:sequence></xs:complexType>"
+            for index in range(depth - 1)
+        )
+        + f"<xs:simpleType name='t{depth - 1}'>"
+        "<xs:restriction base='xs:string'/></xs:simpleType>"
+        "</xs:schema>"
+    )
+
+
+class TestGenerateFormMaxDepth(IntegrationBaseTestCase):
+    """Integration tests for the depth budget of the generated forms."""
+
+    def setUp(self):
+        """setUp"""
+        self.fixture = DataStructureElementFixtures()
+        self.fixture.insert_data()
+        self.mock_request = Mock(spec=HttpRequest)
+        self.mock_request.user = self.fixture.default_owner_with_perm
+
+    def _generate_form(self, xsd):
+        """Generate the form of the schema
+
+        Args:
+            xsd:
+
+        Returns:
+
+        """
+        return XSDParser(request=self.mock_request).generate_form(
+            xsd,
+            data_structure=self.fixture.data_structure,
+            request=self.mock_request,
+        )
+
+    @patch.object(parser, "PARSER_MAX_DEPTH", 3)
+    def test_form_within_max_depth_is_generated(self):
+        """test_form_within_max_depth_is_generated"""
+        self.assertIsNotNone(self._generate_form(NESTED_XSD))
+
+    @patch.object(parser, "PARSER_MAX_DEPTH", 2)
+    def test_form_deeper_than_max_depth_raises_parser_error(self):
+        """test_form_deeper_than_max_depth_raises_parser_error"""
+        with self.assertRaises(ParserError):
+            self._generate_form(NESTED_XSD)
+
+    def test_form_deeper_than_recursion_limit_is_generated(self):
+        """test_form_deeper_than_recursion_limit_is_generated"""
+        depth = sys.getrecursionlimit() + 1
+        root_element = DataStructureElement.get_by_id(
+            self._generate_form(_get_chained_xsd(depth))
+        )
+
+        leaves = [
+            element
+            for element in DataStructureElement.get_branch(root_element)
+            if element.tag == "element"
+            and element.options["name"] == "e" + str(depth - 1)
+        ]
+        self.assertEqual(len(leaves), 1)
+
+    @patch.object(parser, "PARSER_MAX_DEPTH", 10)
+    def test_recursive_type_raises_parser_error(self):
+        """test_recursive_type_raises_parser_error"""
+        with self.assertRaises(ParserError) as context:
+            self._generate_form(RECURSIVE_XSD)
+
+        self.assertIn("PARSER_MAX_DEPTH", str(context.exception))
+
+    def test_recursive_type_without_max_depth_raises_parser_error(self):
+        """test_recursive_type_without_max_depth_raises_parser_error"""
+        with self.assertRaises(ParserError):
+            self._generate_form(RECURSIVE_XSD)
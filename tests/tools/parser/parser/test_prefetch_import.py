@@ -0,0 +1,124 @@
+""" Unit tests for `core_parser_app.tools.parser.parser.prefetch_imported_schemas`
+function.
+"""
+
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+from core_parser_app.tools.parser import parser
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+SCHEMA_XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>{0}</xs:schema>"
+)
+IMPORT_XSD = (
+    "<xs:import namespace='http://{0}.com' schemaLocation='{1}/{0}.xsd'/>"
+)
+
+
+class SchemaRequestHandler(BaseHTTPRequestHandler):
+    """Local HTTP stand-in serving the imported schemas"""
+
+    def do_GET(self):
+        """Send the schema of the path, count the downloads"""
+        self.server.downloads[self.path] += 1
+        content = self.server.schemas.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content.encode("utf-8"))
+
+    def log_message(self, *args):
+        """Silence the logs of the server"""
+
+
+class TestPrefetchImportedSchemas(TestCase):
+    """Unit tests for `prefetch_imported_schemas` function."""
+
+    def setUp(self):
+        """setUp"""
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), SchemaRequestHandler
+        )
+        self.server.schemas = {}
+        self.server.downloads = Counter()
+        self.base_url = "http://127.0.0.1:{0}".format(self.server.server_port)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        parser.IMPORTED_SCHEMA_CACHE.clear()
+
+    def tearDown(self):
+        """tearDown"""
+        self.server.shutdown()
+        self.server.server_close()
+        parser.IMPORTED_SCHEMA_CACHE.clear()
+
+    def _schema(self, *imports):
+        """Return a schema importing the schemas of the names"""
+        return SCHEMA_XSD.format(
+            "".join(IMPORT_XSD.format(name, self.base_url) for name in imports)
+        )
+
+    def test_prefetch_caches_transitive_imports(self):
+        """test_prefetch_caches_transitive_imports"""
+        self.server.schemas["/a.xsd"] = self._schema("c")
+        self.server.schemas["/b.xsd"] = self._schema("c")
+        self.server.schemas["/c.xsd"] = self._schema()
+
+        parser.prefetch_imported_schemas(
+            XSDTree.build_tree(self._schema("a", "b"))
+        )
+
+        for name in ["a", "b", "c"]:
+            self.assertIsNotNone(
+                parser.IMPORTED_SCHEMA_CACHE.peek(
+                    parser.get_imported_schema_key(
+                        "{0}/{1}.xsd".format(self.base_url, name)
+                    )
+                )
+            )
+        self.assertEqual(
+            self.server.downloads, {"/a.xsd": 1, "/b.xsd": 1, "/c.xsd": 1}
+        )
+
+    def test_prefetch_does_not_download_cached_imports(self):
+        """test_prefetch_does_not_download_cached_imports"""
+        self.server.schemas["/a.xsd"] = self._schema("b")
+        self.server.schemas["/b.xsd"] = self._schema()
+        xml_tree = XSDTree.build_tree(self._schema("a"))
+        parser.prefetch_imported_schemas(xml_tree)
+
+        parser.prefetch_imported_schemas(xml_tree)
+
+        self.assertEqual(self.server.downloads, {"/a.xsd": 1, "/b.xsd": 1})
+
+    def test_prefetch_skips_imports_that_can_not_be_loaded(self):
+        """test_prefetch_skips_imports_that_can_not_be_loaded"""
+        self.server.schemas["/b.xsd"] = self._schema()
+
+        parser.prefetch_imported_schemas(
+            XSDTree.build_tree(self._schema("a", "b"))
+        )
+
+        self.assertIsNone(
+            parser.IMPORTED_SCHEMA_CACHE.peek(
+                parser.get_imported_schema_key(
+                    "{0}/a.xsd".format(self.base_url)
+                )
+            )
+        )
+        self.assertIsNotNone(
+            parser.IMPORTED_SCHEMA_CACHE.peek(
+                parser.get_imported_schema_key(
+                    "{0}/b.xsd".format(self.base_url)
+                )
+            )
+        )
@@ -47,14 +47,14 @@ class ParserCreateRestrictionTestSuite(TestCase):
 
         xsd_files = join("enumeration", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_simple_type(self):
         """test_simple_type"""
         xsd_files = join("simple_type", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
 
 class ParserReloadRestrictionTestSuite(TestCase):
@@ -108,7 +108,7 @@ class ParserReloadRestrictionTestSuite(TestCase):
         xsd_files = join("enumeration", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
 
     def test_simple_type(self):
         """test_simple_type"""
@@ -116,4 +116,4 @@ class ParserReloadRestrictionTestSuite(TestCase):
         xsd_files = join("simple_type", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(expected_dict, result_dict)
+        self.assertDictEqual(expected_dict, result_dict.to_dict())
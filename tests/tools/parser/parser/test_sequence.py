@@ -56,56 +56,56 @@ class ParserCreateSequenceTestSuite(TestCase):
         xsd_files = join("element", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_create_element_unbounded(self):
         """test_create_element_unbounded"""
         xsd_files = join("element", "unbounded")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_create_choice_basic(self):
         """test_create_element_unbounded"""
         xsd_files = join("choice", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_create_choice_unbounded(self):
         """test_create_element_unbounded"""
         xsd_files = join("choice", "unbounded")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_create_sequence_basic(self):
         """test_create_sequence_basic"""
         xsd_files = join("sequence", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_create_sequence_unbounded(self):
         """test_create_sequence_unbounded"""
         xsd_files = join("sequence", "unbounded")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_create_multiple_basic(self):
         """test_create_multiple_basic"""
         xsd_files = join("multiple", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_create_multiple_unbounded(self):
         """test_create_multiple_unbounded"""
         xsd_files = join("multiple", "unbounded")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
 
 class ParserReloadSequenceTestSuite(TestCase):
@@ -164,7 +164,7 @@ class ParserReloadSequenceTestSuite(TestCase):
         xsd_files = join("element", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_reload_element_unbounded(self):
         """test_create_multiple_basic"""
@@ -172,46 +172,46 @@ class ParserReloadSequenceTestSuite(TestCase):
         xsd_files = join("element", "unbounded")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_reload_choice_basic(self):
         """test_reload_choice_basic"""
         xsd_files = join("choice", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_reload_choice_unbounded(self):
         """test_reload_choice_unbounded"""
         xsd_files = join("choice", "unbounded")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_reload_sequence_basic(self):
         """test_reload_sequence_basic"""
         xsd_files = join("sequence", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_reload_sequence_unbounded(self):
         """test_reload_sequence_unbounded"""
         xsd_files = join("sequence", "unbounded")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_reload_multiple_basic(self):
         """test_reload_multiple_basic"""
         xsd_files = join("multiple", "basic")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
 
     def test_reload_multiple_unbounded(self):
         """test_reload_multiple_unbounded"""
         xsd_files = join("multiple", "unbounded")
         result_dict, expected_dict = self._run_test(xsd_files)
 
-        self.assertDictEqual(result_dict, expected_dict)
+        self.assertDictEqual(result_dict.to_dict(), expected_dict)
@@ -0,0 +1,135 @@
+""" Integration tests for the generation of forms streamed to the database by
+`core_parser_app.tools.parser.parser.XSDParser`.
+"""
+
+from unittest.mock import Mock, patch
+
+from django.http import HttpRequest
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.data_structure.models import (
+    DataStructureElement,
+)
+from core_parser_app.tools.parser import parser
+from core_parser_app.tools.parser.exceptions import ParserError
+from core_parser_app.tools.parser.parser import BranchWriter, XSDParser
+from tests.components.data_structure_element.fixtures.fixtures import (
+    DataStructureElementFixtures,
+)
+
+XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+    "<xs:element name='root'><xs:complexType><xs:sequence>"
+    "<xs:element name='item' minOccurs='3' maxOccurs='unbounded'>"
+    "<xs:complexType><xs:sequence>"
+    "<xs:element name='name' type='xs:string' default='a'/>"
+    "<xs:choice><xs:element name='a' type='xs:string'/>"
+    "<xs:element name='b' type='xs:integer'/></xs:choice>"
+    "</xs:sequence><xs:attribute name='id' type='xs:string'/>"
+    "</xs:complexType></xs:element>"
+    "</xs:sequence></xs:complexType></xs:element>"
+    "</xs:schema>"
+)
+
+
+class TestGenerateFormStream(IntegrationBaseTestCase):
+    """Integration tests for the generation of forms streamed to the
+    database."""
+
+    def setUp(self):
+        """setUp"""
+        self.fixture = DataStructureElementFixtures()
+        self.fixture.insert_data()
+        self.mock_request = Mock(spec=HttpRequest)
+        self.mock_request.user = self.fixture.default_owner_with_perm
+        self.nb_elements = self._count_elements()
+
+    def _count_elements(self):
+        """Return the number of elements of the data structure"""
+        return DataStructureElement.objects.filter(
+            data_structure=self.fixture.data_structure
+        ).count()
+
+    def _generate_form(self, stream_batch_size):
+        """Generate the form of the schema, and return its elements in
+        document order, with the position of the selected child of the
+        choices
+
+        Args:
+            stream_batch_size:
+
+        Returns:
+
+        """
+        root_id = XSDParser(
+            min_tree=False,
+            request=self.mock_request,
+            stream_batch_size=stream_batch_size,
+        ).generate_form(
+            XSD,
+            data_structure=self.fixture.data_structure,
+            request=self.mock_request,
+        )
+        branch = list(
+            DataStructureElement.get_branch(
+                DataStructureElement.objects.get(pk=root_id)
+            )
+        )
+
+        children_ids = {}
+        for element in branch:
+            children_ids.setdefault(element.parent_id, []).append(element.pk)
+        return [
+            (
+                element.tag,
+                (
+                    children_ids[element.pk].index(int(element.value))
+                    if element.tag == "choice-iter"
+                    else element.value
+                ),
+                element.xpath,
+            )
+            for element in branch
+        ]
+
+    def test_streamed_form_is_same_as_form_saved_once_generated(self):
+        """test_streamed_form_is_same_as_form_saved_once_generated"""
+        form = self._generate_form(0)
+
+        with patch.object(
+            BranchWriter,
+            "save_children",
+            autospec=True,
+            side_effect=BranchWriter.save_children,
+        ) as mock_save_children:
+            streamed_form = self._generate_form(2)
+
+        self.assertTrue(mock_save_children.called)
+        self.assertEqual(streamed_form, form)
+        # no branch left without parent
+        self.assertEqual(
+            self._count_elements(),
+            self.nb_elements + len(form) + len(streamed_form),
+        )
+
+    @patch.object(parser, "PARSER_MAX_IN_MEMORY_ELEMENTS", 10)
+    def test_in_memory_elements_budget_is_soft_when_streaming(self):
+        """test_in_memory_elements_budget_is_soft_when_streaming"""
+        with self.assertRaises(ParserError):
+            self._generate_form(0)
+
+        self.assertEqual(self._generate_form(1000)[0][0], "element")
+
+    @patch.object(parser, "load_schema_data_in_db")
+    def test_streamed_branches_are_removed_on_error(
+        self, mock_load_schema_data_in_db
+    ):
+        """test_streamed_branches_are_removed_on_error"""
+        mock_load_schema_data_in_db.side_effect = Exception("error")
+
+        with self.assertRaises(ParserError):
+            self._generate_form(2)
+
+        self.assertEqual(self._count_elements(), self.nb_elements)
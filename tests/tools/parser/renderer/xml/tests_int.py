@@ -0,0 +1,173 @@
+""" Integration tests for XmlRenderer class.
+"""
+
+from types import GeneratorType
+from unittest.mock import Mock
+
+from django.http import HttpRequest
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_parser_app.components.data_structure.models import (
+    DataStructureElement,
+)
+from core_parser_app.components.enumeration import api as enumeration_api
+from core_parser_app.tools.parser.parser import XSDParser
+from core_parser_app.tools.parser.renderer.xml import XmlRenderer
+from tests.components.data_structure_element.fixtures.fixtures import (
+    DataStructureElementFixtures,
+)
+
+XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+    "<xs:element name='root'><xs:complexType><xs:sequence>"
+    "<xs:element name='item' minOccurs='{0}' maxOccurs='unbounded'>"
+    "<xs:complexType><xs:sequence>"
+    "<xs:element name='name' type='xs:string' default='a &amp; b'/>"
+    "<xs:choice><xs:element name='a' type='xs:string'/>"
+    "<xs:element name='b' type='xs:integer'/></xs:choice>"
+    "</xs:sequence><xs:attribute name='id' type='xs:string'/>"
+    "</xs:complexType></xs:element>"
+    "</xs:sequence></xs:complexType></xs:element>"
+    "</xs:schema>"
+)
+
+MULTI_ROOT_XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+    "<xs:element name='first' type='xs:string'/>"
+    "<xs:element name='second' type='xs:integer'/>"
+    "</xs:schema>"
+)
+
+
+ENUMERATION_XSD = (
+    "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+    "<xs:element name='root'><xs:complexType><xs:sequence>"
+    "<xs:element name='unit' maxOccurs='unbounded'><xs:simpleType>"
+    "<xs:restriction base='xs:string'>"
+    "<xs:enumeration value='m'/><xs:enumeration value='a &amp; b'/>"
+    "</xs:restriction></xs:simpleType></xs:element>"
+    "</xs:sequence></xs:complexType></xs:element>"
+    "</xs:schema>"
+)
+
+
+def _store_enumerations_as_children(root_element):
+    """Store the enumerations of the restrictions of a form as children of
+    the restrictions
+
+    Args:
+        root_element:
+
+    Returns:
+
+    """
+    restrictions = [
+        element
+        for element in DataStructureElement.get_branch(root_element)
+        if element.tag == "restriction"
+    ]
+    enumerations = enumeration_api.get_values_by_hashes(
+        [restriction.options["enumeration"] for restriction in restrictions]
+    )
+    for restriction in restrictions:
+        DataStructureElement.bulk_create(
+            [
+                DataStructureElement(
+                    tag="enumeration",
+                    value=value,
+                    parent=restriction,
+                    user=restriction.user,
+                    data_structure=restriction.data_structure,
+                )
+                for value in enumerations[
+                    restriction.options.pop("enumeration")
+                ]
+            ]
+        )
+        restriction.save()
+
+
+class TestXmlRendererRender(IntegrationBaseTestCase):
+    """Integration tests for `XmlRenderer.render` and
+    `XmlRenderer.render_stream` methods."""
+
+    def setUp(self):
+        """setUp"""
+        self.fixture = DataStructureElementFixtures()
+        self.fixture.insert_data()
+        self.mock_request = Mock(spec=HttpRequest)
+        self.mock_request.user = self.fixture.default_owner_with_perm
+
+    def _generate_form(self, xsd):
+        """Generate the form of the schema and set it as the data structure
+        root
+
+        Args:
+            xsd:
+
+        Returns:
+
+        """
+        root_id = XSDParser(request=self.mock_request).generate_form(
+            xsd,
+            data_structure=self.fixture.data_structure,
+            request=self.mock_request,
+        )
+        root_element = DataStructureElement.objects.get(pk=root_id)
+        self.fixture.data_structure.data_structure_element_root = root_element
+        self.fixture.data_structure.save()
+
+        return DataStructureElement.objects.get(pk=root_id)
+
+    def test_render_queries_do_not_depend_on_form_size(self):
+        """test_render_queries_do_not_depend_on_form_size"""
+        root_element = self._generate_form(XSD.format(20))
+
+        # all the elements of the branch, by path
+        with self.assertNumQueries(1):
+            xml_string = XmlRenderer(root_element, self.mock_request).render()
+
+        self.assertEqual(xml_string.count("<name>a &amp; b</name>"), 20)
+
+    def test_render_stream_returns_same_xml_as_render(self):
+        """test_render_stream_returns_same_xml_as_render"""
+        root_element = self._generate_form(XSD.format(3))
+        xml_string = XmlRenderer(root_element, self.mock_request).render()
+
+        xml_chunks = XmlRenderer(
+            root_element, self.mock_request
+        ).render_stream()
+
+        self.assertIsInstance(xml_chunks, GeneratorType)
+        self.assertEqual("".join(xml_chunks), xml_string)
+
+    def test_render_stream_multi_root_returns_same_xml_as_render(self):
+        """test_render_stream_multi_root_returns_same_xml_as_render"""
+        root_element = self._generate_form(MULTI_ROOT_XSD)
+        xml_string = XmlRenderer(root_element, self.mock_request).render()
+        root_element = DataStructureElement.objects.get(pk=root_element.pk)
+
+        with self.assertNumQueries(1):
+            xml_chunks = list(
+                XmlRenderer(root_element, self.mock_request).render_stream()
+            )
+
+        self.assertTrue(xml_string.startswith("<first"))
+        self.assertEqual("".join(xml_chunks), xml_string)
+
+    def test_render_enumerations_returns_same_output_as_enumeration_children(
+        self,
+    ):
+        """test_render_enumerations_returns_same_output_as_enumeration_children"""
+        root_element = self._generate_form(ENUMERATION_XSD)
+        rendered_form = XmlRenderer(root_element, self.mock_request).render()
+
+        _store_enumerations_as_children(root_element)
+        root_element = DataStructureElement.objects.get(pk=root_element.pk)
+
+        self.assertEqual(
+            XmlRenderer(root_element, self.mock_request).render(),
+            rendered_form,
+        )
@@ -0,0 +1,82 @@
+""" Unit tests for `core_parser_app.tools.parser.utils` package.
+"""
+
+from unittest import TestCase
+
+from lxml import etree
+
+from core_parser_app.tools.parser.context import ParserContext
+from core_parser_app.tools.parser.utils import xml
+
+NAMESPACES = {"test": "http://test.com"}
+
+XSD_APP_INFO = (
+    "<xs:element xmlns:xs='http://www.w3.org/2001/XMLSchema' "
+    "xmlns:app='http://app.com' name='root'>"
+    "<xs:annotation><xs:appinfo>"
+    "<app:label>Root</app:label><default>1</default>"
+    "</xs:appinfo></xs:annotation></xs:element>"
+)
+
+
+class TestEvaluateXpath(TestCase):
+    """Unit tests for `evaluate_xpath` function."""
+
+    def setUp(self):
+        """setUp"""
+        self.xml_root = etree.fromstring(
+            "<root xmlns:test='http://test.com'>"
+            "<test:item>a</test:item><test:item>b</test:item>"
+            "</root>"
+        )
+        xml.XPATH_CACHE.clear()
+
+    def tearDown(self):
+        """tearDown"""
+        xml.XPATH_CACHE.clear()
+
+    def test_evaluate_xpath_returns_same_result_as_xpath(self):
+        """test_evaluate_xpath_returns_same_result_as_xpath"""
+        self.assertEqual(
+            xml.evaluate_xpath(self.xml_root, "/root/test:item", NAMESPACES),
+            self.xml_root.xpath("/root/test:item", namespaces=NAMESPACES),
+        )
+
+    def test_evaluate_xpath_compiles_expression_once(self):
+        """test_evaluate_xpath_compiles_expression_once"""
+        for _ in range(3):
+            xml.evaluate_xpath(self.xml_root, "/root/test:item", NAMESPACES)
+
+        self.assertEqual(xml.XPATH_CACHE.info()["misses"], 1)
+        self.assertEqual(xml.XPATH_CACHE.info()["hits"], 2)
+        self.assertAlmostEqual(xml.XPATH_CACHE.info()["hit_rate"], 2 / 3)
+
+    def test_evaluate_xpath_compiles_expression_by_namespaces(self):
+        """test_evaluate_xpath_compiles_expression_by_namespaces"""
+        xml.evaluate_xpath(self.xml_root, "/root/test:item", NAMESPACES)
+        result = xml.evaluate_xpath(
+            self.xml_root, "/root/test:item", {"test": "http://other.com"}
+        )
+
+        self.assertEqual(result, [])
+        self.assertEqual(xml.XPATH_CACHE.info()["size"], 2)
+
+
+class TestGetAppInfoOptions(TestCase):
+    """Unit tests for `get_app_info_options` function."""
+
+    def test_get_app_info_options_returns_options_of_tags(self):
+        """test_get_app_info_options_returns_options_of_tags"""
+        self.assertEqual(
+            xml.get_app_info_options(etree.fromstring(XSD_APP_INFO)),
+            {"label": "Root", "default": "1"},
+        )
+
+    def test_get_app_info_options_with_context_reads_same_options(self):
+        """test_get_app_info_options_with_context_reads_same_options"""
+        element = etree.fromstring(XSD_APP_INFO)
+
+        self.assertEqual(
+            xml.get_app_info_options(element, ParserContext()),
+            xml.get_app_info_options(element),
+        )
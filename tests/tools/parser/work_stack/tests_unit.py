@@ -0,0 +1,82 @@
+""" Unit tests for `core_parser_app.tools.parser.work_stack` package.
+"""
+
+import sys
+from unittest import TestCase
+from unittest.mock import Mock
+
+from core_parser_app.tools.parser.work_stack import generation_step
+
+
+class StepParser:
+    """Parser of nested steps"""
+
+    def __init__(self):
+        """Init the parser"""
+        self.work_stack = None
+        self.generate_leaf = Mock(return_value="patched")
+
+    @generation_step
+    def generate_chain(self, depth):
+        """Return the number of nested steps below the depth"""
+        if depth == 0:
+            return 0
+        return (yield self.generate_chain(depth - 1)) + 1
+
+    @generation_step
+    def generate_failing(self, depth):
+        """Raise an error below the depth"""
+        if depth == 0:
+            raise ValueError("failing step")
+        yield self.generate_failing(depth - 1)
+
+    @generation_step
+    def generate_caught(self):
+        """Return the error of a failing step"""
+        try:
+            yield self.generate_failing(3)
+        except ValueError as exception:
+            return str(exception)
+
+    @generation_step
+    def generate_patched(self):
+        """Return the result of a patched step"""
+        return (yield self.generate_leaf())
+
+
+class TestGenerationStep(TestCase):
+    """Unit tests for `generation_step` decorator."""
+
+    def setUp(self):
+        """setUp"""
+        self.parser = StepParser()
+
+    def test_step_returns_result(self):
+        """test_step_returns_result"""
+        self.assertEqual(self.parser.generate_chain(3), 3)
+
+    def test_steps_deeper_than_recursion_limit_return_result(self):
+        """test_steps_deeper_than_recursion_limit_return_result"""
+        depth = sys.getrecursionlimit() * 2
+
+        self.assertEqual(self.parser.generate_chain(depth), depth)
+
+    def test_step_error_is_raised_to_caller(self):
+        """test_step_error_is_raised_to_caller"""
+        with self.assertRaises(ValueError):
+            self.parser.generate_failing(3)
+
+    def test_step_error_is_thrown_into_yielding_step(self):
+        """test_step_error_is_thrown_into_yielding_step"""
+        self.assertEqual(self.parser.generate_caught(), "failing step")
+
+    def test_yielded_value_that_is_not_a_step_is_sent_back(self):
+        """test_yielded_value_that_is_not_a_step_is_sent_back"""
+        self.assertEqual(self.parser.generate_patched(), "patched")
+
+    def test_work_stack_is_reset_after_error(self):
+        """test_work_stack_is_reset_after_error"""
+        with self.assertRaises(ValueError):
+            self.parser.generate_failing(3)
+
+        self.assertIsNone(self.parser.work_stack)
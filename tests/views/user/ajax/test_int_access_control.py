@@ -2,6 +2,7 @@
 """
 
 import json
+from unittest.mock import patch
 
 from django.contrib.auth.models import AnonymousUser
 from django.test import RequestFactory
@@ -13,7 +14,11 @@ from core_main_app.utils.integration_tests.integration_base_test_case import (
 from core_parser_app.components.data_structure.models import (
     DataStructureElement,
 )
-from core_parser_app.views.user.ajax import data_structure_element_value
+from core_parser_app.components.enumeration import api as enumeration_api
+from core_parser_app.views.user.ajax import (
+    data_structure_element_enumeration,
+    data_structure_element_value,
+)
 from tests import test_settings
 from tests.components.data_structure_element.fixtures.fixtures import (
     DataStructureElementFixtures,
@@ -160,3 +165,84 @@ class TestPostDataStructureElementValue(IntegrationBaseTestCase):
             json.loads(response.content),
             {"replaced": self.fixture.data_structure_element_child.value},
         )
+
+
+class TestGetDataStructureElementEnumeration(IntegrationBaseTestCase):
+    """Test Get Data Structure Element Enumeration"""
+
+    def setUp(self):
+        """setUp"""
+
+        self.fixtures = DataStructureElementFixtures()
+        self.fixtures.insert_data(user=self.fixtures.default_owner_with_perm)
+
+        self.users = {
+            "anon": AnonymousUser(),
+            "user": self.fixtures.other_user_with_perm,
+            "owner": self.fixtures.default_owner_with_perm,
+        }
+
+        values = ["ma", "mb", "mc", "n"]
+        enumeration_hash = enumeration_api.get_hash(values)
+        enumeration_api.bulk_get_or_create({enumeration_hash: values})
+        self.restriction = DataStructureElement(
+            user=str(self.users["owner"].id),
+            tag="restriction",
+            value="n",
+            options={
+                "enumeration": enumeration_hash,
+                "enumeration_size": len(values),
+            },
+            data_structure=self.fixtures.data_structure,
+        )
+        self.restriction.save()
+
+        request_factory = RequestFactory()
+        self.request = request_factory.get(
+            reverse("core_parser_app_data_structure_element_enumeration")
+        )
+        self.request.GET = {"id": str(self.restriction.id), "prefix": "m"}
+
+    def test_anonymous_cannot_retrieve_enumeration(self):
+        """test_anonymous_cannot_retrieve_enumeration"""
+
+        self.request.user = self.users["anon"]
+
+        response = data_structure_element_enumeration(self.request)
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_user_not_owner_cannot_retrieve_enumeration(self):
+        """test_user_not_owner_cannot_retrieve_enumeration"""
+
+        self.request.user = self.users["user"]
+
+        response = data_structure_element_enumeration(self.request)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_owner_can_retrieve_enumeration_page(self):
+        """test_owner_can_retrieve_enumeration_page"""
+
+        self.request.user = self.users["owner"]
+
+        with patch.object(enumeration_api, "PARSER_ENUMERATION_PAGE_SIZE", 2):
+            self.request.GET["page"] = "2"
+            response = data_structure_element_enumeration(self.request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            json.loads(response.content),
+            {"values": ["mc"], "page": 2, "has_next": False},
+        )
+
+    def test_element_without_enumeration_returns_error(self):
+        """test_element_without_enumeration_returns_error"""
+
+        self.request.user = self.users["owner"]
+        self.restriction.options = {}
+        self.restriction.save()
+
+        response = data_structure_element_enumeration(self.request)
+
+        self.assertEqual(response.status_code, 400)